@@ -0,0 +1,16 @@
+from core.exports import ExportSection
+
+from .models import CompanyStats, Organization
+
+
+class CompanyStatsExport(ExportSection):
+    name = "company-stats"
+    model = CompanyStats
+    path = "/accounts/company-stats/"
+
+
+class OrganizationExport(ExportSection):
+    name = "organization"
+    model = Organization
+    path = "/accounts/organization/"
+    routes = ("default/",)
@@ -1,5 +1,7 @@
 from rest_framework.serializers import ModelSerializer, Serializer
 
+from core.serializers import DynamicFieldsModelSerializer
+
 from .models import *
 
 
@@ -10,14 +12,14 @@ class MessageSerializer(ModelSerializer):
         read_only_fields = ["is_read"]
 
 
-class CompanyStatsSerializer(ModelSerializer):
+class CompanyStatsSerializer(DynamicFieldsModelSerializer):
     class Meta:
         exclude = []
         model = CompanyStats
         read_only_fields = []
 
 
-class OrganizationSerializer(ModelSerializer):
+class OrganizationSerializer(DynamicFieldsModelSerializer):
     class Meta:
         exclude = []
         model = Organization
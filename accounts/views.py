@@ -3,6 +3,8 @@ from rest_framework.mixins import CreateModelMixin, ListModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from core.mixins import CacheControlMixin, ConditionalGetMixin, SparseFieldsetMixin
+
 from .serializers import *
 
 
@@ -10,17 +12,29 @@ class MessageViewset(CreateModelMixin, GenericViewSet):
     serializer_class = MessageSerializer
 
 
-class CompanyStatsViewset(ListModelMixin, GenericViewSet):
+class CompanyStatsViewset(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CacheControlMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
     serializer_class = CompanyStatsSerializer
     queryset = CompanyStats.objects.all()
+    cache_policy = {
+        "*": {"max_age": 300, "s_maxage": 3600, "stale_while_revalidate": 86400}
+    }
 
 
-class OrganizationViewset(GenericViewSet):
+class OrganizationViewset(SparseFieldsetMixin, CacheControlMixin, GenericViewSet):
     serializer_class = OrganizationSerializer
     queryset = Organization.objects.filter(is_default=True)
+    cache_policy = {
+        "*": {"max_age": 300, "s_maxage": 3600, "stale_while_revalidate": 86400}
+    }
 
     @action(detail=False, methods=["get"])
     def default(self, request):
-        organization = self.queryset.first()
+        organization = self.get_queryset().first()
         serializer = self.get_serializer(organization)
         return Response(serializer.data)
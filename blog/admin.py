@@ -3,7 +3,10 @@ from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import format_html
 
+from core.versions import schedule_version_bump
+
 from .models import Author, BlogPost, Category, NewsletterSubscriber, Tag, Topic
+from .publishing import notify_visibility_changed
 
 
 @admin.register(Author)
@@ -117,19 +120,30 @@ class BlogPostAdmin(admin.ModelAdmin):
     get_image_preview.short_description = "Image"
 
     def make_published(self, request, queryset):
-        updated = queryset.update(status="published", published_at=timezone.now())
+        pks = list(queryset.values_list("pk", flat=True))
+        now = timezone.now()
+        updated = queryset.update(
+            status="published", published_at=now, is_live=True, updated_at=now
+        )
+        notify_visibility_changed(pks)
         self.message_user(request, f"{updated} posts were published.")
 
     make_published.short_description = "Mark selected posts as published"
 
     def make_draft(self, request, queryset):
-        updated = queryset.update(status="draft")
+        pks = list(queryset.values_list("pk", flat=True))
+        updated = queryset.update(
+            status="draft", is_live=False, updated_at=timezone.now()
+        )
+        notify_visibility_changed(pks)
         self.message_user(request, f"{updated} posts were moved to draft.")
 
     make_draft.short_description = "Mark selected posts as draft"
 
     def make_featured(self, request, queryset):
-        updated = queryset.update(featured=True)
+        pks = list(queryset.values_list("pk", flat=True))
+        updated = queryset.update(featured=True, updated_at=timezone.now())
+        schedule_version_bump(BlogPost, pks)
         self.message_user(request, f"{updated} posts were marked as featured.")
 
     make_featured.short_description = "Mark selected posts as featured"
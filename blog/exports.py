@@ -0,0 +1,35 @@
+from core.exports import ExportSection
+
+from .models import Author, BlogPost, Category, Tag, TrendingPost
+
+
+class PostExport(ExportSection):
+    name = "posts"
+    model = BlogPost
+    path = "/blog/posts/"
+    routes = ("", "featured/", "trending/")
+    lookup_field = "slug"
+    version_models = (TrendingPost,)
+
+    def items(self):
+        return BlogPost.objects.filter(is_live=True)
+
+
+class AuthorExport(ExportSection):
+    name = "authors"
+    model = Author
+    path = "/blog/authors/"
+
+
+class CategoryExport(ExportSection):
+    name = "categories"
+    model = Category
+    path = "/blog/categories/"
+    lookup_field = "slug"
+
+
+class TagExport(ExportSection):
+    name = "tags"
+    model = Tag
+    path = "/blog/tags/"
+    lookup_field = "slug"
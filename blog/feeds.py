@@ -0,0 +1,157 @@
+"""
+RSS, Atom and JSON feeds of published blog posts.
+
+Rendered feeds are cached as bytes together with their ETag and
+Last-Modified. Cache keys embed a generation number that is bumped whenever
+posts change, so a poll is answered from the cache, usually with a 304.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from .models import Author, BlogPost, Category, Tag
+
+FEED_SIZE = 20
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+FEED_GENERATION_KEY = "blog:feeds:generation"
+
+CONTENT_TYPES = {
+    "rss": "application/rss+xml; charset=utf-8",
+    "atom": "application/atom+xml; charset=utf-8",
+    "json": "application/feed+json; charset=utf-8",
+}
+
+
+def get_feed_generation():
+    return cache.get_or_set(FEED_GENERATION_KEY, time.time_ns, timeout=None)
+
+
+def invalidate_feeds():
+    """Drop every cached feed"""
+    cache.set(FEED_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def feed_cache_key(kind, value, fmt):
+    return f"blog:feed:{get_feed_generation()}:{kind}:{value}:{fmt}"
+
+
+def post_url(post):
+    return f"{settings.FRONTEND_URL}/blog/{post.slug}/"
+
+
+def get_feed_source(kind, value):
+    """Return the feed title and the posts it lists"""
+    posts = BlogPost.objects.filter(is_live=True)
+    title = "Gumisofts Blog"
+    if kind == "category":
+        category = Category.objects.filter(slug=value).first()
+        if category is None:
+            raise Http404("Category not found")
+        posts = posts.filter(category=category)
+        title = f"{title}: {category.name}"
+    elif kind == "tag":
+        tag = Tag.objects.filter(slug=value).first()
+        if tag is None:
+            raise Http404("Tag not found")
+        posts = posts.filter(tags=tag)
+        title = f"{title}: {tag.name}"
+    elif kind == "author":
+        author = Author.objects.filter(pk=value).first()
+        if author is None:
+            raise Http404("Author not found")
+        posts = posts.filter(author=author)
+        title = f"{title}: {author.name}"
+
+    posts = (
+        posts.select_related("author", "category")
+        .prefetch_related("tags")
+        .order_by("-published_at")[:FEED_SIZE]
+    )
+    return title, list(posts)
+
+
+def render_syndication_feed(feed_class, title, feed_url, posts):
+    feed = feed_class(
+        title=title,
+        link=f"{settings.FRONTEND_URL}/blog/",
+        description="Latest articles from the Gumisofts blog",
+        language=settings.LANGUAGE_CODE,
+        feed_url=feed_url,
+    )
+    for post in posts:
+        categories = [tag.name for tag in post.tags.all()]
+        if post.category:
+            categories.insert(0, post.category.name)
+        feed.add_item(
+            title=post.title,
+            link=post_url(post),
+            description=post.excerpt,
+            unique_id=post_url(post),
+            pubdate=post.published_at,
+            updateddate=post.updated_at,
+            author_name=post.author.name,
+            categories=categories,
+        )
+    return feed.writeString("utf-8").encode("utf-8")
+
+
+def render_json_feed(title, feed_url, posts):
+    items = []
+    for post in posts:
+        item = {
+            "id": post_url(post),
+            "url": post_url(post),
+            "title": post.title,
+            "summary": post.excerpt,
+            "content_html": post.get_rendered_content(),
+            "date_published": post.published_at.isoformat(),
+            "date_modified": post.updated_at.isoformat(),
+            "authors": [{"name": post.author.name}],
+            "tags": [tag.name for tag in post.tags.all()],
+        }
+        if post.image:
+            item["image"] = post.image.url
+        items.append(item)
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": title,
+        "home_page_url": f"{settings.FRONTEND_URL}/blog/",
+        "feed_url": feed_url,
+        "language": settings.LANGUAGE_CODE,
+        "items": items,
+    }
+    return json.dumps(feed, ensure_ascii=False).encode("utf-8")
+
+
+def build_feed(kind, value, fmt, feed_url):
+    title, posts = get_feed_source(kind, value)
+    if fmt == "json":
+        body = render_json_feed(title, feed_url, posts)
+    else:
+        feed_class = Atom1Feed if fmt == "atom" else Rss201rev2Feed
+        body = render_syndication_feed(feed_class, title, feed_url, posts)
+    # A scheduled post can go live after its last edit
+    last_modified = max(
+        (max(post.updated_at, post.published_at) for post in posts), default=None
+    )
+    return {
+        "body": body,
+        "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        "last_modified": last_modified.timestamp() if last_modified else None,
+    }
+
+
+def get_feed(kind, value, fmt, feed_url):
+    """Return the cached feed entry, building it on a miss"""
+    key = feed_cache_key(kind, value, fmt)
+    entry = cache.get(key)
+    if entry is None:
+        entry = build_feed(kind, value, fmt, feed_url)
+        cache.set(key, entry, FEED_CACHE_TIMEOUT)
+    return entry
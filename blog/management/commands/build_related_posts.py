@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.recommendations import rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = "Recompute the related posts of every published blog post"
+
+    def handle(self, *args, **options):
+        count = rebuild_related_posts()
+        self.stdout.write(self.style.SUCCESS(f"Related posts built for {count} posts"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.trending import TRENDING_SIZE, compute_trending_posts
+
+
+class Command(BaseCommand):
+    help = "Rebuild the trending blog posts leaderboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=TRENDING_SIZE)
+
+    def handle(self, *args, **options):
+        count = compute_trending_posts(size=options["size"])
+        self.stdout.write(self.style.SUCCESS(f"Trending leaderboard has {count} posts"))
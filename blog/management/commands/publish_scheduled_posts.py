@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.publishing import next_publish_at, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = "Make scheduled blog posts live once their publish time has passed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and wake up when the next post is due",
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=60,
+            help="Longest wait between checks, picks up newly scheduled posts",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            changed = publish_due_posts()
+            if changed:
+                self.stdout.write(f"Updated visibility of {len(changed)} posts")
+            if not options["loop"]:
+                break
+
+            sleep_for = options["max_sleep"]
+            upcoming = next_publish_at()
+            if upcoming is not None:
+                due_in = (upcoming - timezone.now()).total_seconds()
+                sleep_for = min(sleep_for, max(due_in, 0))
+            time.sleep(sleep_for)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.recommendations import refresh_pending_related_posts
+
+
+class Command(BaseCommand):
+    help = "Refresh the related posts of the blog posts changed since the last run"
+
+    def handle(self, *args, **options):
+        count = refresh_pending_related_posts()
+        self.stdout.write(self.style.SUCCESS(f"Applied {count} queued changes"))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_alter_newslettersubscriber_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="rendered_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="updated_at of the revision rendered_content was built from",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="rendered_content",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
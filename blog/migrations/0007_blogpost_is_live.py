@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:13
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_live_posts(apps, schema_editor):
+    BlogPost = apps.get_model("blog", "BlogPost")
+    BlogPost.objects.filter(
+        status="published", published_at__lte=timezone.now()
+    ).update(is_live=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_postdailystats_trendingpost"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="is_live",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Published and past published_at, maintained by blog.publishing",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["is_live", "-published_at"],
+                name="blog_blogpo_is_live_f6339c_idx",
+            ),
+        ),
+        migrations.RunPython(set_live_posts, migrations.RunPython.noop),
+    ]
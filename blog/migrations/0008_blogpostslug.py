@@ -0,0 +1,43 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_blogpost_is_live"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogPostSlug",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("slug", models.SlugField(max_length=255, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="blogpost",
+            name="blog_blogpo_slug_361555_idx",
+        ),
+        migrations.AddField(
+            model_name="blogpostslug",
+            name="post",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="slug_history",
+                to="blog.blogpost",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_blogpostslug"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["updated_at", "id"], name="blog_blogpo_updated_a6fff1_idx"
+            ),
+        ),
+    ]
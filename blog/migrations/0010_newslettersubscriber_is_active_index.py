@@ -0,0 +1,20 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_blogpost_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="newslettersubscriber",
+            index=models.Index(
+                fields=["is_active", "-created_at"],
+                name="blog_newsle_is_acti_c5dbb8_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-19 14:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_newslettersubscriber_is_active_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPostsRefresh",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("post_id", models.BigIntegerField()),
+                ("requested_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -1,8 +1,11 @@
 from ckeditor.fields import RichTextField
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 
+from core.caching import CachedManager
+
 
 # Create your models here.
 class Topic(models.Model):
@@ -31,6 +34,7 @@ class NewsletterSubscriber(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["is_active", "-created_at"])]
 
 
 class Author(models.Model):
@@ -40,6 +44,8 @@ class Author(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CachedManager()
+
     def __str__(self):
         return self.name
 
@@ -50,6 +56,8 @@ class Category(models.Model):
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CachedManager()
+
     class Meta:
         verbose_name_plural = "Categories"
 
@@ -67,6 +75,8 @@ class Tag(models.Model):
     slug = models.SlugField(max_length=50, unique=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CachedManager()
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
@@ -83,6 +93,13 @@ class BlogPost(models.Model):
         max_length=500, help_text="Brief description of the post"
     )
     content = RichTextField(help_text="Main content of the blog post")
+    rendered_content = models.TextField(blank=True, editable=False)
+    rendered_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="updated_at of the revision rendered_content was built from",
+    )
 
     # Relationships
     author = models.ForeignKey(
@@ -127,23 +144,159 @@ class BlogPost(models.Model):
         ("archived", "Archived"),
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="draft")
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Published and past published_at, maintained by blog.publishing",
+    )
 
     class Meta:
         ordering = ["-published_at", "-created_at"]
         indexes = [
             models.Index(fields=["status", "published_at"]),
+            models.Index(fields=["is_live", "-published_at"]),
             models.Index(fields=["featured"]),
-            models.Index(fields=["slug"]),
+            models.Index(fields=["updated_at", "id"]),
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Store the original slug to keep redirects from renamed posts. Read
+        # from __dict__ so instances loaded with .only() don't fetch it.
+        self._original_slug = self.__dict__.get("slug")
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
+        from .slugs import allocate_slug, record_slug_change
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            if not self.slug:
+                self.slug = allocate_slug(self.title, exclude_pk=self.pk)
+            self.is_live = self.should_be_live()
+        elif {"status", "published_at"} & set(update_fields):
+            self.is_live = self.should_be_live()
+            kwargs["update_fields"] = {*update_fields, "is_live"}
         super().save(*args, **kwargs)
+        if update_fields is None or "slug" in update_fields:
+            record_slug_change(self, self._original_slug)
+            self._original_slug = self.slug
 
     def __str__(self):
         return self.title
 
+    def should_be_live(self, now=None):
+        return self.is_published and self.published_at <= (now or timezone.now())
+
     @property
     def is_published(self):
         return self.status == "published" and self.published_at is not None
+
+    @property
+    def has_fresh_render(self):
+        return self.rendered_at is not None and self.rendered_at == self.updated_at
+
+    def render(self):
+        """Render content for the current revision and store it without a full save"""
+        from .rendering import render_content
+
+        self.rendered_content = render_content(self.content)
+        self.rendered_at = self.updated_at
+        BlogPost.objects.filter(pk=self.pk).update(
+            rendered_content=self.rendered_content, rendered_at=self.rendered_at
+        )
+        return self.rendered_content
+
+    def get_rendered_content(self):
+        if self.has_fresh_render:
+            return self.rendered_content
+        return self.render()
+
+
+class BlogPostSlug(models.Model):
+    """A previous slug of a post, redirected to its current slug"""
+
+    post = models.ForeignKey(
+        BlogPost, on_delete=models.CASCADE, related_name="slug_history"
+    )
+    slug = models.SlugField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.slug
+
+
+class RelatedPost(models.Model):
+    """Precomputed nearest neighbours of a post, see blog.recommendations"""
+
+    post = models.ForeignKey(
+        BlogPost, on_delete=models.CASCADE, related_name="related_posts"
+    )
+    related = models.ForeignKey(
+        BlogPost, on_delete=models.CASCADE, related_name="related_to"
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["post", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "rank"], name="unique_related_post_rank"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class RelatedPostsRefresh(models.Model):
+    """
+    A change to a post not yet reflected in the neighbour lists, see
+    blog.recommendations. The post may be gone, so it's not a foreign key.
+    """
+
+    post_id = models.BigIntegerField()
+    requested_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.post_id} at {self.requested_at}"
+
+
+class PostDailyStats(models.Model):
+    """Views and likes a post received on a given day, see blog.trending"""
+
+    post = models.ForeignKey(
+        BlogPost, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    likes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Post daily stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "date"], name="unique_post_daily_stats"
+            ),
+        ]
+        indexes = [models.Index(fields=["date"])]
+
+    def __str__(self):
+        return f"{self.post_id} on {self.date}"
+
+
+class TrendingPost(models.Model):
+    """Materialized trending leaderboard, rebuilt by compute_trending_posts"""
+
+    post = models.OneToOneField(
+        BlogPost, on_delete=models.CASCADE, related_name="trending"
+    )
+    score = models.FloatField()
+    rank = models.PositiveIntegerField(unique=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["rank"]
+
+    def __str__(self):
+        return f"#{self.rank} {self.post_id}"
@@ -0,0 +1,61 @@
+"""
+Scheduled publishing.
+
+``BlogPost.is_live`` is the indexed flag public querysets filter on, so they
+no longer depend on the current time. Saving a post sets it directly; posts
+scheduled for later are flipped by ``publish_due_posts``, which runs from a
+Zappa scheduled event or the ``publish_scheduled_posts --loop`` command.
+"""
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import BlogPost
+
+# Sent with ``post_ids`` when posts went live or stopped being live without a
+# regular save, e.g. scheduled publishing or bulk admin actions.
+posts_visibility_changed = Signal()
+
+
+def publish_due_posts(now=None):
+    """Sync is_live with status and published_at, return the changed post ids"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = list(
+            BlogPost.objects.filter(
+                is_live=False, status="published", published_at__lte=now
+            ).values_list("pk", flat=True)
+        )
+        expired = list(
+            BlogPost.objects.filter(is_live=True)
+            .exclude(status="published", published_at__lte=now)
+            .values_list("pk", flat=True)
+        )
+        BlogPost.objects.filter(pk__in=due).update(is_live=True, updated_at=now)
+        BlogPost.objects.filter(pk__in=expired).update(is_live=False, updated_at=now)
+
+    changed = due + expired
+    if changed:
+        notify_visibility_changed(changed)
+    return changed
+
+
+def next_publish_at(now=None):
+    """When the next scheduled post is due, or None"""
+    return (
+        BlogPost.objects.filter(
+            is_live=False,
+            status="published",
+            published_at__gt=now or timezone.now(),
+        )
+        .order_by("published_at")
+        .values_list("published_at", flat=True)
+        .first()
+    )
+
+
+def notify_visibility_changed(post_ids):
+    transaction.on_commit(
+        lambda: posts_visibility_changed.send(sender=BlogPost, post_ids=post_ids)
+    )
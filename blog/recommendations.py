@@ -0,0 +1,240 @@
+"""
+Related posts recommender.
+
+Every published post is embedded as a TF-IDF vector over its title, excerpt and
+plain-text content, concatenated with one-hot category and tag features. The
+top-k cosine neighbours of each post are stored in ``RelatedPost`` so the
+``related`` endpoint is a single indexed lookup.
+
+Saves don't recompute anything, they queue the post in ``RelatedPostsRefresh``
+and a scheduled task refreshes the lists for every queued change at once.
+"""
+
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Min, Prefetch
+from django.utils.html import strip_tags
+
+from .models import BlogPost, RelatedPost, RelatedPostsRefresh, Tag
+
+RELATED_POSTS_LIMIT = 6
+# Share of the similarity coming from text, the rest comes from category and tags
+TEXT_WEIGHT = 0.7
+LABEL_WEIGHT = 1 - TEXT_WEIGHT
+# Rows of the similarity matrix computed per batch
+BATCH_SIZE = 256
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#-]+")
+STOP_WORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because
+    been before being below between both but by can could did do does doing down
+    during each few for from further had has have having he her here hers him his
+    how if in into is it its itself just me more most my no nor not now of off on
+    once only or other our ours out over own same she should so some such than that
+    the their theirs them then there these they this those through to too under
+    until up very was we were what when where which while who whom why will with
+    would you your yours
+    """.split()
+)
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS
+    ]
+
+
+def load_corpus():
+    """Return ids, token lists and label lists for every published post"""
+    posts = (
+        BlogPost.objects.filter(is_live=True)
+        .only("id", "title", "excerpt", "content", "category_id")
+        .prefetch_related(Prefetch("tags", queryset=Tag.objects.only("id")))
+        .order_by("id")
+    )
+    ids, documents, labels = [], [], []
+    for post in posts:
+        ids.append(post.pk)
+        # The title is repeated to weigh it above the body
+        text = " ".join(
+            [post.title, post.title, post.excerpt, strip_tags(post.content)]
+        )
+        documents.append(tokenize(text))
+        post_labels = [f"tag:{tag.pk}" for tag in post.tags.all()]
+        if post.category_id:
+            post_labels.append(f"category:{post.category_id}")
+        labels.append(post_labels)
+    return ids, documents, labels
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def build_vectors(documents, labels):
+    """Return an L2-normalized feature matrix with one row per document"""
+    count = len(documents)
+    term_counts = [Counter(document) for document in documents]
+    document_frequency = Counter(term for counts in term_counts for term in counts)
+    idf = {
+        term: math.log((1 + count) / (1 + frequency)) + 1
+        for term, frequency in document_frequency.items()
+    }
+    # Terms found in a single document never contribute to a dot product, so
+    # only shared terms get a column. They still count towards the row norm.
+    columns = {
+        term: index
+        for index, term in enumerate(
+            term for term, frequency in document_frequency.items() if frequency > 1
+        )
+    }
+
+    text = np.zeros((count, len(columns)), dtype=np.float32)
+    norms = np.zeros(count, dtype=np.float32)
+    for row, counts in enumerate(term_counts):
+        total = sum(counts.values()) or 1
+        squared = 0.0
+        for term, term_count in counts.items():
+            weight = term_count / total * idf[term]
+            squared += weight * weight
+            column = columns.get(term)
+            if column is not None:
+                text[row, column] = weight
+        norms[row] = math.sqrt(squared)
+    text /= np.maximum(norms, 1e-12)[:, None]
+
+    label_columns = {
+        label: index
+        for index, label in enumerate(
+            sorted({label for row in labels for label in row})
+        )
+    }
+    one_hot = np.zeros((count, len(label_columns)), dtype=np.float32)
+    for row, row_labels in enumerate(labels):
+        for label in row_labels:
+            one_hot[row, label_columns[label]] = 1.0
+    one_hot = normalize_rows(one_hot)
+
+    vectors = np.hstack(
+        [text * math.sqrt(TEXT_WEIGHT), one_hot * math.sqrt(LABEL_WEIGHT)]
+    )
+    return normalize_rows(vectors)
+
+
+def top_neighbors(vectors, rows, limit=RELATED_POSTS_LIMIT):
+    """Yield ``(row, [(neighbor_row, score), ...])`` for the given rows"""
+    limit = min(limit, len(vectors) - 1)
+    if limit <= 0:
+        for row in rows:
+            yield row, []
+        return
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = np.asarray(rows[start : start + BATCH_SIZE])
+        scores = vectors[batch] @ vectors.T
+        scores[np.arange(len(batch)), batch] = -np.inf
+        candidates = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        for offset, row in enumerate(batch):
+            row_scores = scores[offset, candidates[offset]]
+            order = np.argsort(-row_scores, kind="stable")
+            yield int(row), [
+                (int(candidates[offset, index]), float(row_scores[index]))
+                for index in order
+                if row_scores[index] > 0
+            ]
+
+
+@transaction.atomic
+def store_neighbors(ids, vectors, rows):
+    post_ids = [ids[row] for row in rows]
+    RelatedPost.objects.filter(post_id__in=post_ids).delete()
+    RelatedPost.objects.bulk_create(
+        RelatedPost(post_id=ids[row], related_id=ids[neighbor], score=score, rank=rank)
+        for row, neighbors in top_neighbors(vectors, rows)
+        for rank, (neighbor, score) in enumerate(neighbors, start=1)
+    )
+
+
+def rebuild_related_posts():
+    """Recompute the neighbour lists of every published post"""
+    ids, documents, labels = load_corpus()
+    RelatedPost.objects.exclude(post_id__in=ids).delete()
+    if not ids:
+        return 0
+    vectors = build_vectors(documents, labels)
+    store_neighbors(ids, vectors, list(range(len(ids))))
+    return len(ids)
+
+
+def refresh_related_posts(post_ids):
+    """
+    Update neighbour lists after the given posts changed.
+
+    Only the changed posts and the posts whose stored lists they enter or
+    leave are recomputed. The vectors are built once for all of them.
+    """
+    ids, documents, labels = load_corpus()
+    stored = {
+        row["post_id"]: row
+        for row in RelatedPost.objects.values("post_id").annotate(
+            lowest_score=Min("score"), count=Count("id")
+        )
+    }
+    affected = set(
+        RelatedPost.objects.filter(related_id__in=post_ids).values_list(
+            "post_id", flat=True
+        )
+    )
+    position = {pk: row for row, pk in enumerate(ids)}
+
+    removed = [pk for pk in post_ids if pk not in position]
+    if removed:
+        RelatedPost.objects.filter(post_id__in=removed).delete()
+        # Lists that referenced a removed post are short one entry now
+        affected |= {
+            pk
+            for pk, row in stored.items()
+            if row["count"] < RELATED_POSTS_LIMIT and pk not in removed
+        }
+
+    changed_rows = [position[pk] for pk in post_ids if pk in position]
+    rows = set(changed_rows)
+    vectors = build_vectors(documents, labels) if ids else None
+    if changed_rows:
+        # Best score of every post against any of the changed ones
+        scores = (vectors @ vectors[changed_rows].T).max(axis=1)
+        for row, pk in enumerate(ids):
+            current = stored.get(pk)
+            if scores[row] > 0 and (
+                current is None
+                or current["count"] < RELATED_POSTS_LIMIT
+                or scores[row] > current["lowest_score"]
+            ):
+                rows.add(row)
+    rows |= {position[pk] for pk in affected if pk in position}
+
+    if rows:
+        store_neighbors(ids, vectors, sorted(rows))
+    return len(rows)
+
+
+def refresh_pending_related_posts():
+    """Refresh the neighbour lists for the changes queued since the last run"""
+    with transaction.atomic():
+        pending = list(
+            RelatedPostsRefresh.objects.select_for_update(skip_locked=True).values_list(
+                "id", "post_id"
+            )
+        )
+        if not pending:
+            return 0
+        refresh_related_posts(list({post_id for _, post_id in pending}))
+        # Changes queued meanwhile stay for the next run
+        RelatedPostsRefresh.objects.filter(id__in=[pk for pk, _ in pending]).delete()
+    return len(pending)
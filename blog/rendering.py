@@ -0,0 +1,241 @@
+"""
+Render pipeline for CKEditor blog content.
+
+The stored ``BlogPost.content`` is raw editor HTML. ``render_content`` turns it
+into the HTML we serve: sanitized against an allowlist, with images pointed at
+CDN derivatives and headings given stable anchors.
+"""
+
+from html import escape
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.utils.text import slugify
+
+ALLOWED_TAGS = {
+    "a": {"href", "title", "target", "rel"},
+    "abbr": {"title"},
+    "b": set(),
+    "blockquote": set(),
+    "br": set(),
+    "caption": set(),
+    "code": {"class"},
+    "div": {"class"},
+    "em": set(),
+    "figcaption": set(),
+    "figure": {"class"},
+    "h1": set(),
+    "h2": set(),
+    "h3": set(),
+    "h4": set(),
+    "h5": set(),
+    "h6": set(),
+    "hr": set(),
+    "i": set(),
+    "img": {"src", "alt", "title", "width", "height"},
+    "li": set(),
+    "ol": {"start"},
+    "p": set(),
+    "pre": {"class"},
+    "s": set(),
+    "span": {"class"},
+    "strike": set(),
+    "strong": set(),
+    "sub": set(),
+    "sup": set(),
+    "table": set(),
+    "tbody": set(),
+    "td": {"colspan", "rowspan"},
+    "tfoot": set(),
+    "th": {"colspan", "rowspan", "scope"},
+    "thead": set(),
+    "tr": set(),
+    "u": set(),
+    "ul": set(),
+}
+
+# Elements whose whole subtree is dropped, not just the tags
+DROPPED_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "template"}
+
+# Elements without an end tag
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+URL_ATTRS = {"href", "src"}
+ALLOWED_URL_SCHEMES = {"http", "https", "mailto"}
+
+
+def is_safe_url(url):
+    scheme, sep, _ = url.partition(":")
+    if not sep or "/" in scheme:
+        # Relative URL or an anchor
+        return True
+    return scheme.strip().lower() in ALLOWED_URL_SCHEMES
+
+
+def image_source_path(src):
+    """Return the storage path of ``src`` if it is one of our uploads, else None"""
+    for prefix in settings.BLOG_IMAGE_SOURCE_PREFIXES:
+        if prefix and src.startswith(prefix):
+            return src[len(prefix) :].lstrip("/")
+    return None
+
+
+def image_derivative_url(path, width):
+    return f"{settings.BLOG_IMAGE_CDN_URL.rstrip('/')}/{path}?width={width}"
+
+
+class ContentRenderer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        # Open elements of the subtree being dropped
+        self.dropped_tags = []
+        # (tag, attrs, buffered output, buffered text) for the open heading
+        self.heading = None
+        self.heading_depth = None
+        self.anchors = set()
+
+    def write(self, chunk):
+        if self.heading:
+            self.heading[2].append(chunk)
+        else:
+            self.output.append(chunk)
+
+    def handle_starttag(self, tag, attrs):
+        if self.dropped_tags or tag in DROPPED_CONTENT_TAGS:
+            if tag not in VOID_TAGS:
+                self.dropped_tags.append(tag)
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+
+        attrs = self.clean_attrs(tag, attrs)
+        if tag == "img":
+            attrs = self.rewrite_image(attrs)
+        elif tag == "a" and attrs.get("target") == "_blank":
+            attrs["rel"] = "noopener noreferrer"
+
+        if tag in HEADING_TAGS and not self.heading:
+            self.heading = (tag, attrs, [], [])
+            self.heading_depth = len(self.open_tags)
+            self.open_tags.append(tag)
+            return
+
+        self.write(self.format_starttag(tag, attrs))
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if self.dropped_tags or tag in DROPPED_CONTENT_TAGS:
+            # Self-closing, so nothing is left open
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and tag in ALLOWED_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.dropped_tags:
+            # Unclosed elements inside the dropped one end with it
+            if tag in self.dropped_tags:
+                while self.dropped_tags.pop() != tag:
+                    pass
+            return
+        if tag not in self.open_tags:
+            return
+        # Close anything left open inside this element
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            if self.heading and len(self.open_tags) == self.heading_depth:
+                self.close_heading()
+            else:
+                self.write(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.dropped_tags:
+            return
+        if self.heading:
+            self.heading[3].append(data)
+        self.write(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.handle_endtag(self.open_tags[-1])
+
+    def close_heading(self):
+        tag, attrs, body, text = self.heading
+        self.heading = None
+        attrs["id"] = self.allocate_anchor("".join(text))
+        self.write(self.format_starttag(tag, attrs))
+        self.write("".join(body))
+        self.write(f"</{tag}>")
+
+    def allocate_anchor(self, text):
+        base = slugify(text) or "section"
+        anchor = base
+        counter = 1
+        while anchor in self.anchors:
+            counter += 1
+            anchor = f"{base}-{counter}"
+        self.anchors.add(anchor)
+        return anchor
+
+    def clean_attrs(self, tag, attrs):
+        allowed = ALLOWED_TAGS[tag]
+        cleaned = {}
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRS and not is_safe_url(value):
+                continue
+            cleaned[name] = value
+        return cleaned
+
+    def rewrite_image(self, attrs):
+        src = attrs.get("src")
+        path = image_source_path(src) if src else None
+        if path and settings.BLOG_IMAGE_CDN_URL:
+            widths = settings.BLOG_IMAGE_WIDTHS
+            attrs["src"] = image_derivative_url(path, widths[-1])
+            attrs["srcset"] = ", ".join(
+                f"{image_derivative_url(path, width)} {width}w" for width in widths
+            )
+            attrs["sizes"] = "(max-width: 768px) 100vw, 768px"
+        attrs["loading"] = "lazy"
+        attrs["decoding"] = "async"
+        return attrs
+
+    def format_starttag(self, tag, attrs):
+        rendered = "".join(
+            f' {name}="{escape(value)}"' for name, value in attrs.items()
+        )
+        return f"<{tag}{rendered}>"
+
+    def get_output(self):
+        return "".join(self.output)
+
+
+def render_content(html):
+    """Sanitize and post-process raw editor HTML"""
+    renderer = ContentRenderer()
+    renderer.feed(html or "")
+    renderer.close()
+    return renderer.get_output()
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from core.serializers import DynamicFieldsModelSerializer
+
 from .models import Author, BlogPost, Category, NewsletterSubscriber, Tag
 
 
@@ -10,25 +12,25 @@ class NewsletterSubscriberSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at"]
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Author
         fields = ["id", "name", "avatar", "bio"]
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Category
         fields = ["id", "name", "slug", "description"]
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Tag
         fields = ["id", "name", "slug"]
 
 
-class BlogPostListSerializer(serializers.ModelSerializer):
+class BlogPostListSerializer(DynamicFieldsModelSerializer):
     author = AuthorSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
@@ -54,11 +56,17 @@ class BlogPostListSerializer(serializers.ModelSerializer):
             "views",
             "status",
         ]
+        expandable_fields = ["author", "category", "tags"]
 
 
 class BlogPostDetailSerializer(BlogPostListSerializer):
+    content = serializers.CharField(source="get_rendered_content", read_only=True)
+
     class Meta(BlogPostListSerializer.Meta):
         fields = BlogPostListSerializer.Meta.fields + ["content"]
+        source_fields = {
+            "content": ["content", "rendered_content", "rendered_at", "updated_at"]
+        }
 
 
 class BlogPostCreateUpdateSerializer(serializers.ModelSerializer):
@@ -1,18 +1,33 @@
 import logging
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils import timezone
 
-from core.emails import (
-    send_admin_subscription_notification,
-    send_newsletter_subscription_confirmation,
-)
+from core.exports import schedule_export
+from core.sitemaps import schedule_sync
+from core.versions import bump_versions
+from core.webhooks import schedule_revalidation
 
-from .models import NewsletterSubscriber
+from .feeds import invalidate_feeds
+from .models import (
+    Author,
+    BlogPost,
+    Category,
+    NewsletterSubscriber,
+    RelatedPostsRefresh,
+    Tag,
+)
+from .publishing import posts_visibility_changed
+from .sitemaps import PostSitemap
+from .slugs import forget_slugs
 
 logger = logging.getLogger(__name__)
 
+# Saves that only touch these counters don't change content
+COUNTER_FIELDS = {"views", "likes"}
+
 
 @receiver(post_save, sender=NewsletterSubscriber)
 def on_newsletter_subscription(sender, instance, created, **kwargs):
@@ -21,6 +36,11 @@ def on_newsletter_subscription(sender, instance, created, **kwargs):
     Sends confirmation email to subscriber and notification to admins.
     """
     if created and instance.is_active:
+        from core.emails import (
+            send_admin_subscription_notification,
+            send_newsletter_subscription_confirmation,
+        )
+
         try:
             # Send confirmation email to subscriber
             send_newsletter_subscription_confirmation(instance.email)
@@ -35,3 +55,83 @@ def on_newsletter_subscription(sender, instance, created, **kwargs):
                 f"Error sending newsletter subscription emails for {instance.email}: {str(e)}"
             )
             # Continue execution - don't fail the subscription if emails fail
+
+
+@receiver(post_save, sender=BlogPost)
+def on_blog_post_saved(sender, instance, update_fields=None, **kwargs):
+    """Pre-render the content of new revisions so reads serve the stored HTML"""
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+    if instance.has_fresh_render:
+        return
+    try:
+        instance.render()
+    except Exception as e:
+        logger.error(f"Error rendering content for blog post {instance.pk}: {str(e)}")
+
+
+def schedule_related_posts_refresh(*post_ids):
+    """
+    Queue the posts for blog.tasks.refresh_related_posts. The queue is written
+    in the same transaction as the change, so it can't be lost.
+    """
+    RelatedPostsRefresh.objects.bulk_create(
+        RelatedPostsRefresh(post_id=post_id) for post_id in post_ids
+    )
+
+
+@receiver(post_save, sender=BlogPost)
+def on_blog_post_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+    schedule_related_posts_refresh(instance.pk)
+
+
+@receiver(post_delete, sender=BlogPost)
+def on_blog_post_deleted(sender, instance, **kwargs):
+    schedule_related_posts_refresh(instance.pk)
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def on_blog_post_tags_changed(sender, instance, action, reverse, **kwargs):
+    if reverse or action not in ("post_add", "post_remove", "post_clear"):
+        return
+    schedule_related_posts_refresh(instance.pk)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def on_feed_content_changed(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+    invalidate_feeds()
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def on_feed_tags_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_feeds()
+
+
+@receiver(posts_visibility_changed)
+def on_posts_visibility_changed(sender, post_ids, **kwargs):
+    """Refresh everything derived from the set of live posts"""
+    bump_versions(BlogPost, post_ids)
+    invalidate_feeds()
+    schedule_sync(PostSitemap(), post_ids)
+    schedule_revalidation(PostSitemap(), BlogPost.objects.filter(pk__in=post_ids))
+    schedule_related_posts_refresh(*post_ids)
+    schedule_export()
+
+
+@receiver(pre_delete, sender=BlogPost)
+def on_blog_post_slug_deleted(sender, instance, **kwargs):
+    # Read the history before the cascade removes it
+    slugs = [instance.slug, *instance.slug_history.values_list("slug", flat=True)]
+    transaction.on_commit(lambda: forget_slugs(slugs))
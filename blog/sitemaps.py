@@ -0,0 +1,35 @@
+from core.sitemaps import SitemapSection
+
+from .models import BlogPost, Category, Tag
+
+
+class PostSitemap(SitemapSection):
+    name = "posts"
+    model = BlogPost
+    ignored_fields = {"views", "likes"}
+    index_location = "/blog/"
+
+    def items(self):
+        return BlogPost.objects.filter(is_live=True)
+
+    def location(self, obj):
+        return f"/blog/{obj.slug}/"
+
+    def last_modified(self, obj):
+        return obj.updated_at
+
+
+class CategorySitemap(SitemapSection):
+    name = "categories"
+    model = Category
+
+    def location(self, obj):
+        return f"/blog/category/{obj.slug}/"
+
+
+class TagSitemap(SitemapSection):
+    name = "tags"
+    model = Tag
+
+    def location(self, obj):
+        return f"/blog/tag/{obj.slug}/"
@@ -0,0 +1,100 @@
+"""
+Blog post slugs: collision-free allocation, renames and slug lookups.
+
+Lookups go through a cached slug -> post id map so detail routes don't need
+a slug query per request. Old slugs are kept in ``BlogPostSlug`` and resolve
+to a redirect to the current one.
+"""
+
+import re
+
+from django.core.cache import cache
+from django.utils.text import slugify
+
+from .models import BlogPost, BlogPostSlug
+
+SLUG_CACHE_TIMEOUT = 60 * 60
+# Room left for a "-<n>" suffix when the title slug is truncated
+SLUG_SUFFIX_LENGTH = 8
+
+
+def allocate_slug(title, exclude_pk=None):
+    """
+    Return a unique slug for ``title``.
+
+    Every slug already using the base as a prefix, current or historical, is
+    fetched in one prefix scan and the first free ``-<n>`` suffix is taken.
+    """
+    max_length = BlogPost._meta.get_field("slug").max_length
+    base = slugify(title)[: max_length - SLUG_SUFFIX_LENGTH].strip("-") or "post"
+
+    current = (
+        BlogPost.objects.filter(slug__startswith=base)
+        .exclude(pk=exclude_pk)
+        .order_by()
+        .values_list("slug", flat=True)
+    )
+    historical = (
+        BlogPostSlug.objects.filter(slug__startswith=base)
+        .exclude(post_id=exclude_pk)
+        .order_by()
+        .values_list("slug", flat=True)
+    )
+    taken = set(current.union(historical))
+    if base not in taken:
+        return base
+
+    suffix = re.compile(rf"^{re.escape(base)}-(\d+)$")
+    used = {int(match.group(1)) for match in map(suffix.match, taken) if match}
+    number = 2
+    while number in used:
+        number += 1
+    return f"{base}-{number}"
+
+
+def slug_cache_key(slug):
+    return f"blog:slug:{slug}"
+
+
+def forget_slugs(slugs):
+    cache.delete_many([slug_cache_key(slug) for slug in slugs if slug])
+
+
+def record_slug_change(post, original_slug):
+    """Keep a redirect from ``original_slug`` after a post was renamed"""
+    if original_slug == post.slug:
+        return
+    if not original_slug:
+        # A new post may take a slug cached as missing
+        forget_slugs([post.slug])
+        return
+
+    BlogPostSlug.objects.filter(slug=post.slug).delete()
+    BlogPostSlug.objects.update_or_create(slug=original_slug, defaults={"post": post})
+    # Cached redirects from older slugs point at the previous slug
+    history = BlogPostSlug.objects.filter(post=post).values_list("slug", flat=True)
+    forget_slugs([post.slug, *history])
+
+
+def resolve_slug(slug):
+    """
+    Map a slug to ``("post", id)``, ``("redirect", current_slug)`` or
+    ``("missing", None)``.
+    """
+    key = slug_cache_key(slug)
+    resolved = cache.get(key)
+    if resolved is not None:
+        return resolved
+
+    post_id = BlogPost.objects.filter(slug=slug).values_list("pk", flat=True).first()
+    if post_id is not None:
+        resolved = ("post", post_id)
+    else:
+        current_slug = (
+            BlogPostSlug.objects.filter(slug=slug)
+            .values_list("post__slug", flat=True)
+            .first()
+        )
+        resolved = ("redirect", current_slug) if current_slug else ("missing", None)
+    cache.set(key, resolved, SLUG_CACHE_TIMEOUT)
+    return resolved
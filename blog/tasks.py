@@ -0,0 +1,19 @@
+"""Entry points for Zappa scheduled events, see zappa_settings.json"""
+
+from .publishing import publish_due_posts
+from .trending import compute_trending_posts as compute_trending
+
+
+def compute_trending_posts(event, context):
+    return compute_trending()
+
+
+def publish_scheduled_posts(event, context):
+    return len(publish_due_posts())
+
+
+def refresh_related_posts(event, context):
+    # numpy is only imported when the task runs, not on every cold start
+    from .recommendations import refresh_pending_related_posts
+
+    return refresh_pending_related_posts()
@@ -1,3 +1,260 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from core.versions import get_versions, model_key
+
+from .models import (
+    Author,
+    BlogPost,
+    BlogPostSlug,
+    Category,
+    PostDailyStats,
+    Tag,
+    TrendingPost,
+)
+from .rendering import render_content
+from .slugs import allocate_slug
+from .trending import (
+    LIKE_WEIGHT,
+    TRENDING_HALF_LIFE_DAYS,
+    compute_trending_posts,
+    decayed_score,
+    record_post_activity,
+)
+
+
+class RenderContentTests(SimpleTestCase):
+    def test_keeps_allowed_markup(self):
+        html = '<p>Hello <strong>world</strong> <a href="/about">about</a></p>'
+        self.assertEqual(render_content(html), html)
+
+    def test_strips_disallowed_tags_and_attributes(self):
+        self.assertEqual(
+            render_content('<p onclick="x()" class="lead">a <font>b</font></p>'),
+            "<p>a b</p>",
+        )
+
+    def test_drops_unsafe_urls(self):
+        self.assertEqual(
+            render_content('<a href="javascript:alert(1)">x</a>'), "<a>x</a>"
+        )
+
+    def test_drops_script_content(self):
+        self.assertEqual(
+            render_content("<p>a</p><script>alert('<p>')</script><p>b</p>"),
+            "<p>a</p><p>b</p>",
+        )
+
+    def test_void_elements_inside_dropped_content(self):
+        self.assertEqual(
+            render_content('<p>a</p><embed src="x"><p>important</p>'),
+            "<p>a</p><p>important</p>",
+        )
+        self.assertEqual(
+            render_content(
+                '<object><param name="a"><source src="b"></object><p>after</p>'
+            ),
+            "<p>after</p>",
+        )
+
+    def test_self_closing_dropped_element(self):
+        self.assertEqual(
+            render_content('<iframe src="x" /><p>after</p>'), "<p>after</p>"
+        )
+
+    def test_unclosed_element_inside_dropped_content(self):
+        self.assertEqual(
+            render_content("<object><div>a</object><p>after</p>"), "<p>after</p>"
+        )
+
+    def test_closes_unclosed_tags(self):
+        self.assertEqual(
+            render_content("<p><strong>a</p><p>b"),
+            "<p><strong>a</strong></p><p>b</p>",
+        )
+
+    def test_escapes_text(self):
+        self.assertEqual(
+            render_content("<p>&lt;b&gt; &amp;</p>"), "<p>&lt;b&gt; &amp;</p>"
+        )
+
+    def test_heading_anchors_are_unique(self):
+        self.assertEqual(
+            render_content("<h2>Intro</h2><h2>Intro</h2><h3></h3>"),
+            '<h2 id="intro">Intro</h2><h2 id="intro-2">Intro</h2>'
+            '<h3 id="section"></h3>',
+        )
+
+    def test_blank_target_gets_rel(self):
+        self.assertEqual(
+            render_content('<a href="https://x.com" target="_blank">x</a>'),
+            '<a href="https://x.com" target="_blank" rel="noopener noreferrer">x</a>',
+        )
+
+    @override_settings(
+        BLOG_IMAGE_CDN_URL="https://cdn.example.com/",
+        BLOG_IMAGE_WIDTHS=[480, 960],
+        BLOG_IMAGE_SOURCE_PREFIXES=["https://uploads.example.com/"],
+    )
+    def test_rewrites_uploaded_images(self):
+        self.assertEqual(
+            render_content('<img src="https://uploads.example.com/a.png" alt="A">'),
+            '<img src="https://cdn.example.com/a.png?width=960" alt="A" '
+            'srcset="https://cdn.example.com/a.png?width=480 480w, '
+            'https://cdn.example.com/a.png?width=960 960w" '
+            'sizes="(max-width: 768px) 100vw, 768px" loading="lazy" decoding="async">',
+        )
+
+    def test_empty_content(self):
+        self.assertEqual(render_content(None), "")
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_feed_url_ignores_query_string(self):
+        self.client.get("/blog/feed.json?utm_source=newsletter")
+        response = self.client.get("/blog/feed.json")
+        self.assertEqual(
+            response.json()["feed_url"], "http://testserver/blog/feed.json"
+        )
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name="Author")
+        category = Category.objects.create(name="Category", slug="category")
+        tags = [Tag.objects.create(name=f"Tag {i}", slug=f"tag-{i}") for i in range(3)]
+        for i in range(3):
+            post = BlogPost.objects.create(
+                title=f"Post {i}",
+                excerpt="Excerpt",
+                content="<p>Content</p>",
+                author=author,
+                category=category,
+                status="published",
+                published_at=timezone.now() - timedelta(hours=1),
+            )
+            post.tags.set(tags)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_narrow_fields_skip_relations(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/blog/posts/")
+        self.assertIn("tags", response.json()[0])
+
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get("/blog/posts/?fields=id,title")
+        self.assertEqual(set(response.json()[0]), {"id", "title"})
+
+
+class AllocateSlugTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name="Author")
+        cls.category = Category.objects.create(name="Category", slug="category")
+
+    def create_post(self, slug):
+        return BlogPost.objects.create(
+            title=slug,
+            slug=slug,
+            content="<p>Content</p>",
+            author=self.author,
+            category=self.category,
+        )
+
+    def test_free_slug(self):
+        self.create_post("hello-world-again")
+        self.assertEqual(allocate_slug("Hello, World!"), "hello-world")
+
+    def test_takes_first_free_suffix(self):
+        for slug in ["hello-world", "hello-world-2", "hello-world-4"]:
+            self.create_post(slug)
+        self.assertEqual(allocate_slug("Hello world"), "hello-world-3")
+
+    def test_historical_slugs_are_taken(self):
+        post = self.create_post("renamed")
+        BlogPostSlug.objects.create(slug="hello-world", post=post)
+        self.assertEqual(allocate_slug("Hello world"), "hello-world-2")
+
+    def test_excluded_post_keeps_its_slug(self):
+        post = self.create_post("hello-world")
+        self.assertEqual(
+            allocate_slug("Hello world", exclude_pk=post.pk), "hello-world"
+        )
+
+    def test_long_and_empty_titles(self):
+        max_length = BlogPost._meta.get_field("slug").max_length
+        self.assertLessEqual(len(allocate_slug("word " * 100)), max_length - 8)
+        self.assertEqual(allocate_slug("!!!"), "post")
+
+
+class DecayedScoreTests(SimpleTestCase):
+    def test_weighs_likes(self):
+        self.assertEqual(decayed_score(10, 2, 0), 10 + 2 * LIKE_WEIGHT)
+
+    def test_halves_every_half_life(self):
+        self.assertAlmostEqual(decayed_score(100, 0, TRENDING_HALF_LIFE_DAYS), 50)
+        self.assertAlmostEqual(decayed_score(100, 0, 2 * TRENDING_HALF_LIFE_DAYS), 25)
+
+    def test_no_activity(self):
+        self.assertEqual(decayed_score(0, 0, 3), 0)
+
+
+class RevalidationViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = BlogPost.objects.create(
+            title="Post",
+            content="<p>Content</p>",
+            author=Author.objects.create(name="Author"),
+            category=Category.objects.create(name="Category", slug="category"),
+            status="published",
+            published_at=timezone.now() - timedelta(hours=1),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_revalidations_are_views(self):
+        for lookup in [self.post.slug, str(self.post.pk)]:
+            with self.subTest(lookup=lookup):
+                path = f"/blog/posts/{lookup}/"
+                etag = self.client.get(path)["ETag"]
+                response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 4)
+        self.assertEqual(PostDailyStats.objects.get(post=self.post).views, 4)
+
+
+class TrendingPostsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_first_run_bumps_the_version(self):
+        post = BlogPost.objects.create(
+            title="Post",
+            content="<p>Content</p>",
+            author=Author.objects.create(name="Author"),
+            category=Category.objects.create(name="Category", slug="category"),
+            status="published",
+            published_at=timezone.now() - timedelta(hours=1),
+        )
+        record_post_activity(post.pk, views=3)
+        key = model_key(TrendingPost)
+        before = get_versions([key])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(compute_trending_posts(), 1)
+        self.assertNotEqual(get_versions([key]), before)
+        self.assertEqual(TrendingPost.objects.get().post, post)
@@ -0,0 +1,71 @@
+"""
+Trending posts.
+
+Views and likes are counted in per-day buckets. A periodic job scores every
+post over a recent window with exponentially decaying weights and rewrites
+the ``TrendingPost`` leaderboard, which the ``trending`` endpoint reads as is.
+"""
+
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.exports import schedule_export
+from core.versions import schedule_version_bump
+
+from .models import PostDailyStats, TrendingPost
+
+TRENDING_WINDOW_DAYS = 14
+TRENDING_HALF_LIFE_DAYS = 2
+TRENDING_SIZE = 20
+LIKE_WEIGHT = 5
+
+
+def record_post_activity(post_id, views=0, likes=0):
+    """Add views and likes to today's bucket of a post"""
+    today = timezone.localdate()
+    buckets = PostDailyStats.objects.filter(post_id=post_id, date=today)
+    if buckets.update(views=F("views") + views, likes=F("likes") + likes):
+        return
+    try:
+        with transaction.atomic():
+            PostDailyStats.objects.create(
+                post_id=post_id, date=today, views=views, likes=likes
+            )
+    except IntegrityError:
+        # Another request created today's bucket first
+        buckets.update(views=F("views") + views, likes=F("likes") + likes)
+
+
+def decayed_score(views, likes, age_days):
+    return (views + LIKE_WEIGHT * likes) * 0.5 ** (age_days / TRENDING_HALF_LIFE_DAYS)
+
+
+def compute_trending_posts(size=TRENDING_SIZE):
+    """Score recent activity and materialize the top ``size`` posts"""
+    now = timezone.now()
+    today = timezone.localdate(now)
+    stats = PostDailyStats.objects.filter(
+        date__gt=today - timedelta(days=TRENDING_WINDOW_DAYS),
+        post__is_live=True,
+    ).values_list("post_id", "date", "views", "likes")
+
+    scores = defaultdict(float)
+    for post_id, date, views, likes in stats:
+        scores[post_id] += decayed_score(views, likes, (today - date).days)
+    leaders = heapq.nlargest(size, scores.items(), key=lambda item: item[1])
+
+    with transaction.atomic():
+        TrendingPost.objects.all().delete()
+        TrendingPost.objects.bulk_create(
+            TrendingPost(post_id=post_id, score=score, rank=rank, computed_at=now)
+            for rank, (post_id, score) in enumerate(leaders, start=1)
+        )
+        # bulk_create sends no signals, and there may be no rows to delete
+        schedule_version_bump(TrendingPost)
+        schedule_export()
+    return len(leaders)
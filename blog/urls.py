@@ -1,3 +1,4 @@
+from django.urls import re_path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
@@ -6,6 +7,7 @@ from .views import (
     CategoryViewSet,
     NewsletterSubscriberViewset,
     TagViewSet,
+    feed,
 )
 
 router = DefaultRouter()
@@ -15,4 +17,18 @@ router.register(r"authors", AuthorViewSet, basename="author")
 router.register(r"categories", CategoryViewSet, basename="category")
 router.register(r"tags", TagViewSet, basename="tag")
 
-urlpatterns = router.urls + []
+FEED_FORMAT = r"\.(?P<fmt>rss|atom|json)$"
+
+urlpatterns = [
+    re_path(rf"^feed{FEED_FORMAT}", feed, name="blog-feed"),
+    re_path(
+        rf"^feed/(?P<kind>category|tag)/(?P<value>[-\w]+){FEED_FORMAT}",
+        feed,
+        name="blog-feed-filtered",
+    ),
+    re_path(
+        rf"^feed/(?P<kind>author)/(?P<value>\d+){FEED_FORMAT}",
+        feed,
+        name="blog-feed-author",
+    ),
+] + router.urls
@@ -1,12 +1,27 @@
+from django.db.models import F
+from django.http import HttpResponse, HttpResponsePermanentRedirect
 from django.shortcuts import render
-from django.utils import timezone
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import get_object_or_404
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
+from core.mixins import (
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+)
+
+from .feeds import CONTENT_TYPES, get_feed
 from .models import Author, BlogPost, Category, NewsletterSubscriber, Tag
 from .serializers import (
     AuthorSerializer,
@@ -17,6 +32,8 @@ from .serializers import (
     NewsletterSubscriberSerializer,
     TagSerializer,
 )
+from .slugs import resolve_slug
+from .trending import record_post_activity
 
 
 # Create your views here.
@@ -79,9 +96,7 @@ class NewsletterSubscriberViewset(CreateModelMixin, GenericViewSet):
         featured_post = None
         if featured_post_id:
             try:
-                blog_post = BlogPost.objects.get(
-                    id=featured_post_id, status="published"
-                )
+                blog_post = BlogPost.objects.get(id=featured_post_id, is_live=True)
                 featured_post = {
                     "title": blog_post.title,
                     "excerpt": blog_post.excerpt,
@@ -92,9 +107,9 @@ class NewsletterSubscriberViewset(CreateModelMixin, GenericViewSet):
 
         # Get recent posts
         recent_posts_data = []
-        recent_posts = BlogPost.objects.filter(status="published").order_by(
-            "-published_at"
-        )[:5]
+        recent_posts = BlogPost.objects.filter(is_live=True).order_by("-published_at")[
+            :5
+        ]
         for post in recent_posts:
             recent_posts_data.append(
                 {
@@ -150,7 +165,13 @@ class NewsletterSubscriberViewset(CreateModelMixin, GenericViewSet):
             )
 
 
-class BlogPostViewSet(ModelViewSet):
+class BlogPostViewSet(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ModelViewSet,
+):
     queryset = BlogPost.objects.select_related("author", "category").prefetch_related(
         "tags"
     )
@@ -163,6 +184,13 @@ class BlogPostViewSet(ModelViewSet):
     search_fields = ["title", "excerpt", "content", "author__name"]
     ordering_fields = ["published_at", "created_at", "views", "likes", "title"]
     ordering = ["-published_at", "-created_at"]
+    lookup_field = "slug"
+    lookup_value_regex = r"[-\w]+"
+    cache_policy = {
+        "*": {"max_age": 60, "s_maxage": 300, "stale_while_revalidate": 600},
+        # Views served from a shared cache aren't counted
+        "retrieve": {"max_age": 60, "s_maxage": 60, "stale_while_revalidate": 300},
+    }
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -176,18 +204,58 @@ class BlogPostViewSet(ModelViewSet):
 
         # For public API, only show published posts
         if not (self.request.user and self.request.user.is_staff):
-            queryset = queryset.filter(
-                status="published", published_at__lte=timezone.now()
-            )
+            queryset = queryset.filter(is_live=True)
 
         return queryset
 
+    def get_post_id(self):
+        """Resolve the slug in the URL through the cached slug map"""
+        slug = self.kwargs[self.lookup_field]
+        kind, value = resolve_slug(slug)
+        if kind == "post":
+            return value
+        # Numeric ids are still accepted from older clients
+        if kind == "missing" and slug.isdigit():
+            return int(slug)
+        raise NotFound()
+
+    def get_version_row(self):
+        kind, value = resolve_slug(self.kwargs[self.lookup_field])
+        return value if kind == "post" else None
+
+    def not_modified(self, etag):
+        if self.action == "retrieve":
+            # Revalidations are still views
+            try:
+                post_id = self.get_post_id()
+            except NotFound:
+                pass
+            else:
+                BlogPost.objects.filter(pk=post_id).update(views=F("views") + 1)
+                record_post_activity(post_id, views=1)
+        return super().not_modified(etag)
+
+    def get_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        obj = get_object_or_404(queryset, pk=self.get_post_id())
+        self.check_object_permissions(self.request, obj)
+        return obj
+
     def retrieve(self, request, *args, **kwargs):
+        kind, current_slug = resolve_slug(kwargs[self.lookup_field])
+        if kind == "redirect":
+            url = reverse("blogpost-detail", kwargs={self.lookup_field: current_slug})
+            query = request.META.get("QUERY_STRING")
+            return HttpResponsePermanentRedirect(f"{url}?{query}" if query else url)
+
         instance = self.get_object()
-        # Increment view count
-        instance.views += 1
-        instance.save(update_fields=["views"])
-        return super().retrieve(request, *args, **kwargs)
+        # Increment view count, static exports aren't views
+        if not getattr(request, "static_export", False):
+            instance.views += 1
+            instance.save(update_fields=["views"])
+            record_post_activity(instance.pk, views=1)
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
 
     @action(detail=False, methods=["get"])
     def featured(self, request):
@@ -196,6 +264,28 @@ class BlogPostViewSet(ModelViewSet):
         serializer = self.get_serializer(featured_posts, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def trending(self, request):
+        """Get trending blog posts from the precomputed leaderboard"""
+        trending_posts = (
+            self.get_queryset()
+            .filter(trending__isnull=False)
+            .order_by("trending__rank")
+        )
+        serializer = self.get_serializer(trending_posts, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    def related(self, request, slug=None):
+        """Get posts related to a blog post"""
+        related_posts = (
+            self.get_queryset()
+            .filter(related_to__post_id=self.get_post_id())
+            .order_by("related_to__rank")
+        )
+        serializer = self.get_serializer(related_posts, many=True)
+        return Response(serializer.data)
+
     @action(detail=False, methods=["get"])
     def by_category(self, request):
         """Get posts grouped by category"""
@@ -207,30 +297,64 @@ class BlogPostViewSet(ModelViewSet):
         return Response({"error": "Category parameter is required"}, status=400)
 
     @action(detail=True, methods=["post"])
-    def like(self, request, pk=None):
+    def like(self, request, slug=None):
         """Like a blog post"""
         post = self.get_object()
         post.likes += 1
         post.save(update_fields=["likes"])
+        record_post_activity(post.pk, likes=1)
         return Response({"likes": post.likes})
 
 
-class AuthorViewSet(ModelViewSet):
-    queryset = Author.objects.all()
+class AuthorViewSet(
+    SparseFieldsetMixin, ConditionalGetMixin, CacheControlMixin, ModelViewSet
+):
+    queryset = Author.objects.cached()
     serializer_class = AuthorSerializer
+    cache_policy = {
+        "*": {"max_age": 300, "s_maxage": 3600, "stale_while_revalidate": 86400}
+    }
     filter_backends = [filters.SearchFilter]
     search_fields = ["name", "bio"]
 
 
-class CategoryViewSet(ModelViewSet):
-    queryset = Category.objects.all()
+class CategoryViewSet(
+    SparseFieldsetMixin, ConditionalGetMixin, CacheControlMixin, ModelViewSet
+):
+    queryset = Category.objects.cached()
     serializer_class = CategorySerializer
+    cache_policy = {
+        "*": {"max_age": 300, "s_maxage": 3600, "stale_while_revalidate": 86400}
+    }
     lookup_field = "slug"
 
 
-class TagViewSet(ModelViewSet):
-    queryset = Tag.objects.all()
+class TagViewSet(
+    SparseFieldsetMixin, ConditionalGetMixin, CacheControlMixin, ModelViewSet
+):
+    queryset = Tag.objects.cached()
     serializer_class = TagSerializer
+    cache_policy = {
+        "*": {"max_age": 300, "s_maxage": 3600, "stale_while_revalidate": 86400}
+    }
     lookup_field = "slug"
     filter_backends = [filters.SearchFilter]
     search_fields = ["name"]
+
+
+@require_safe
+def feed(request, fmt, kind="all", value=""):
+    """Serve an RSS, Atom or JSON feed of published posts"""
+    # The query string would be cached for every later subscriber
+    entry = get_feed(kind, value, fmt, request.build_absolute_uri(request.path))
+    response = HttpResponse(entry["body"], content_type=CONTENT_TYPES[fmt])
+    response["ETag"] = entry["etag"]
+    if entry["last_modified"]:
+        response["Last-Modified"] = http_date(entry["last_modified"])
+    patch_cache_control(response, public=True, max_age=300)
+    return get_conditional_response(
+        request,
+        etag=entry["etag"],
+        last_modified=entry["last_modified"],
+        response=response,
+    )
@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.utils import timezone
+
+from core.versions import schedule_version_bump
 
 from .models import *
 
@@ -14,10 +17,14 @@ class TestimonalAdmin(admin.ModelAdmin):
     search_fields = ["name", "position"]
 
     def activate_testimonal(self, request, queryset):
-        queryset.update(is_active=True)
+        pks = list(queryset.values_list("pk", flat=True))
+        queryset.update(is_active=True, updated_at=timezone.now())
+        schedule_version_bump(Testimonal, pks)
 
     def deactivate_testimonal(self, request, queryset):
-        queryset.update(is_active=False)
+        pks = list(queryset.values_list("pk", flat=True))
+        queryset.update(is_active=False, updated_at=timezone.now())
+        schedule_version_bump(Testimonal, pks)
 
     actions = [activate_testimonal, deactivate_testimonal]
 
@@ -0,0 +1,16 @@
+from core.exports import ExportSection
+
+from .models import Service, Testimonal
+
+
+class ServiceExport(ExportSection):
+    name = "services"
+    model = Service
+    path = "/clients/services/"
+    lookup_field = "pk"
+
+
+class TestimonalExport(ExportSection):
+    name = "testimonials"
+    model = Testimonal
+    path = "/clients/testimonials/"
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0004_testimonal_is_active"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="service",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="testimonal",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["updated_at", "id"], name="clients_ser_updated_55276b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testimonal",
+            index=models.Index(
+                fields=["updated_at", "id"], name="clients_tes_updated_ed370a_idx"
+            ),
+        ),
+    ]
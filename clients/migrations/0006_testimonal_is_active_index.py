@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0005_service_updated_at_testimonal_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="testimonal",
+            index=models.Index(
+                fields=["is_active"], name="clients_tes_is_acti_fecdad_idx"
+            ),
+        ),
+    ]
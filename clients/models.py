@@ -1,5 +1,7 @@
 from django.db import models
 
+from core.caching import CachedManager
+
 
 # Create your models here.
 class Client(models.Model):
@@ -16,6 +18,13 @@ class Testimonal(models.Model):
     avatar = models.ImageField(null=True, blank=True)
     position = models.CharField(max_length=255, blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"]),
+            models.Index(fields=["is_active"]),
+        ]
 
     def __str__(self):
         return self.name
@@ -24,6 +33,8 @@ class Testimonal(models.Model):
 class ServiceFeature(models.Model):
     name = models.CharField(max_length=255)
 
+    objects = CachedManager()
+
     def __str__(self):
         return self.name
 
@@ -35,6 +46,10 @@ class Service(models.Model):
     icon = models.CharField(max_length=255)
     features = models.ManyToManyField(ServiceFeature)
     category = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["updated_at", "id"])]
 
     def __str__(self):
         return self.title
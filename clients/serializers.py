@@ -1,16 +1,17 @@
 from rest_framework import serializers
-from rest_framework.serializers import ModelSerializer
+
+from core.serializers import DynamicFieldsModelSerializer
 
 from .models import *
 
 
-class TestimonalSerializer(ModelSerializer):
+class TestimonalSerializer(DynamicFieldsModelSerializer):
     class Meta:
         exclude = []
         model = Testimonal
 
 
-class ServiceSerializer(ModelSerializer):
+class ServiceSerializer(DynamicFieldsModelSerializer):
     features = serializers.StringRelatedField(many=True)
 
     class Meta:
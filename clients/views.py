@@ -3,6 +3,13 @@ from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from core.mixins import (
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+)
+
 from .models import Client
 from .serializers import *
 
@@ -13,11 +20,32 @@ class ClientCount(APIView):
         return {"client_count": client_count}
 
 
-class TestimonalViewset(ListModelMixin, GenericViewSet):
+class TestimonalViewset(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
     serializer_class = TestimonalSerializer
     queryset = Testimonal.objects.filter(is_active=True)
+    cache_policy = {
+        "*": {"max_age": 300, "s_maxage": 3600, "stale_while_revalidate": 86400}
+    }
 
 
-class ServiceViewset(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class ServiceViewset(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ListModelMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
+):
     serializer_class = ServiceSerializer
     queryset = Service.objects.all()
+    cache_policy = {
+        "*": {"max_age": 300, "s_maxage": 3600, "stale_while_revalidate": 86400}
+    }
@@ -0,0 +1,24 @@
+"""
+PostgreSQL backend timing every connection checkout.
+
+The time to get a connection, either from the pool or by connecting, is
+observed as ``db_checkout_seconds`` and added to the request's timings, so
+connection setup shows up separately from query time.
+"""
+
+import time
+
+from django.db.backends.postgresql import base
+
+from core.metrics import observe, record_timing
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        elapsed = time.perf_counter() - start
+        source = "pool" if self.pool else "connect"
+        observe("db_checkout_seconds", elapsed, alias=self.alias, source=source)
+        record_timing("db_checkout", elapsed)
+        return connection
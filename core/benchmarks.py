@@ -0,0 +1,316 @@
+"""
+Helpers shared by the benchmark management commands.
+
+Benchmarks seed their data inside ``rolled_back()`` so they can run against
+any database, including production, without leaving rows behind. They run in
+``private_cache()`` too, so nothing derived from the seeded rows reaches the
+shared cache.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+from statistics import median
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
+from django.urls import URLResolver, get_resolver
+from django.utils import timezone
+
+from .views import call_view
+
+# List endpoints whose size grows with the data
+LIST_ENDPOINTS = [
+    "/blog/posts/",
+    "/jobs/jobs/",
+    "/projects/projects/",
+    "/clients/services/",
+    "/clients/testimonials/",
+]
+
+
+def get_feed_arguments(kind):
+    from blog.models import Author, Category
+
+    if kind == "author":
+        author = Author.objects.order_by("-pk").first()
+        return author and {"fmt": "rss", "kind": kind, "value": author.pk}
+    category = Category.objects.order_by("-pk").first()
+    return category and {"fmt": "rss", "kind": kind, "value": category.slug}
+
+
+def get_schema_arguments():
+    from .schema import load_schema
+
+    built = load_schema()
+    return built and {"version": built["version"]}
+
+
+# Arguments of the routes that aren't viewset detail routes
+ROUTE_ARGUMENTS = {
+    "blog-feed": lambda: {"fmt": "rss"},
+    "blog-feed-filtered": lambda: get_feed_arguments("category"),
+    "blog-feed-author": lambda: get_feed_arguments("author"),
+    "schema-version": get_schema_arguments,
+}
+
+PARAGRAPH = (
+    "<p>Gumisofts builds software for teams across Ethiopia and beyond. "
+    "This paragraph stands in for a realistic article body with "
+    "<a href='https://gumisofts.com'>links</a> and <strong>markup</strong>.</p>"
+)
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back"""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+@contextmanager
+def private_cache():
+    """Run the block with an empty in-memory default cache"""
+    caches = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"benchmark-{uuid4().hex}",
+            "OPTIONS": {"MAX_ENTRIES": 100000},
+        }
+    }
+    with override_settings(CACHES=caches):
+        try:
+            yield
+        finally:
+            cache.clear()
+
+
+def seed_data(posts=200, jobs=100, projects=50, services=20, testimonials=20):
+    """
+    Bulk create benchmark rows in every app. Saves and signals are skipped,
+    so derived fields such as slugs and ``is_live`` are set directly.
+
+    Commit hooks run right away, so caches treat the rows as committed.
+    """
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        create_rows(posts, jobs, projects, services, testimonials)
+
+
+def create_rows(posts, jobs, projects, services, testimonials):
+    from blog.models import Author, BlogPost, Category, Tag
+    from clients.models import Service, ServiceFeature, Testimonal
+    from jobs.models import Job, JobBenefit, JobRequirement, Salary
+    from projects.models import Project, Technology
+
+    now = timezone.now()
+
+    authors = Author.objects.bulk_create(
+        Author(name=f"Benchmark author {i}", bio=PARAGRAPH) for i in range(5)
+    )
+    categories = Category.objects.bulk_create(
+        Category(name=f"Benchmark category {i}", slug=f"benchmark-category-{i}")
+        for i in range(8)
+    )
+    tags = Tag.objects.bulk_create(
+        Tag(name=f"Benchmark tag {i}", slug=f"benchmark-tag-{i}") for i in range(20)
+    )
+    blog_posts = BlogPost.objects.bulk_create(
+        BlogPost(
+            title=f"Benchmark post {i}",
+            slug=f"benchmark-post-{i}",
+            excerpt=PARAGRAPH,
+            content=PARAGRAPH * 20,
+            author=authors[i % len(authors)],
+            category=categories[i % len(categories)],
+            status="published",
+            published_at=now - timedelta(hours=i),
+            is_live=True,
+            views=i * 7,
+            likes=i,
+        )
+        for i in range(posts)
+    )
+    BlogPost.tags.through.objects.bulk_create(
+        BlogPost.tags.through(blogpost=post, tag=tags[(i + offset) % len(tags)])
+        for i, post in enumerate(blog_posts)
+        for offset in range(3)
+    )
+
+    salaries = Salary.objects.bulk_create(
+        Salary(min=1000 * i, max=2000 * i, currency="ETB") for i in range(1, 6)
+    )
+    requirements = JobRequirement.objects.bulk_create(
+        JobRequirement(requirement=f"Benchmark requirement {i}") for i in range(10)
+    )
+    benefits = JobBenefit.objects.bulk_create(
+        JobBenefit(benefit=f"Benchmark benefit {i}") for i in range(5)
+    )
+    job_rows = Job.objects.bulk_create(
+        Job(
+            id=f"benchmark-job-{i}",
+            title=f"Benchmark job {i}",
+            description=PARAGRAPH * 5,
+            type="full-time",
+            salary=salaries[i % len(salaries)],
+            deadline=now + timedelta(days=30),
+        )
+        for i in range(jobs)
+    )
+    Job.requirements.through.objects.bulk_create(
+        Job.requirements.through(job=job, jobrequirement=requirement)
+        for job in job_rows
+        for requirement in requirements[:4]
+    )
+    Job.benefits.through.objects.bulk_create(
+        Job.benefits.through(job=job, jobbenefit=benefit)
+        for job in job_rows
+        for benefit in benefits[:3]
+    )
+
+    technologies = Technology.objects.bulk_create(
+        Technology(name=f"Benchmark technology {i}") for i in range(10)
+    )
+    project_rows = Project.objects.bulk_create(
+        Project(
+            id=f"benchmark-project-{i}",
+            title=f"Benchmark project {i}",
+            description=PARAGRAPH * 3,
+            status="active",
+        )
+        for i in range(projects)
+    )
+    Project.technologies.through.objects.bulk_create(
+        Project.technologies.through(project=project, technology=technology)
+        for project in project_rows
+        for technology in technologies[:4]
+    )
+
+    features = ServiceFeature.objects.bulk_create(
+        ServiceFeature(name=f"Benchmark feature {i}") for i in range(6)
+    )
+    service_rows = Service.objects.bulk_create(
+        Service(
+            title=f"Benchmark service {i}",
+            description=PARAGRAPH,
+            short_description="Benchmark service",
+            icon="code",
+            category="Development",
+        )
+        for i in range(services)
+    )
+    Service.features.through.objects.bulk_create(
+        Service.features.through(service=service, servicefeature=feature)
+        for service in service_rows
+        for feature in features[:3]
+    )
+    Testimonal.objects.bulk_create(
+        Testimonal(name=f"Benchmark client {i}", comment=PARAGRAPH)
+        for i in range(testimonials)
+    )
+
+
+def get_view_response(path, **headers):
+    """Call the view behind ``path``, skipping middleware"""
+    return call_view(RequestFactory().get(path, headers=headers))
+
+
+def get_view_data(path):
+    """Return the unrendered response data of the view behind ``path``"""
+    return get_view_response(path).data
+
+
+def measure(func, repeat=20):
+    """
+    Time ``repeat`` calls of ``func``, then trace the peak memory of one more
+    call so tracing doesn't skew the timings.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "peak_kb": peak / 1024,
+    }
+
+
+def iter_url_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            # Namespaced includes are the admin
+            if not pattern.namespace:
+                yield from iter_url_patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def serves_get(view):
+    actions = getattr(view, "actions", None)
+    if actions is not None:
+        return "get" in actions
+    cls = getattr(view, "cls", None)
+    return cls is None or hasattr(cls, "get")
+
+
+def get_route_arguments(name, view, params):
+    """URL arguments for ``params`` from the latest row, or None"""
+    if not params:
+        return {}
+    if name in ROUTE_ARGUMENTS:
+        return ROUTE_ARGUMENTS[name]()
+    cls = getattr(view, "cls", None)
+    queryset = getattr(cls, "queryset", None)
+    if queryset is None:
+        return None
+    lookup = cls.lookup_url_kwarg or cls.lookup_field
+    if list(params) != [lookup]:
+        return None
+    obj = queryset.order_by("-pk").first()
+    return obj and {lookup: getattr(obj, cls.lookup_field)}
+
+
+def get_routes():
+    """
+    The GET routes outside the admin as ``(route, path)``, where route is
+    the URL pattern, e.g. ``/blog/posts/{slug}/``, and path a URL of it with
+    arguments taken from the database. Format suffix variants are left out,
+    as are routes whose arguments can't be filled in.
+    """
+    resolver = get_resolver()
+    views = {
+        pattern.name: pattern.callback
+        for pattern in iter_url_patterns(resolver.url_patterns)
+        if pattern.name
+    }
+    routes = {}
+    for name, view in views.items():
+        if not serves_get(view):
+            continue
+        for possibilities, *_ in resolver.reverse_dict.getlist(name):
+            for path_format, params in possibilities:
+                if "format" in params:
+                    continue
+                arguments = get_route_arguments(name, view, params)
+                if arguments is None:
+                    continue
+                route = "/" + path_format.replace("%(", "{").replace(")s", "}")
+                if route in routes:
+                    # The feeds share a pattern with different regexes
+                    route = f"{route} ({name})"
+                routes[route] = "/" + path_format % arguments
+    return sorted(routes.items())
@@ -0,0 +1,202 @@
+"""
+Queryset result caching.
+
+Models opt in with ``CachedManager``; their querysets then accept
+``.cached(timeout)``. Results are cached under a key built from the compiled
+SQL and the content versions (``core.versions``) of every table the query
+reads, so a committed write to any of them makes the old entries unreachable.
+
+Misses are computed by a single worker at a time, see ``single_flight``.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db import models
+from django.db.models import Prefetch
+
+from .versions import get_versions, has_pending_writes, model_key, schedule_version_bump
+
+MISSING = object()
+
+# Threads of one process wait on a lock stripe instead of asking the cache
+LOCAL_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def single_flight(key, compute, timeout):
+    """
+    Return the cached value under ``key``, computing and storing it on a miss.
+
+    Only one caller computes a missing value. Threads in this process queue
+    on a local lock, other workers wait on a lock in the cache and pick up the
+    result, or compute it themselves if the lock holder doesn't finish.
+    """
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        return value
+
+    with LOCAL_LOCKS[hash(key) % len(LOCAL_LOCKS)]:
+        value = cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        lock_key = f"{key}:lock"
+        lock_timeout = settings.SINGLE_FLIGHT_LOCK_TIMEOUT
+        acquired = cache.add(lock_key, 1, lock_timeout)
+        if not acquired:
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+                value = cache.get(key, MISSING)
+                if value is not MISSING:
+                    return value
+                if cache.get(lock_key) is None:
+                    # The holder failed without storing a value
+                    break
+
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            if acquired:
+                cache.delete(lock_key)
+        return value
+
+
+@functools.cache
+def get_table_models():
+    """Map every table to the models whose writes change it"""
+    tables = {}
+    for model in apps.get_models(include_auto_created=True):
+        if model._meta.auto_created:
+            # Implicit m2m tables change through m2m_changed on either side
+            tables[model._meta.db_table] = [
+                field.related_model for field in model._meta.fields if field.is_relation
+            ]
+        else:
+            tables[model._meta.db_table] = [model]
+    return tables
+
+
+def get_lookup_models(model, lookup):
+    """Models a prefetch lookup such as ``"tags__posts"`` reads"""
+    models = []
+    for name in lookup.split("__"):
+        try:
+            model = model._meta.get_field(name).related_model
+        except FieldDoesNotExist:
+            break
+        if model is None:
+            break
+        models.append(model)
+    return models
+
+
+class CachedQuerySet(models.QuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache_timeout = None
+
+    def cached(self, timeout=None):
+        """Serve the results of this queryset from the cache"""
+        clone = self._chain()
+        clone._cache_timeout = timeout or settings.QUERYSET_CACHE_TIMEOUT
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cache_timeout = self._cache_timeout
+        return clone
+
+    def _fetch_all(self):
+        if self._result_cache is None and self._cache_timeout is not None:
+            results = self._fetch_cached()
+            if results is not None:
+                self._result_cache = results
+                # Prefetched relations were cached with the instances
+                self._prefetch_done = True
+        super()._fetch_all()
+
+    def get_cache_key(self):
+        """Cache key of the results, None when they can't be cached"""
+        query = self.query.chain()
+        try:
+            sql, params = query.get_compiler(using=self.db).as_sql()
+        except EmptyResultSet:
+            return None
+
+        table_models = get_table_models()
+        dependencies = set()
+        for alias in query.alias_map.values():
+            dependencies.update(table_models.get(alias.table_name, []))
+
+        prefetches = []
+        for lookup in self._prefetch_related_lookups:
+            if isinstance(lookup, Prefetch):
+                dependencies.update(
+                    get_lookup_models(self.model, lookup.prefetch_through)
+                )
+                if lookup.queryset is not None:
+                    dependencies.add(lookup.queryset.model)
+                    lookup = (lookup.prefetch_to, str(lookup.queryset.query))
+            else:
+                dependencies.update(get_lookup_models(self.model, lookup))
+            prefetches.append(repr(lookup))
+
+        dependencies = sorted(dependencies, key=model_key)
+        if has_pending_writes(dependencies):
+            # The versions can't tell uncommitted writes apart yet
+            return None
+
+        versions = get_versions([model_key(model) for model in dependencies])
+        parts = [
+            self.db,
+            sql,
+            repr(params),
+            self._iterable_class.__name__,
+            *prefetches,
+            *map(str, versions),
+        ]
+        digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()
+        return f"querycache:{digest}"
+
+    def _fetch_cached(self):
+        if not settings.QUERYSET_CACHE_ENABLED:
+            return None
+        key = self.get_cache_key()
+        if key is None:
+            return None
+
+        def compute():
+            queryset = self._chain()
+            queryset._cache_timeout = None
+            return list(queryset)
+
+        return single_flight(key, compute, self._cache_timeout)
+
+    # Bulk writes skip model signals, so they invalidate the table themselves
+
+    def update(self, **kwargs):
+        schedule_version_bump(self.model)
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        schedule_version_bump(self.model, [obj.pk for obj in objs if obj.pk])
+        return objs
+
+    def bulk_update(self, objs, *args, **kwargs):
+        objs = list(objs)
+        schedule_version_bump(self.model, [obj.pk for obj in objs])
+        return super().bulk_update(objs, *args, **kwargs)
+
+
+CachedManager = models.Manager.from_queryset(CachedQuerySet)
@@ -0,0 +1,177 @@
+"""
+Incremental change feeds.
+
+Models in ``CHANGE_FEED_MODELS`` have an indexed ``updated_at`` and leave a
+``Tombstone`` when they are deleted. A page of a feed lists the rows changed
+after a cursor in ``(updated_at, pk)`` order and the rows deleted after it,
+so clients syncing with ``?since=`` only read what changed.
+
+Rows are listed once they are older than ``CHANGE_FEED_SETTLE_SECONDS``.
+``updated_at`` is set before the commit, and a transaction committing after a
+cursor moved past its timestamp would otherwise be skipped. Tombstones are
+kept for ``CHANGE_FEED_TOMBSTONE_RETENTION``, older cursors could miss
+deletes and are rejected so the client syncs from the start.
+
+Changes to related rows alone, e.g. a renamed tag, don't touch ``updated_at``.
+"""
+
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Tombstone
+
+CHANGE_FEED_MODELS = [
+    "blog.BlogPost",
+    "jobs.Job",
+    "projects.Project",
+    "clients.Service",
+    "clients.Testimonal",
+]
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "The cursor is older than the change history, sync from the start."
+    default_code = "cursor_expired"
+
+
+def is_tracked(model):
+    return model._meta.concrete_model._meta.label in CHANGE_FEED_MODELS
+
+
+def record_deletion(model, pk):
+    Tombstone.objects.create(model=model._meta.concrete_model._meta.label, object_id=pk)
+
+
+def touch_rows(model, pks):
+    """Mark rows changed by writes that don't save them, e.g. m2m changes"""
+    if pks and is_tracked(model):
+        model._default_manager.filter(pk__in=pks).update(updated_at=timezone.now())
+
+
+def purge_tombstones(now=None):
+    """Delete tombstones past the retention, return how many were deleted"""
+    cutoff = (now or timezone.now()) - settings.CHANGE_FEED_TOMBSTONE_RETENTION
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+def encode_cursor(changed, deleted):
+    data = {
+        "changed": [changed[0].isoformat(), changed[1]],
+        "deleted": [deleted[0].isoformat(), deleted[1]],
+    }
+    value = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(value).decode().rstrip("=")
+
+
+def parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def decode_cursor(value):
+    """
+    Return the changed and deleted positions of a cursor, either one from
+    ``encode_cursor`` or an ISO 8601 timestamp
+    """
+    try:
+        # A "+" in the query string arrives as a space
+        moment = parse_moment(value.replace(" ", "+"))
+        if moment is not None:
+            return (moment, None), (moment, None)
+
+        data = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+        positions = tuple(
+            (parse_moment(data[key][0]), data[key][1]) for key in ("changed", "deleted")
+        )
+    except (ValueError, TypeError, KeyError, IndexError):
+        positions = None
+    if positions is None or any(moment is None for moment, _ in positions):
+        raise ValidationError({"since": "Invalid cursor."})
+    return positions
+
+
+def after(field, position):
+    """Filter rows ordered by ``(field, pk)`` that come after ``position``"""
+    if position is None:
+        return Q()
+    moment, pk = position
+    if pk is None:
+        return Q(**{f"{field}__gt": moment})
+    return Q(**{f"{field}__gt": moment}) | Q(**{field: moment, "pk__gt": pk})
+
+
+def next_position(rows, position, exhausted, horizon):
+    if rows:
+        position = rows[-1]
+    if exhausted and (position is None or position[0] < horizon):
+        # Everything up to the horizon was listed
+        position = (horizon, None)
+    return position
+
+
+def get_change_page(model, since=None, limit=None):
+    """
+    Primary keys of the rows of ``model`` changed and deleted after the
+    ``since`` cursor, at most ``limit`` of each. Without a cursor every row
+    is listed and earlier deletes are skipped.
+    """
+    limit = limit or settings.CHANGE_FEED_PAGE_SIZE
+    now = timezone.now()
+    horizon = now - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+
+    if since:
+        changed_from, deleted_from = decode_cursor(since)
+        if deleted_from[0] < now - settings.CHANGE_FEED_TOMBSTONE_RETENTION:
+            raise CursorExpired()
+    else:
+        changed_from, deleted_from = None, (horizon, None)
+
+    changes = list(
+        model._default_manager.filter(
+            after("updated_at", changed_from), updated_at__lte=horizon
+        )
+        .order_by("updated_at", "pk")
+        .values_list("updated_at", "pk")[: limit + 1]
+    )
+    tombstones = list(
+        Tombstone.objects.filter(
+            after("deleted_at", deleted_from),
+            model=model._meta.concrete_model._meta.label,
+            deleted_at__lte=horizon,
+        )
+        .order_by("deleted_at", "id")
+        .values_list("deleted_at", "id", "object_id")[: limit + 1]
+    )
+    more_changes = len(changes) > limit
+    more_deletes = len(tombstones) > limit
+    changes = changes[:limit]
+    tombstones = tombstones[:limit]
+
+    cursor = encode_cursor(
+        next_position(changes, changed_from, not more_changes, horizon),
+        next_position(
+            [(deleted_at, pk) for deleted_at, pk, _ in tombstones],
+            deleted_from,
+            not more_deletes,
+            horizon,
+        ),
+    )
+    to_python = model._meta.pk.to_python
+    return {
+        "changed": [pk for _, pk in changes],
+        "deleted": [to_python(object_id) for _, _, object_id in tombstones],
+        "next": cursor,
+        "has_more": more_changes or more_deletes,
+    }
@@ -5,6 +5,13 @@ from django.core.mail import EmailMultiAlternatives, send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from .metrics import timing
+
+
+def render_email(template_name, context):
+    with timing("email_render"):
+        return render_to_string(template_name, context)
+
 
 def send_email_to_admins(subject: str, message: str, html_message: str = None):
     """Send email to admins with optional HTML content"""
@@ -27,16 +34,18 @@ def send_email_to(
             to=to_emails,
         )
         email.attach_alternative(html_message, "text/html")
-        return email.send(fail_silently=False)
+        with timing("email_send"):
+            return email.send(fail_silently=False)
     else:
         # Send plain text email
-        return send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            to_emails,
-            fail_silently=False,
-        )
+        with timing("email_send"):
+            return send_mail(
+                subject,
+                message,
+                settings.DEFAULT_FROM_EMAIL,
+                to_emails,
+                fail_silently=False,
+            )
 
 
 def send_newsletter_subscription_confirmation(subscriber_email: str):
@@ -59,7 +68,7 @@ def send_newsletter_subscription_confirmation(subscriber_email: str):
         "unsubscribe_url": unsubscribe_url,
     }
 
-    html_message = render_to_string("emails/subscription_confirmation.html", context)
+    html_message = render_email("emails/subscription_confirmation.html", context)
     plain_message = f"""
 Hi there!
 
@@ -124,7 +133,7 @@ def send_admin_subscription_notification(subscriber_email: str, subscriber_id: i
         "create_newsletter_url": "https://gumisofts.com/admin/newsletter/create/",  # Update with actual URL
     }
 
-    html_message = render_to_string("emails/admin_notification.html", context)
+    html_message = render_email("emails/admin_notification.html", context)
     plain_message = f"""
 New Newsletter Subscription - Gumisofts
 
@@ -195,7 +204,7 @@ def send_newsletter_to_subscribers(
         "preferences_url": "https://gumisofts.com/newsletter/preferences",
     }
 
-    html_message = render_to_string("emails/newsletter.html", context)
+    html_message = render_email("emails/newsletter.html", context)
     plain_message = f"""
 {subject}
 {context['newsletter_date']}
@@ -254,7 +263,7 @@ def send_job_application_confirmation(application):
         "github_url": "https://github.com/gumisofts",
     }
 
-    html_message = render_to_string("emails/job_application_confirmation.html", context)
+    html_message = render_email("emails/job_application_confirmation.html", context)
     plain_message = f"""
 Dear {application.full_name},
 
@@ -345,7 +354,7 @@ def send_admin_job_application_notification(application):
         "reject_url": f"https://gumisofts.com/admin/jobs/jobapplication/{application.id}/reject/",
     }
 
-    html_message = render_to_string(
+    html_message = render_email(
         "emails/admin_job_application_notification.html", context
     )
     plain_message = f"""
@@ -418,7 +427,7 @@ def send_job_status_update_email(application, old_status, new_status, **kwargs):
 
     subject = subject_map.get(new_status, f"Application Status Update - {job.title}")
 
-    html_message = render_to_string("emails/job_status_update.html", context)
+    html_message = render_email("emails/job_status_update.html", context)
 
     # Create plain text version based on status
     if new_status == "shortlisted":
@@ -0,0 +1,255 @@
+"""
+Static JSON export of the public API.
+
+Every public read endpoint is rendered as an anonymous GET and stored under
+``STATIC_EXPORT_DIRECTORY`` with a content hash in the file name, so files
+never change once written and the CDN can cache them indefinitely. The only
+mutable file is ``manifest.json``, which maps each API path to the URL of its
+current file. Lists are also split into pages, listed as ``<path>?page=N``.
+
+Exports are incremental. The manifest keeps the content versions
+(``core.versions``) every file was rendered at, files whose versions didn't
+move are carried over without rendering, and rendered content that matches
+an existing file isn't uploaded again. Files dropped from the manifest are
+deleted by the following export, so clients holding the previous manifest
+can still read them.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .renderers import ORJSONRenderer
+from .sitemaps import write_file
+from .versions import get_dependent_models, get_versions, model_key, row_key
+from .views import build_get_request, call_view
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = f"{settings.STATIC_EXPORT_DIRECTORY}/manifest.json"
+EXPORT_LOCK_KEY = "exports:lock"
+EXPORT_PENDING_KEY = "exports:pending"
+
+
+class ExportSection:
+    """Public endpoints of one model, subclassed in each app's exports.py"""
+
+    name = None
+    model = None
+    # Path of the viewset, the routes below are relative to it
+    path = None
+    routes = ("",)
+    # Detail routes are exported for ``items()`` when set
+    lookup_field = None
+    detail_routes = ("",)
+    # Other models the list routes read, e.g. a leaderboard
+    version_models = ()
+
+    def items(self):
+        """Queryset of the objects with public detail routes"""
+        return self.model.objects.all()
+
+    def get_list_paths(self):
+        return [f"{self.path}{route}" for route in self.routes]
+
+    def get_detail_paths(self, obj):
+        base = f"{self.path}{getattr(obj, self.lookup_field)}/"
+        return [f"{base}{route}" for route in self.detail_routes]
+
+
+def get_sections():
+    from accounts.exports import CompanyStatsExport, OrganizationExport
+    from blog.exports import AuthorExport, CategoryExport, PostExport, TagExport
+    from clients.exports import ServiceExport, TestimonalExport
+    from jobs.exports import JobExport
+    from projects.exports import ProjectExport
+
+    return [
+        OrganizationExport(),
+        CompanyStatsExport(),
+        ServiceExport(),
+        TestimonalExport(),
+        ProjectExport(),
+        JobExport(),
+        PostExport(),
+        AuthorExport(),
+        CategoryExport(),
+        TagExport(),
+    ]
+
+
+@functools.cache
+def get_export_models():
+    """Models whose writes can change an exported file, i.e. public content"""
+    models = set()
+    for section in get_sections():
+        models.update(get_dependent_models(section.model))
+        models.update(section.version_models)
+    return models
+
+
+def version_digest(versions):
+    parts = [settings.CONTENT_VERSION_SALT, *map(str, versions)]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+
+
+def file_name(path, content):
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    path, _, page = path.partition("?page=")
+    name = path.strip("/")
+    if page:
+        name = f"{name}/pages/{page}"
+    return f"{settings.STATIC_EXPORT_DIRECTORY}/{name}.{digest}.json"
+
+
+def read_manifest():
+    if not default_storage.exists(MANIFEST_PATH):
+        return {"files": {}, "retired": []}
+    with default_storage.open(MANIFEST_PATH) as manifest:
+        return json.loads(manifest.read())
+
+
+class Export:
+    """One run of the exporter, keeps the new manifest entries and counts"""
+
+    def __init__(self, previous):
+        self.previous = previous
+        self.files = {}
+        self.rendered = 0
+        self.uploaded = 0
+        self.renderer = ORJSONRenderer()
+
+    def export_section(self, section):
+        models = get_dependent_models(section.model)
+        versions = get_versions([model_key(model) for model in models])
+        extra = get_versions([model_key(model) for model in section.version_models])
+        list_version = version_digest([*versions, *extra])
+        for path in section.get_list_paths():
+            self.export_path(path, list_version, paginate=path == section.path)
+
+        if section.lookup_field is None:
+            return
+        objects = list(section.items().only("pk", section.lookup_field))
+        row_versions = get_versions([row_key(section.model, obj.pk) for obj in objects])
+        for obj, row_version in zip(objects, row_versions):
+            # The row version stands in for the version of the whole model
+            version = version_digest([row_version, *versions[1:]])
+            for path in section.get_detail_paths(obj):
+                self.export_path(path, version)
+
+    def export_path(self, path, version, paginate=False):
+        entry = self.previous.get(path)
+        if entry is not None and entry["version"] == version:
+            self.files[path] = entry
+            if paginate:
+                pages = f"{path}?page="
+                self.files.update(
+                    (key, value)
+                    for key, value in self.previous.items()
+                    if key.startswith(pages)
+                )
+            return
+
+        request = build_get_request(path, HTTP_HOST=settings.STATIC_EXPORT_HOST)
+        request.static_export = True
+        response = call_view(request)
+        if response.status_code != 200:
+            logger.warning(f"Skipped exporting {path}: status {response.status_code}")
+            return
+        self.rendered += 1
+
+        data = response.data
+        self.write(path, data, version)
+        if paginate and isinstance(data, list):
+            self.write_pages(path, data, version)
+
+    def write_pages(self, path, data, version):
+        size = settings.STATIC_EXPORT_PAGE_SIZE
+        count = (len(data) + size - 1) // size
+        for number in range(1, count + 1):
+            page = {
+                "count": len(data),
+                "next": f"{path}?page={number + 1}" if number < count else None,
+                "previous": f"{path}?page={number - 1}" if number > 1 else None,
+                "results": data[(number - 1) * size : number * size],
+            }
+            self.write(f"{path}?page={number}", page, version)
+
+    def write(self, path, data, version):
+        content = self.renderer.render(data, "application/json")
+        name = file_name(path, content)
+        if not default_storage.exists(name):
+            default_storage.save(name, ContentFile(content))
+            self.uploaded += 1
+        self.files[path] = {
+            "url": default_storage.url(name),
+            "name": name,
+            "version": version,
+        }
+
+
+def export_api(force=False):
+    """
+    Render the changed public endpoints to storage and write the manifest.
+    Returns the export, or None when another export is running.
+    """
+    timeout = settings.STATIC_EXPORT_LOCK_TIMEOUT
+    if not cache.add(EXPORT_LOCK_KEY, 1, timeout):
+        # The running export repeats once it's done and picks up the change
+        cache.set(EXPORT_PENDING_KEY, 1, timeout)
+        return None
+    try:
+        while True:
+            cache.delete(EXPORT_PENDING_KEY)
+            export = run_export(force)
+            if not cache.get(EXPORT_PENDING_KEY):
+                return export
+    finally:
+        cache.delete(EXPORT_LOCK_KEY)
+
+
+def run_export(force=False):
+    manifest = read_manifest()
+    export = Export({} if force else manifest["files"])
+    for section in get_sections():
+        export.export_section(section)
+
+    names = {entry["name"] for entry in export.files.values()}
+    for name in manifest["retired"]:
+        if name not in names and default_storage.exists(name):
+            default_storage.delete(name)
+    retired = sorted({entry["name"] for entry in manifest["files"].values()} - names)
+
+    write_file(
+        MANIFEST_PATH,
+        json.dumps(
+            {
+                "generated_at": timezone.now().isoformat(),
+                "files": export.files,
+                "retired": retired,
+            },
+            sort_keys=True,
+        ),
+    )
+    return export
+
+
+def schedule_export():
+    if not settings.STATIC_EXPORT_ON_CHANGE:
+        return
+
+    def run():
+        try:
+            export_api()
+        except Exception as e:
+            logger.error(f"Error exporting the public API: {str(e)}")
+
+    transaction.on_commit(run)
@@ -0,0 +1,154 @@
+"""
+Missing index suggestions from the slow query log.
+
+For every logged statement the columns a table is filtered on are read from
+the WHERE clause: equality and boolean conditions first, then one range
+condition, or the first ORDER BY column of the table when there is none. That
+follows the usual B-tree rule of equality columns before the range or sort
+column. Candidates already covered by the leading fields of an existing
+index are dropped, as are tables the captured plan reads through an index.
+
+The SQL is matched with regular expressions, which is good enough for what
+the ORM writes but can miss conditions in subqueries.
+"""
+
+import re
+
+from django.apps import apps
+
+from .models import QueryFingerprint
+
+COLUMN_RE = re.compile(
+    r'"(\w+)"\."(\w+)"\s*(=|<>|!=|<=|>=|<|>|IN\b|IS\b|LIKE\b|BETWEEN\b)?',
+    re.IGNORECASE,
+)
+ORDER_COLUMN_RE = re.compile(r'"(\w+)"\."(\w+)"\s*(ASC|DESC)?', re.IGNORECASE)
+WHERE_RE = re.compile(
+    r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bOFFSET\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+ORDER_RE = re.compile(
+    r".*\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|\bFOR UPDATE\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+EQUALITY_OPERATORS = {None, "=", "IN", "IS"}
+RANGE_OPERATORS = {"<", ">", "<=", ">=", "BETWEEN", "LIKE"}
+
+
+def get_table_models():
+    return {model._meta.db_table: model for model in apps.get_models()}
+
+
+def get_fields(model, columns):
+    """Field names of ``columns``, or None when one isn't a model field"""
+    names = {field.column: field.name for field in model._meta.concrete_fields}
+    fields = []
+    for column in columns:
+        name = names.get(column.lstrip("-"))
+        if name is None:
+            return None
+        fields.append(f"-{name}" if column.startswith("-") else name)
+    return fields
+
+
+def get_filtered_columns(sql):
+    """Table to its ``(equality, range, order)`` columns"""
+    tables = {}
+
+    def columns(table):
+        return tables.setdefault(table, ([], [], []))
+
+    match = WHERE_RE.search(sql)
+    if match:
+        for table, column, operator in COLUMN_RE.findall(match.group(1)):
+            operator = operator.upper() or None
+            if operator in EQUALITY_OPERATORS:
+                columns(table)[0].append(column)
+            elif operator in RANGE_OPERATORS:
+                columns(table)[1].append(column)
+
+    match = ORDER_RE.match(sql)
+    if match:
+        for table, column, direction in ORDER_COLUMN_RE.findall(match.group(1)):
+            prefix = "-" if direction.upper() == "DESC" else ""
+            columns(table)[2].append(f"{prefix}{column}")
+    return tables
+
+
+def unique(items):
+    return list(dict.fromkeys(items))
+
+
+def get_candidate(equality, ranges, order):
+    """Index columns for one table of a statement, or None"""
+    equality = unique(equality)
+    if ranges:
+        return equality + [ranges[0]] if ranges[0] not in equality else equality
+    order = [column for column in unique(order) if column.lstrip("-") not in equality]
+    # Columns sorted after the first only break ties
+    candidate = equality + order[:1]
+    return candidate or None
+
+
+def get_existing_indexes(model):
+    """Field lists of the model's indexes, without sort directions"""
+    meta = model._meta
+    indexes = [[meta.pk.name]]
+    indexes += [
+        [field.name] for field in meta.concrete_fields if field.db_index or field.unique
+    ]
+    indexes += [[name.lstrip("-") for name in index.fields] for index in meta.indexes]
+    indexes += [list(fields) for fields in meta.unique_together]
+    indexes += [
+        list(constraint.fields)
+        for constraint in meta.constraints
+        if getattr(constraint, "fields", None)
+    ]
+    return indexes
+
+
+def is_covered(fields, indexes):
+    names = [name.lstrip("-") for name in fields]
+    return any(index[: len(names)] == names for index in indexes)
+
+
+def scans_table(plan, table):
+    """Whether ``plan`` reads ``table`` without an index"""
+    if not plan:
+        # No plan captured, go by the SQL alone
+        return True
+    pattern = rf"Seq Scan on {table}\b|\bSCAN {table}\b(?! USING (?:COVERING )?INDEX)"
+    return re.search(pattern, plan) is not None
+
+
+def suggest_indexes(min_calls=1):
+    """
+    Suggested indexes, slowest first, as dicts of the model, its fields and
+    the totals of the logged statements they would help
+    """
+    table_models = get_table_models()
+    suggestions = {}
+    statements = QueryFingerprint.objects.filter(calls__gte=min_calls)
+    for statement in statements.order_by("-total_ms"):
+        for table, columns in get_filtered_columns(statement.sql).items():
+            model = table_models.get(table)
+            if model is None or not scans_table(statement.plan, table):
+                continue
+            candidate = get_candidate(*columns)
+            fields = get_fields(model, candidate) if candidate else None
+            if not fields or is_covered(fields, get_existing_indexes(model)):
+                continue
+            suggestion = suggestions.setdefault(
+                (model._meta.label, tuple(fields)),
+                {
+                    "model": model,
+                    "fields": fields,
+                    "statements": [],
+                    "calls": 0,
+                    "total_ms": 0.0,
+                },
+            )
+            suggestion["statements"].append(statement)
+            suggestion["calls"] += statement.calls
+            suggestion["total_ms"] += statement.total_ms
+    return sorted(suggestions.values(), key=lambda item: -item["total_ms"])
@@ -0,0 +1,39 @@
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import cold_start
+
+PHASES = ["python_ms", "setup_ms", "request_ms", "total_ms"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time cold starts in fresh interpreters: interpreter startup, "
+        "django.setup() and the first request"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/blog/posts/")
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+
+        runs = []
+        try:
+            # Warm the OS file cache so every run reads the same way
+            cold_start(options["path"])
+            for _ in range(options["repeat"]):
+                runs.append(cold_start(options["path"])[0])
+        except RuntimeError as e:
+            raise CommandError(f"Cold start failed: {str(e)}")
+
+        self.stdout.write(f"{options['path']} ({runs[0]['status']})")
+        for phase in PHASES:
+            values = [run[phase] for run in runs]
+            self.stdout.write(
+                f"{phase[:-3]:<8} {median(values):8.1f} ms median "
+                f"{min(values):8.1f} ms min {max(values):8.1f} ms max"
+            )
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.benchmarks import (
+    LIST_ENDPOINTS,
+    get_view_response,
+    measure,
+    private_cache,
+    rolled_back,
+    seed_data,
+)
+from core.middleware import ENCODINGS, CompressionMiddleware, compress
+
+# Levels compared for each encoding, the configured one is marked in the output
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 5, 11]}
+
+
+class Command(BaseCommand):
+    help = "Report compression ratio and CPU cost of gzip and brotli on API responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=500,
+            help="Blog posts to seed, the other lists are seeded proportionally",
+        )
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        with private_cache(), rolled_back():
+            seed_data(
+                posts=rows,
+                jobs=rows // 2,
+                projects=rows // 4,
+                services=rows // 10,
+                testimonials=rows // 10,
+            )
+            for path in [*LIST_ENDPOINTS, "/", "/schema"]:
+                response = get_view_response(path, accept="*/*")
+                if hasattr(response, "render"):
+                    # The prebuilt schema is a plain HttpResponse
+                    response.render()
+                self.benchmark(path, response, options["repeat"])
+
+    def benchmark(self, path, response, repeat):
+        body = response.content
+        self.stdout.write(f"{path} {len(body) / 1024:.1f} KiB")
+        configured = {
+            "br": settings.COMPRESSION_BROTLI_QUALITY,
+            "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        }
+        for encoding in ENCODINGS:
+            for level in LEVELS[encoding]:
+                size = len(compress(body, encoding, level))
+                stats = measure(lambda: compress(body, encoding, level), repeat)
+                marker = "*" if level == configured[encoding] else " "
+                self.stdout.write(
+                    f" {marker}{encoding:<4} level {level:<2} ratio {len(body) / size:5.1f}x "
+                    f"{stats['median_ms']:8.2f} ms {stats['peak_kb']:9.1f} KiB peak"
+                )
+
+        # A cache hit through the middleware, compared with compressing per request
+        content_type = response["Content-Type"]
+        middleware = CompressionMiddleware(
+            lambda request: HttpResponse(body, content_type=content_type)
+        )
+        request = RequestFactory().get(path, headers={"accept-encoding": "br, gzip"})
+        with private_cache():
+            middleware(request)
+            stats = measure(lambda: middleware(request), repeat)
+        self.stdout.write(f"  cached variant {stats['median_ms']:8.2f} ms")
@@ -0,0 +1,59 @@
+import copy
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.backends.postgresql.base import DatabaseWrapper
+from core.benchmarks import measure
+
+MODES = {
+    "connect": {"CONN_MAX_AGE": 0},
+    "pool": {"CONN_MAX_AGE": 0, "pool": {"min_size": 1, "max_size": 4}},
+    "persistent": {"CONN_MAX_AGE": None},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the first query of a request, including getting a connection, "
+        "with a new connection per request, the psycopg pool and a persistent "
+        "connection"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if connections["default"].vendor != "postgresql":
+            raise CommandError("Connection pooling only applies to PostgreSQL")
+
+        for mode, overrides in MODES.items():
+            wrapper = self.get_wrapper(mode, overrides)
+            try:
+                # Open the pool and warm up outside the measurements
+                self.request(wrapper, mode)
+                stats = measure(lambda: self.request(wrapper, mode), options["repeat"])
+            finally:
+                wrapper.close()
+                wrapper.close_pool()
+            self.stdout.write(
+                f"{mode:<11} {stats['median_ms']:8.2f} ms median "
+                f"{stats['min_ms']:8.2f} ms min"
+            )
+
+    def get_wrapper(self, mode, overrides):
+        settings_dict = copy.deepcopy(connections["default"].settings_dict)
+        settings_dict["OPTIONS"].pop("pool", None)
+        if "pool" in overrides:
+            settings_dict["OPTIONS"]["pool"] = overrides["pool"]
+        settings_dict["CONN_MAX_AGE"] = overrides["CONN_MAX_AGE"]
+        # Pools are kept per alias
+        return DatabaseWrapper(settings_dict, alias=f"benchmark_{mode}")
+
+    def request(self, wrapper, mode):
+        """One request's worth of connection handling around a single query"""
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if mode != "persistent":
+            wrapper.close()
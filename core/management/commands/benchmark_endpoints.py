@@ -0,0 +1,178 @@
+import gc
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.benchmarks import get_routes, private_cache, rolled_back, seed_data
+from core.startup import get_host
+
+BENCHMARK_SETTINGS = {
+    # Storage URLs are built locally, so the results don't depend on S3 access
+    "STORAGES": {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    },
+    # Seeded rows are in the change feeds right away, however long a run takes
+    "CHANGE_FEED_SETTLE_SECONDS": 0,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the queries, latency and response size of every GET endpoint, "
+        "anonymously and as staff, and compare them with the baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=200,
+            help="Blog posts to seed, the other lists are seeded proportionally",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--baseline", default=str(settings.ENDPOINT_BASELINE_PATH))
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write the results as the new baseline instead of comparing",
+        )
+        parser.add_argument(
+            "--no-latency-budget",
+            action="store_true",
+            help="Report latency without failing on it, for machines other than "
+            "the one the baseline was recorded on",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 2:
+            raise CommandError("--repeat must be at least 2")
+
+        rows = options["rows"]
+        with private_cache(), rolled_back(), override_settings(**BENCHMARK_SETTINGS):
+            seed_data(
+                posts=rows,
+                jobs=rows // 2,
+                projects=rows // 4,
+                services=rows // 10,
+                testimonials=rows // 10,
+            )
+            results = self.run(options["repeat"])
+
+        if options["update_baseline"]:
+            with open(options["baseline"], "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+                f.write("\n")
+            self.stdout.write(
+                self.style.SUCCESS(f"Wrote {len(results)} endpoints to the baseline")
+            )
+            return
+
+        try:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(
+                "No baseline, record one with manage.py benchmark_endpoints "
+                "--update-baseline"
+            )
+        failures = self.compare(results, baseline, not options["no_latency_budget"])
+        if failures:
+            raise CommandError(
+                f"{len(failures)} endpoint budgets exceeded:\n" + "\n".join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS("All endpoints within budget"))
+
+    def run(self, repeat):
+        host = get_host()
+        staff = get_user_model().objects.create_user(
+            username="benchmark-staff", is_staff=True
+        )
+        staff_client = Client(raise_request_exception=False, HTTP_HOST=host)
+        staff_client.force_login(staff)
+        clients = {
+            "anonymous": Client(raise_request_exception=False, HTTP_HOST=host),
+            "staff": staff_client,
+        }
+
+        self.stdout.write(
+            f"{'user':<10} {'route':<52} {'status':>6} {'queries':>7} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'bytes':>9}"
+        )
+        results = {}
+        for route, path in get_routes():
+            for user, client in clients.items():
+                result = self.benchmark(client, path, repeat)
+                results[f"{user} {route}"] = result
+                self.stdout.write(
+                    f"{user:<10} {route:<52} {result['status']:>6} "
+                    f"{result['queries']:>7} {result['p50_ms']:>8.2f} "
+                    f"{result['p95_ms']:>8.2f} {result['bytes']:>9}"
+                )
+        return results
+
+    def benchmark(self, client, path, repeat):
+        # Count the queries of a cold request, then time warm ones
+        with private_cache():
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(path)
+            # Read before the next request resets the query log
+            queries = len(captured)
+            # Leftovers of the previous endpoint would be collected during this one
+            gc.collect()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                client.get(path)
+                timings.append((time.perf_counter() - start) * 1000)
+        return {
+            "status": response.status_code,
+            "queries": queries,
+            "bytes": len(response.content),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(statistics.quantiles(timings, n=20)[-1], 2),
+        }
+
+    def compare(self, results, baseline, check_latency):
+        failures = []
+        for key, result in results.items():
+            expected = baseline.get(key)
+            if expected is None:
+                self.stdout.write(self.style.WARNING(f"{key}: not in the baseline"))
+                continue
+            if result["status"] != expected["status"]:
+                failures.append(
+                    f"{key}: status {result['status']}, was {expected['status']}"
+                )
+            queries = expected["queries"] + settings.ENDPOINT_BUDGET_EXTRA_QUERIES
+            if result["queries"] > queries:
+                failures.append(
+                    f"{key}: {result['queries']} queries, was {expected['queries']}"
+                )
+            if (
+                result["bytes"]
+                > expected["bytes"] * settings.ENDPOINT_BUDGET_SIZE_RATIO
+            ):
+                failures.append(
+                    f"{key}: {result['bytes']} bytes, was {expected['bytes']}"
+                )
+            latency = (
+                expected["p95_ms"] * settings.ENDPOINT_BUDGET_LATENCY_RATIO
+                + settings.ENDPOINT_BUDGET_LATENCY_SLACK_MS
+            )
+            if check_latency and result["p95_ms"] > latency:
+                failures.append(
+                    f"{key}: {result['p95_ms']:.2f} ms p95, was {expected['p95_ms']:.2f}"
+                )
+        for key in baseline.keys() - results.keys():
+            self.stdout.write(self.style.WARNING(f"{key}: no longer served"))
+        return failures
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.benchmarks import (
+    get_view_data,
+    measure,
+    private_cache,
+    rolled_back,
+    seed_data,
+)
+
+ENDPOINTS = ["/blog/posts/", "/blog/categories/", "/blog/tags/", "/blog/authors/"]
+
+
+class Command(BaseCommand):
+    help = "Compare the blog list endpoints with and without the queryset result cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Blog posts to seed")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with private_cache(), rolled_back():
+            seed_data(posts=options["rows"], jobs=0, projects=0, services=0)
+            for path in ENDPOINTS:
+                for enabled in (False, True):
+                    with private_cache(), override_settings(
+                        QUERYSET_CACHE_ENABLED=enabled
+                    ):
+                        self.benchmark(path, enabled, options["repeat"])
+
+    def benchmark(self, path, enabled, repeat):
+        # Warm the cache, then count the queries of a warm request
+        get_view_data(path)
+        with CaptureQueriesContext(connection) as queries:
+            get_view_data(path)
+        stats = measure(lambda: get_view_data(path), repeat)
+        label = "cached" if enabled else "uncached"
+        self.stdout.write(
+            f"{path:<20} {label:<9} {len(queries):3d} queries "
+            f"{stats['median_ms']:8.2f} ms median {stats['min_ms']:8.2f} ms min "
+            f"{stats['peak_kb']:9.1f} KiB peak"
+        )
@@ -0,0 +1,70 @@
+import io
+import json
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarks import (
+    LIST_ENDPOINTS,
+    get_view_data,
+    measure,
+    private_cache,
+    rolled_back,
+    seed_data,
+)
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+RENDERERS = [("json", JSONRenderer), ("orjson", ORJSONRenderer)]
+PARSERS = [("json", JSONParser), ("orjson", ORJSONParser)]
+
+
+class Command(BaseCommand):
+    help = "Compare render and parse time and memory of the JSON renderers on the list endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=500,
+            help="Blog posts to seed, the other lists are seeded proportionally",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        with private_cache(), rolled_back():
+            seed_data(
+                posts=rows,
+                jobs=rows // 2,
+                projects=rows // 4,
+                services=rows // 10,
+                testimonials=rows // 10,
+            )
+            for path in LIST_ENDPOINTS:
+                self.benchmark(path, get_view_data(path), options["repeat"])
+
+    def benchmark(self, path, data, repeat):
+        bodies = {}
+        for name, renderer_class in RENDERERS:
+            renderer = renderer_class()
+            bodies[name] = renderer.render(data, "application/json")
+            stats = measure(lambda: renderer.render(data, "application/json"), repeat)
+            self.report(path, f"render {name}", stats, len(bodies[name]))
+
+        for name, parser_class in PARSERS:
+            parser = parser_class()
+            body = bodies["json"]
+            stats = measure(lambda: parser.parse(io.BytesIO(body)), repeat)
+            self.report(path, f"parse {name}", stats, len(body))
+
+        if json.loads(bodies["json"]) != json.loads(bodies["orjson"]):
+            self.stdout.write(self.style.ERROR(f"{path}: renderers output differs"))
+
+    def report(self, path, label, stats, size):
+        self.stdout.write(
+            f"{path:<24} {label:<14} {stats['median_ms']:8.2f} ms median "
+            f"{stats['min_ms']:8.2f} ms min {stats['peak_kb']:9.1f} KiB peak "
+            f"{size / 1024:8.1f} KiB body"
+        )
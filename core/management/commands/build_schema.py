@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.schema import generate_schema, get_version
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema file served at /schema"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the committed schema doesn't match the code",
+        )
+
+    def handle(self, *args, **options):
+        path = settings.OPENAPI_SCHEMA_PATH
+        content = generate_schema()
+        if options["check"]:
+            if not path.exists() or path.read_bytes() != content:
+                raise CommandError(
+                    f"{path.name} is out of date, run manage.py build_schema"
+                )
+            self.stdout.write(self.style.SUCCESS(f"{path.name} is up to date"))
+            return
+
+        path.write_bytes(content)
+        self.stdout.write(
+            self.style.SUCCESS(f"Schema {get_version(content)} written to {path}")
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.sitemaps import rebuild_sitemaps
+
+
+class Command(BaseCommand):
+    help = "Rebuild every sitemap file from the database"
+
+    def handle(self, *args, **options):
+        count = rebuild_sitemaps()
+        self.stdout.write(self.style.SUCCESS(f"Sitemaps written with {count} URLs"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.webhooks import deliver_queued
+
+
+class Command(BaseCommand):
+    help = "Send the queued revalidation paths to the frontend webhook"
+
+    def handle(self, *args, **options):
+        count = deliver_queued()
+        self.stdout.write(self.style.SUCCESS(f"Revalidated {count} paths"))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from core.exports import MANIFEST_PATH, export_api
+
+
+class Command(BaseCommand):
+    help = "Export the public API as static JSON files in storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Render every endpoint, even ones whose content versions didn't change",
+        )
+
+    def handle(self, *args, **options):
+        export = export_api(force=options["force"])
+        if export is None:
+            self.stdout.write("Another export is running, it will include the changes")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {len(export.files)} files to {MANIFEST_PATH}, "
+                f"{export.rendered} rendered, {export.uploaded} uploaded"
+            )
+        )
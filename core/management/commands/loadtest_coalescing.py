@@ -0,0 +1,86 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from blog.models import BlogPost
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire bursts of identical anonymous GETs from many threads with request "
+        "coalescing off and on, and report the database queries they ran"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path to request, defaults to the featured posts and the latest post",
+        )
+        parser.add_argument("--threads", type=int, default=50)
+        parser.add_argument("--bursts", type=int, default=5)
+        parser.add_argument("--host", default="localhost")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or self.default_paths()
+        for path in paths:
+            for enabled in (False, True):
+                with override_settings(COALESCE_REQUESTS=enabled):
+                    self.run(path, enabled, options)
+
+    def default_paths(self):
+        paths = ["/blog/posts/featured/"]
+        slug = (
+            BlogPost.objects.filter(is_live=True)
+            .order_by("-published_at")
+            .values_list("slug", flat=True)
+            .first()
+        )
+        if slug:
+            paths.append(f"/blog/posts/{slug}/")
+        return paths
+
+    def run(self, path, enabled, options):
+        threads = options["threads"]
+        bursts = options["bursts"]
+        barrier = threading.Barrier(threads)
+        counts_lock = threading.Lock()
+        counts = {"queries": 0, "errors": 0}
+
+        def count_query(execute, sql, params, many, context):
+            with counts_lock:
+                counts["queries"] += 1
+            return execute(sql, params, many, context)
+
+        def worker():
+            client = Client(HTTP_HOST=options["host"])
+            try:
+                with connection.execute_wrapper(count_query):
+                    for _ in range(bursts):
+                        barrier.wait()
+                        if client.get(path).status_code >= 500:
+                            with counts_lock:
+                                counts["errors"] += 1
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        requests = threads * bursts
+        label = "coalesced" if enabled else "direct"
+        self.stdout.write(
+            f"{path} {label:<9} {requests} requests in {elapsed:.2f} s, "
+            f"{counts['queries']} queries ({counts['queries'] / requests:.2f} per "
+            f"request, {counts['queries'] / elapsed:.0f}/s), {counts['errors']} errors"
+        )
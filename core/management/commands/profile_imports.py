@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import cold_start, get_importers, group_by_package
+
+
+class Command(BaseCommand):
+    help = (
+        "Report what each module costs to import on a cold start, "
+        "django.setup() and the first request included"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/blog/posts/")
+        parser.add_argument("--top", type=int, default=25)
+
+    def handle(self, *args, **options):
+        try:
+            timings, modules = cold_start(options["path"], importtime=True)
+        except RuntimeError as e:
+            raise CommandError(f"Cold start failed: {str(e)}")
+
+        total = sum(module["self_ms"] for module in modules)
+        self.stdout.write(
+            f"{len(modules)} modules imported in {total:.1f} ms, "
+            f"setup {timings['setup_ms']:.1f} ms, first request "
+            f"{timings['request_ms']:.1f} ms ({timings['status']})"
+        )
+
+        self.stdout.write("\nBy package, self time")
+        for package, ms in group_by_package(modules)[: options["top"]]:
+            self.stdout.write(f"{ms:9.1f} ms  {package}")
+
+        self.stdout.write("\nBy module, cumulative time")
+        importers = get_importers(modules)
+        slowest = sorted(modules, key=lambda module: module["cumulative_ms"])
+        for module in reversed(slowest[-options["top"] :]):
+            importer = importers.get(module["module"])
+            self.stdout.write(
+                f"{module['cumulative_ms']:9.1f} ms  {module['module']}"
+                + (f"  (from {importer})" if importer else "")
+            )
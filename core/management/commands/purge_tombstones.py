@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.changes import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete change feed tombstones older than CHANGE_FEED_TOMBSTONE_RETENTION"
+
+    def handle(self, *args, **options):
+        count = purge_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} tombstones"))
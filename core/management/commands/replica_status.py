@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from core.routers import measure_lag
+
+
+class Command(BaseCommand):
+    help = "Show the replication lag of each read replica and whether reads use it"
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            self.stdout.write("No replicas configured, all reads use the primary")
+            return
+
+        for alias in settings.DATABASE_REPLICAS:
+            try:
+                lag = measure_lag(alias)
+            except DatabaseError as e:
+                self.stdout.write(self.style.ERROR(f"{alias}: unavailable, {e}"))
+                continue
+            if lag <= settings.REPLICA_MAX_LAG_SECONDS:
+                self.stdout.write(
+                    self.style.SUCCESS(f"{alias}: {lag:.2f}s behind, in use")
+                )
+            else:
+                self.stdout.write(
+                    self.style.WARNING(f"{alias}: {lag:.2f}s behind, skipped")
+                )
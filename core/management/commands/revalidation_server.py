@@ -0,0 +1,75 @@
+import hmac
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from core.webhooks import SIGNATURE_HEADER, sign
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in for the frontend revalidation endpoint, point "
+        "REVALIDATE_WEBHOOK_URL at it to see the batches the API sends"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--secret", default=None, help="Defaults to REVALIDATE_WEBHOOK_SECRET"
+        )
+        parser.add_argument(
+            "--fail",
+            type=int,
+            default=0,
+            help="Answer the first N requests with 503 to exercise the retries",
+        )
+
+    def handle(self, *args, **options):
+        command = self
+        state = {"received": 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                state["received"] += 1
+                if state["received"] <= options["fail"]:
+                    command.stdout.write(f"#{state['received']} failed on purpose")
+                    self.reply(503)
+                    return
+
+                expected = sign(body, options["secret"])
+                if not hmac.compare_digest(
+                    self.headers.get(SIGNATURE_HEADER, ""), expected
+                ):
+                    command.stdout.write(
+                        command.style.ERROR(f"#{state['received']} bad signature")
+                    )
+                    self.reply(401)
+                    return
+
+                paths = json.loads(body)["paths"]
+                command.stdout.write(
+                    command.style.SUCCESS(
+                        f"#{state['received']} revalidate {len(paths)} paths: "
+                        f"{', '.join(paths)}"
+                    )
+                )
+                self.reply(200)
+
+            def reply(self, status):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", options["port"]), Handler)
+        self.stdout.write(f"Listening on http://127.0.0.1:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
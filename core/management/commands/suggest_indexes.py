@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from core.indexes import suggest_indexes
+
+
+class Command(BaseCommand):
+    help = "Suggest Meta.indexes additions from the statements in the slow query log"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-calls",
+            type=int,
+            default=1,
+            help="Ignore statements logged fewer times",
+        )
+        parser.add_argument(
+            "--verbose-sql",
+            action="store_true",
+            help="List the statements behind each suggestion",
+        )
+
+    def handle(self, *args, **options):
+        suggestions = suggest_indexes(options["min_calls"])
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS("No missing indexes found"))
+            return
+
+        for suggestion in suggestions:
+            meta = suggestion["model"]._meta
+            fields = ", ".join(f'"{name}"' for name in suggestion["fields"])
+            self.stdout.write(
+                f"{meta.label}  ({meta.app_label}/models.py, class {meta.object_name})\n"
+                f"    models.Index(fields=[{fields}]),\n"
+                f"    {len(suggestion['statements'])} statements, "
+                f"{suggestion['calls']} calls, {suggestion['total_ms']:.1f} ms logged"
+            )
+            if options["verbose_sql"]:
+                for statement in suggestion["statements"]:
+                    self.stdout.write(f"      {statement.sql}")
+        self.stdout.write(
+            "\nAdd the indexes to Meta.indexes and run manage.py makemigrations"
+        )
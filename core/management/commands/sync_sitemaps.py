@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.sitemaps import sync_pending_sitemaps
+
+
+class Command(BaseCommand):
+    help = "Rewrite the sitemap files of the objects changed since the last run"
+
+    def handle(self, *args, **options):
+        count = sync_pending_sitemaps()
+        self.stdout.write(self.style.SUCCESS(f"Applied {count} queued changes"))
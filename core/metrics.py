@@ -0,0 +1,193 @@
+"""
+In-process metrics.
+
+Histograms are kept per process and keyed by name and labels. Timings can
+also be attributed to the request being served: ``RequestMetricsMiddleware``
+opens a per-request record that ``record_timing`` adds to, and observes the
+totals when the response is ready.
+
+Every request records the time and count of its database queries, and the
+code paths below record their own timings:
+
+- ``serialize``: serializer ``data``, including queries run lazily by it
+- ``email_render`` and ``email_send``: see core.emails
+- ``storage``: S3 calls, see core.storages
+
+Staff get the totals in a ``Server-Timing`` header. Latency is observed per
+view and action as ``request_duration_seconds``, and everything is exposed
+in the Prometheus text format at ``/metrics``. Each process, on Lambda each
+container, keeps its own histograms.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+# Upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.count, self.sum
+
+
+registry = {}
+registry_lock = threading.Lock()
+
+
+def get_histogram(name, buckets=DEFAULT_BUCKETS, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    histogram = registry.get(key)
+    if histogram is None:
+        with registry_lock:
+            histogram = registry.setdefault(key, Histogram(buckets))
+    return histogram
+
+
+def observe(name, value, **labels):
+    get_histogram(name, **labels).observe(value)
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def render_prometheus():
+    """The registry in the Prometheus text exposition format"""
+    lines = []
+    typed = set()
+    for (name, labels), histogram in sorted(registry.items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        counts, count, total = histogram.snapshot()
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{format_labels(labels, le=bound)} {cumulative}")
+        lines.append(f"{name}_bucket{format_labels(labels, le='+Inf')} {count}")
+        lines.append(f"{name}_sum{format_labels(labels)} {total}")
+        lines.append(f"{name}_count{format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+# Totals of the current request, name to [seconds, count]
+request_timings = ContextVar("request_timings", default=None)
+
+
+def record_timing(name, seconds):
+    timings = request_timings.get()
+    if timings is None:
+        return
+    total = timings.setdefault(name, [0.0, 0])
+    total[0] += seconds
+    total[1] += 1
+
+
+@contextmanager
+def timing(name):
+    """Add the time spent in the block to the request's ``name`` timing"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+
+def time_query(execute, sql, params, many, context):
+    with timing("db"):
+        return execute(sql, params, many, context)
+
+
+def get_view_label(request):
+    """``<view>.<action>`` of a viewset, the view name otherwise"""
+    match = request.resolver_match
+    if match is None:
+        return "unmatched"
+    view = match.func
+    cls = getattr(view, "cls", None)
+    if cls is None:
+        return match.view_name or view.__name__
+    method = request.method.lower()
+    action = (getattr(view, "actions", None) or {}).get(method, method)
+    return f"{cls.__name__}.{action}"
+
+
+def shows_server_timing(request):
+    if settings.DEBUG:
+        return True
+    user = getattr(request, "user", None)
+    return user is not None and user.is_staff
+
+
+def server_timing(timings, elapsed):
+    entries = [
+        f'{name};dur={seconds * 1000:.1f};desc="{count}x"'
+        for name, (seconds, count) in sorted(timings.items())
+    ]
+    entries.append(f"total;dur={elapsed * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class RequestMetricsMiddleware:
+    """Collect the timings of each request, see ``record_timing``"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = request_timings.set({})
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(time_query))
+                response = self.get_response(request)
+            elapsed = time.perf_counter() - start
+
+            timings = request_timings.get()
+            for name, (seconds, _) in timings.items():
+                observe(f"request_{name}_seconds", seconds)
+            queries = timings.get("db", (0, 0))[1]
+            get_histogram("request_db_queries", QUERY_COUNT_BUCKETS).observe(queries)
+            observe(
+                "request_duration_seconds",
+                elapsed,
+                view=get_view_label(request),
+                method=request.method,
+                status=f"{response.status_code // 100}xx",
+            )
+            if shows_server_timing(request):
+                response["Server-Timing"] = server_timing(timings, elapsed)
+            return response
+        finally:
+            request_timings.reset(token)
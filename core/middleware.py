@@ -0,0 +1,280 @@
+"""
+Response compression and request coalescing.
+
+Compressed bodies are cached under the response ETag, or a hash of the body
+when there is none, so a response served many times is compressed once per
+encoding. Private responses and ones setting cookies are compressed but never
+cached. Private HTML can hold CSRF tokens, so like ``GZipMiddleware`` it's only
+gzipped, with random padding in the header to mitigate BREACH.
+
+Identical anonymous GETs that arrive while one of them is being computed
+wait for it and get a copy of its response instead of running the view
+again. Within a process the first request leads and the others wait on an
+event. With ``COALESCE_ACROSS_WORKERS`` the leader also takes a lock in the
+shared cache, and leaders in other workers wait for the response it stores.
+Followers don't run the view, so side effects such as view counts happen
+once per coalesced group.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_header_parameters
+from django.utils.text import compress_string
+
+from .routers import is_pinned
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# In order of preference
+ENCODINGS = ["br", "gzip"] if brotli else ["gzip"]
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/vnd.oai.openapi",
+    "image/svg+xml",
+}
+
+# Upper bound of the padding added to private HTML, as in GZipMiddleware
+PADDING_MAX_RANDOM_BYTES = 100
+
+
+def is_compressible(content_type):
+    media_type, _ = parse_header_parameters(content_type)
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+def is_html(content_type):
+    media_type, _ = parse_header_parameters(content_type)
+    return media_type == "text/html"
+
+
+def choose_encoding(accept_encoding, encodings=ENCODINGS):
+    """Return the first of ``encodings`` the client accepts, or None"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0
+        weights[coding.strip().lower()] = quality
+
+    for encoding in encodings:
+        if weights.get(encoding, weights.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding, level=None):
+    if encoding == "br":
+        quality = settings.COMPRESSION_BROTLI_QUALITY if level is None else level
+        return brotli.compress(body, quality=quality)
+    level = settings.COMPRESSION_GZIP_LEVEL if level is None else level
+    # A fixed mtime keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def is_shared(response):
+    """Whether the response may be served to other clients"""
+    cache_control = response.get("Cache-Control", "")
+    return not (
+        response.cookies or "private" in cache_control or "no-store" in cache_control
+    )
+
+
+def compressed_cache_key(request, response, encoding):
+    etag = response.get("ETag")
+    if etag:
+        # ETags identify a representation of one URL only
+        source = f"{request.get_full_path()}\n{etag}".encode()
+    else:
+        source = response.content
+    return f"compression:{encoding}:{hashlib.sha256(source).hexdigest()}"
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, reusing cached variants"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if not is_compressible(response.get("Content-Type", "")):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        shared = is_shared(response)
+        padded = not shared and is_html(response.get("Content-Type", ""))
+        encoding = choose_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            ["gzip"] if padded else ENCODINGS,
+        )
+        if encoding is None:
+            return response
+
+        if shared:
+            key = compressed_cache_key(request, response, encoding)
+            body = cache.get(key)
+            if body is None:
+                body = compress(response.content, encoding)
+                cache.set(key, body, settings.COMPRESSION_CACHE_TIMEOUT)
+        elif padded:
+            body = compress_string(
+                response.content, max_random_bytes=PADDING_MAX_RANDOM_BYTES
+            )
+        else:
+            body = compress(response.content, encoding)
+
+        if len(body) >= len(response.content):
+            return response
+
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        # The encoded body is a different representation, see GZipMiddleware
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        return response
+
+
+# Responses other requests may reuse
+SHAREABLE_STATUSES = {200, 301, 304, 404}
+
+
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.snapshot = None
+
+
+flights = {}
+flights_lock = threading.Lock()
+
+
+def is_anonymous(request):
+    return (
+        "HTTP_AUTHORIZATION" not in request.META
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def get_request_key(request):
+    parts = [
+        request.get_full_path(),
+        request.META.get("HTTP_ACCEPT", ""),
+        request.META.get("HTTP_IF_NONE_MATCH", ""),
+    ]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def snapshot_response(response):
+    """Picklable copy of ``response``, or None if it can't be shared"""
+    if (
+        response.streaming
+        or response.status_code not in SHAREABLE_STATUSES
+        or not is_shared(response)
+    ):
+        return None
+    return response.status_code, list(response.items()), response.content
+
+
+def build_response(snapshot):
+    status, headers, content = snapshot
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+class CoalescingMiddleware:
+    """Let concurrent identical anonymous GETs share one response"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            not settings.COALESCE_REQUESTS
+            or request.method != "GET"
+            or not is_anonymous(request)
+            or is_pinned(request)
+        ):
+            return self.get_response(request)
+
+        key = get_request_key(request)
+        with flights_lock:
+            flight = flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = flights[key] = Flight()
+
+        if not leader:
+            if flight.done.wait(settings.COALESCE_WAIT_TIMEOUT):
+                if flight.snapshot is not None:
+                    return build_response(flight.snapshot)
+            return self.get_response(request)
+
+        try:
+            if settings.COALESCE_ACROSS_WORKERS:
+                response = self.get_shared_response(request, key)
+            else:
+                response = self.get_response(request)
+            flight.snapshot = snapshot_response(response)
+            return response
+        finally:
+            with flights_lock:
+                flights.pop(key, None)
+            flight.done.set()
+
+    def get_shared_response(self, request, key):
+        lock_key = f"coalesce:{key}:lock"
+        result_key = f"coalesce:{key}"
+        timeout = settings.COALESCE_WAIT_TIMEOUT
+
+        if not cache.add(lock_key, 1, timeout):
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+                snapshot = cache.get(result_key)
+                if snapshot is not None:
+                    return build_response(snapshot)
+                if cache.get(lock_key) is None:
+                    break
+            return self.get_response(request)
+
+        try:
+            response = self.get_response(request)
+            snapshot = snapshot_response(response)
+            if snapshot is not None:
+                # Only kept long enough for the workers already waiting
+                cache.set(result_key, snapshot, settings.COALESCE_RESULT_TIMEOUT)
+            return response
+        finally:
+            cache.delete(lock_key)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SitemapEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("section", models.CharField(max_length=50)),
+                ("object_id", models.CharField(max_length=255)),
+                ("location", models.URLField(max_length=500)),
+                ("last_modified", models.DateTimeField(blank=True, null=True)),
+                ("chunk", models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                "verbose_name_plural": "Sitemap entries",
+                "indexes": [
+                    models.Index(
+                        fields=["section", "chunk"],
+                        name="core_sitema_section_b6e63a_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("section", "object_id"), name="unique_sitemap_entry"
+                    )
+                ],
+            },
+        ),
+    ]
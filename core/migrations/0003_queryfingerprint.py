@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_tombstone"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueryFingerprint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=32, unique=True)),
+                ("sql", models.TextField()),
+                ("calls", models.PositiveBigIntegerField(default=0)),
+                ("slow_calls", models.PositiveBigIntegerField(default=0)),
+                ("total_ms", models.FloatField(default=0)),
+                ("max_ms", models.FloatField(default=0)),
+                ("plan", models.TextField(blank=True)),
+                ("plan_captured_at", models.DateTimeField(blank=True, null=True)),
+                ("first_seen", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_seen", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-19 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_revalidationpath"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="revalidationpath",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.2 on 2026-10-19 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_revalidationpath_claimed_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SitemapSync",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("section", models.CharField(max_length=50)),
+                ("object_id", models.CharField(max_length=255)),
+                ("requested_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
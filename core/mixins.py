@@ -0,0 +1,229 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .changes import get_change_page
+from .serializers import DynamicFieldsModelSerializer, optimize_queryset
+from .versions import get_dependent_models, get_versions, model_key, row_key
+
+
+def parse_list_param(value):
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Adds ``?fields=`` and ``?expand=`` to a viewset's reads and trims the
+    queryset to the columns and relations the selected fields need.
+    """
+
+    def get_field_selection(self):
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None, None
+        return (
+            parse_list_param(request.query_params.get("fields")),
+            parse_list_param(request.query_params.get("expand")),
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), DynamicFieldsModelSerializer):
+            fields, expand = self.get_field_selection()
+            kwargs.setdefault("fields", fields)
+            kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, DynamicFieldsModelSerializer):
+            return queryset
+        if serializer_class.Meta.model is not queryset.model:
+            return queryset
+        return optimize_queryset(queryset, self.get_serializer())
+
+
+class NotModified(Exception):
+    def __init__(self, etag):
+        self.etag = etag
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETags on list and retrieve built from the content versions in
+    ``core.versions``. A matching ``If-None-Match`` is answered with 304
+    before the queryset is evaluated.
+
+    The ETag covers the versions of the queryset model and the models it
+    relates to, or ``version_models`` when set, plus the row version on
+    retrieve when ``get_version_row`` can tell the primary key.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    version_models = None
+
+    def get_version_models(self):
+        if self.version_models is not None:
+            return self.version_models
+        return get_dependent_models(self.get_queryset().model)
+
+    def get_version_row(self):
+        """Primary key of the object a detail route reads, if it's in the URL"""
+        model = self.get_queryset().model
+        if self.lookup_field not in ("pk", model._meta.pk.name):
+            return None
+        return self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+
+    def get_content_etag(self):
+        models = self.get_version_models()
+        keys = [model_key(model) for model in models]
+        if self.action == "retrieve":
+            pk = self.get_version_row()
+            if pk is not None:
+                # Other rows of the model don't affect this one
+                keys[0] = row_key(models[0], pk)
+
+        request = self.request
+        parts = [
+            settings.CONTENT_VERSION_SALT,
+            *map(str, get_versions(keys)),
+            request.get_full_path(),
+            str(request.user.is_staff),
+            request.accepted_media_type,
+        ]
+        digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def initial(self, request, *args, **kwargs):
+        self.content_etag = None
+        super().initial(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD"):
+            return
+        if self.action not in self.conditional_actions:
+            return
+
+        self.content_etag = self.get_content_etag()
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match:
+            # Weak comparison, compressed responses carry a weak ETag
+            etags = {etag.removeprefix("W/") for etag in parse_etags(if_none_match)}
+            if self.content_etag in etags:
+                raise NotModified(self.content_etag)
+
+    def not_modified(self, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return self.not_modified(exc.etag)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "content_etag", None)
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+        return response
+
+
+class CacheControlMixin:
+    """
+    Cache-Control headers for safe requests from ``cache_policy``, a dict of
+    ``patch_cache_control`` arguments per action with an optional ``"*"``
+    entry for the other actions::
+
+        cache_policy = {
+            "list": {"max_age": 60, "s_maxage": 300, "stale_while_revalidate": 600},
+        }
+
+    Anonymous responses are public with the action's policy. Authenticated
+    users can see other results, e.g. staff see unpublished posts, so their
+    responses are private and revalidated. Responses always vary on
+    Authorization and Cookie so shared caches keep the two apart.
+    """
+
+    cache_policy = {}
+    cacheable_statuses = (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED)
+
+    def get_cache_policy(self):
+        return self.cache_policy.get(self.action, self.cache_policy.get("*"))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in SAFE_METHODS:
+            return response
+
+        patch_vary_headers(response, ("Authorization", "Cookie"))
+        policy = self.get_cache_policy()
+        if (
+            policy is None
+            or response.status_code not in self.cacheable_statuses
+            or response.has_header("Cache-Control")
+        ):
+            return response
+
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(response, public=True, **policy)
+        return response
+
+
+class ChangeFeedMixin:
+    """
+    Adds a ``changes`` route listing the rows changed and deleted since the
+    ``?since=`` cursor, see ``core.changes``. Clients pass the ``next`` cursor
+    of a page to get the following one, or the changes made since.
+
+    Changed rows that ``get_queryset()`` no longer returns, such as posts
+    moved back to draft, are listed as deleted.
+    """
+
+    def get_change_limit(self):
+        limit = self.request.query_params.get("limit")
+        if limit is None:
+            return settings.CHANGE_FEED_PAGE_SIZE
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({"limit": "A whole number is required."})
+        return min(max(limit, 1), settings.CHANGE_FEED_MAX_PAGE_SIZE)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """Rows changed and deleted since the ``since`` cursor"""
+        queryset = self.get_queryset()
+        page = get_change_page(
+            queryset.model, request.query_params.get("since"), self.get_change_limit()
+        )
+        rows = list(
+            queryset.filter(pk__in=page["changed"]).order_by("updated_at", "pk")
+        )
+        visible = {row.pk for row in rows}
+        deleted = [pk for pk in page["changed"] if pk not in visible]
+        # A tombstone is stale when its id was reused by a visible row
+        deleted += [pk for pk in page["deleted"] if pk not in visible]
+
+        response = Response(
+            {
+                "results": self.get_serializer(rows, many=True).data,
+                "deleted": list(dict.fromkeys(deleted)),
+                "next": page["next"],
+                "has_more": page["has_more"],
+            }
+        )
+        # The cursor in the URL doesn't pin the response, later changes extend it
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,79 @@
+from django.db import models
+from django.utils import timezone
+
+
+class SitemapEntry(models.Model):
+    """One URL of a sitemap file, kept in sync by core.sitemaps"""
+
+    section = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=255)
+    location = models.URLField(max_length=500)
+    last_modified = models.DateTimeField(null=True, blank=True)
+    chunk = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        verbose_name_plural = "Sitemap entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["section", "object_id"], name="unique_sitemap_entry"
+            ),
+        ]
+        indexes = [models.Index(fields=["section", "chunk"])]
+
+    def __str__(self):
+        return self.location
+
+
+class SitemapSync(models.Model):
+    """An object whose sitemap entry may be stale, see core.sitemaps"""
+
+    section = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=255)
+    requested_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.section} {self.object_id} at {self.requested_at}"
+
+
+class Tombstone(models.Model):
+    """A deleted row of a change feed model, see core.changes"""
+
+    model = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=255)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["model", "deleted_at", "id"])]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+
+class RevalidationPath(models.Model):
+    """A frontend path waiting to be revalidated, see core.webhooks"""
+
+    path = models.CharField(max_length=500)
+    queued_at = models.DateTimeField(auto_now_add=True)
+    # Set while a delivery is sending the path
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.path
+
+
+class QueryFingerprint(models.Model):
+    """Statements grouped by normalized SQL, recorded by core.querylog"""
+
+    fingerprint = models.CharField(max_length=32, unique=True)
+    sql = models.TextField()
+    calls = models.PositiveBigIntegerField(default=0)
+    slow_calls = models.PositiveBigIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    plan = models.TextField(blank=True)
+    plan_captured_at = models.DateTimeField(null=True, blank=True)
+    first_seen = models.DateTimeField(default=timezone.now)
+    last_seen = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.sql[:100]
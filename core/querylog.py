@@ -0,0 +1,218 @@
+"""
+Sampling slow query log.
+
+With ``QUERY_LOG_ENABLED``, statements run while serving a request are
+recorded when they take over ``QUERY_LOG_SLOW_MS``, and a
+``QUERY_LOG_SAMPLE_RATE`` share of the rest is recorded too, so cheap but
+frequent statements show up as well. Statements are grouped by fingerprint,
+a hash of the SQL with literals and placeholder lists normalized away.
+
+The first time a SELECT fingerprint is seen, and again every
+``QUERY_LOG_EXPLAIN_INTERVAL``, its plan is captured with ``EXPLAIN
+(ANALYZE, BUFFERS)`` on PostgreSQL. That runs the statement a second time,
+so it's kept to one plan per fingerprint per interval.
+
+Counts are aggregated in memory and added to ``QueryFingerprint`` rows at
+the end of a request every ``QUERY_LOG_FLUSH_SECONDS``.
+``manage.py suggest_indexes`` reads them.
+"""
+
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Set while the log runs its own statements, which aren't logged
+capturing = ContextVar("capturing_queries", default=False)
+
+
+def normalize(sql):
+    sql = STRING_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = PLACEHOLDER_LIST_RE.sub("(...)", sql)
+    return WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+def explain(connection, sql, params):
+    """Plan of ``sql``, executed for real on PostgreSQL"""
+    if connection.vendor == "postgresql":
+        prefix = connection.ops.explain_query_prefix(analyze=True, buffers=True)
+    else:
+        prefix = connection.ops.explain_query_prefix()
+    token = capturing.set(True)
+    try:
+        # A failing EXPLAIN mustn't break the request's transaction
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                rows = cursor.fetchall()
+    finally:
+        capturing.reset(token)
+    return "\n".join(" ".join(map(str, row)) for row in rows)
+
+
+class QueryLog:
+    """Fingerprint totals not yet added to the database"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+        # Fingerprint to when its plan was last captured in this process
+        self.explained = {}
+        self.flushed_at = time.monotonic()
+
+    def should_explain(self, key):
+        interval = settings.QUERY_LOG_EXPLAIN_INTERVAL
+        with self.lock:
+            last = self.explained.get(key)
+            if last is not None and time.monotonic() - last < interval:
+                return False
+            if len(self.explained) >= settings.QUERY_LOG_MAX_FINGERPRINTS:
+                return False
+            self.explained[key] = time.monotonic()
+            return True
+
+    def record(self, key, normalized, ms, slow, plan=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                if len(self.entries) >= settings.QUERY_LOG_MAX_FINGERPRINTS:
+                    return
+                entry = self.entries[key] = {
+                    "sql": normalized,
+                    "calls": 0,
+                    "slow_calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "plan": None,
+                }
+            entry["calls"] += 1
+            entry["slow_calls"] += slow
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            if plan is not None:
+                entry["plan"] = plan
+
+    def flush_if_due(self):
+        with self.lock:
+            if time.monotonic() - self.flushed_at < settings.QUERY_LOG_FLUSH_SECONDS:
+                return
+            self.flushed_at = time.monotonic()
+        self.flush()
+
+    def flush(self):
+        with self.lock:
+            entries, self.entries = self.entries, {}
+        if not entries:
+            return
+        token = capturing.set(True)
+        try:
+            for key, entry in entries.items():
+                save_entry(key, entry)
+        except DatabaseError as e:
+            logger.warning(f"Error saving {len(entries)} query fingerprints: {str(e)}")
+        finally:
+            capturing.reset(token)
+
+
+def save_entry(key, entry):
+    from .models import QueryFingerprint
+
+    now = timezone.now()
+    changes = {
+        "calls": F("calls") + entry["calls"],
+        "slow_calls": F("slow_calls") + entry["slow_calls"],
+        "total_ms": F("total_ms") + entry["total_ms"],
+        "max_ms": Greatest(F("max_ms"), entry["max_ms"]),
+        "last_seen": now,
+    }
+    if entry["plan"] is not None:
+        changes.update(plan=entry["plan"], plan_captured_at=now)
+    rows = QueryFingerprint.objects.filter(fingerprint=key)
+    if rows.update(**changes):
+        return
+    try:
+        QueryFingerprint.objects.create(
+            fingerprint=key,
+            sql=entry["sql"],
+            calls=entry["calls"],
+            slow_calls=entry["slow_calls"],
+            total_ms=entry["total_ms"],
+            max_ms=entry["max_ms"],
+            plan=entry["plan"] or "",
+            plan_captured_at=now if entry["plan"] is not None else None,
+        )
+    except IntegrityError:
+        # Another process created it meanwhile
+        rows.update(**changes)
+
+
+query_log = QueryLog()
+
+
+def log_query(execute, sql, params, many, context):
+    if capturing.get():
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    ms = (time.perf_counter() - start) * 1000
+
+    slow = ms >= settings.QUERY_LOG_SLOW_MS
+    if not slow and random.random() >= settings.QUERY_LOG_SAMPLE_RATE:
+        return result
+    normalized = normalize(sql)
+    key = fingerprint(normalized)
+    plan = None
+    if (
+        settings.QUERY_LOG_EXPLAIN
+        and not many
+        and normalized[:6].upper() == "SELECT"
+        and query_log.should_explain(key)
+    ):
+        try:
+            plan = explain(context["connection"], sql, params)
+        except DatabaseError as e:
+            logger.warning(f"Error explaining query {key}: {str(e)}")
+    query_log.record(key, normalized, ms, slow, plan)
+    return result
+
+
+class QueryLogMiddleware:
+    """Log the statements of each request, see ``log_query``"""
+
+    def __init__(self, get_response):
+        if not settings.QUERY_LOG_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(log_query))
+            response = self.get_response(request)
+        query_log.flush_if_due()
+        return response
@@ -0,0 +1,159 @@
+"""
+Read replica routing.
+
+Reads of safe requests go to a replica in ``DATABASE_REPLICAS``, everything
+else, including reads inside a transaction, stays on ``default``. Replicas
+whose replication lag is over ``REPLICA_MAX_LAG_SECONDS``, or that can't be
+reached, are skipped until the next check.
+
+Reads also stay on the primary for ``REPLICA_MAX_LAG_SECONDS`` after content
+versions (``core.versions``) change, otherwise a replica that hasn't caught
+up could serve old content under a new ETag or fill the queryset cache with
+it. This relies on a cache shared by all workers.
+
+A request that changes data pins the client to the primary for
+``REPLICA_PIN_SECONDS``, so it reads its own writes. Browsers get a cookie,
+other clients can echo the ``X-Pin-Primary`` response header.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections, transaction
+
+from .versions import LAST_BUMP_KEY
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "pin_primary"
+PIN_HEADER = "X-Pin-Primary"
+
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# Whether the current request may read from a replica
+use_replica = ContextVar("use_replica", default=False)
+
+# Alias to (checked at, lag in seconds)
+lags = {}
+lags_lock = threading.Lock()
+
+
+def measure_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_QUERY)
+        return float(cursor.fetchone()[0] or 0)
+
+
+def get_recent_lag(alias, now):
+    checked_at, lag = lags.get(alias, (None, None))
+    if (
+        checked_at is not None
+        and now - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL
+    ):
+        return lag
+    return None
+
+
+def get_lag(alias):
+    """Replication lag of ``alias``, measured at most every REPLICA_LAG_CHECK_INTERVAL"""
+    now = time.monotonic()
+    lag = get_recent_lag(alias, now)
+    if lag is not None:
+        return lag
+    with lags_lock:
+        # Another thread may have measured it meanwhile
+        lag = get_recent_lag(alias, now)
+        if lag is not None:
+            return lag
+        try:
+            lag = measure_lag(alias)
+        except DatabaseError as e:
+            logger.warning(f"Replica {alias} is unavailable: {str(e)}")
+            lag = float("inf")
+        lags[alias] = (now, lag)
+    return lag
+
+
+def get_healthy_replicas():
+    return [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if get_lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+    ]
+
+
+def is_recently_changed():
+    last_bump = cache.get(LAST_BUMP_KEY)
+    return (
+        last_bump is not None
+        and time.time() - last_bump < settings.REPLICA_MAX_LAG_SECONDS
+    )
+
+
+def is_pinned(request):
+    return PIN_COOKIE in request.COOKIES or PIN_HEADER in request.headers
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not use_replica.get():
+            return "default"
+        if transaction.get_connection("default").in_atomic_block:
+            # Reads in a transaction must see its writes
+            return "default"
+        replicas = get_healthy_replicas()
+        return random.choice(replicas) if replicas else "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+
+class ReplicaMiddleware:
+    """Route the reads of safe, unpinned requests to replicas"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in ("GET", "HEAD", "OPTIONS")
+        token = use_replica.set(
+            safe
+            and bool(settings.DATABASE_REPLICAS)
+            and not is_pinned(request)
+            and not is_recently_changed()
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+
+        if not safe and settings.DATABASE_REPLICAS:
+            seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=seconds,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+            response[PIN_HEADER] = str(seconds)
+        return response
@@ -0,0 +1,74 @@
+"""
+Precomputed OpenAPI schema.
+
+Introspecting every viewset on each request is slow, so the schema is
+generated by ``manage.py build_schema`` into ``OPENAPI_SCHEMA_PATH`` and
+committed with the code. ``manage.py build_schema --check`` fails when the
+committed file no longer matches the code, CI runs it on every push.
+
+The schema is served from memory with an ETag, at ``/schema`` for clients
+that want the current one and at ``/schema/<version>``, which never changes
+and can be cached indefinitely. The Swagger UI loads the versioned URL.
+Without the file the schema is generated per request as before.
+
+``core.views`` only imports this module when the schema or the Swagger UI is
+requested, so scheduled tasks don't load drf_spectacular. Web requests still
+do, DRF's routers touch every viewset's schema when building the URLs.
+"""
+
+import functools
+import hashlib
+import json
+
+import yaml
+from django.conf import settings
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from drf_spectacular.renderers import OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularSwaggerView
+
+
+def generate_schema():
+    """Render the schema of the current code as YAML"""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiYamlRenderer().render(schema, renderer_context={})
+
+
+def get_version(content):
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+@functools.cache
+def load_schema():
+    """
+    The committed schema as ``{"version", "yaml", "json"}``, or None when it
+    hasn't been built
+    """
+    try:
+        content = settings.OPENAPI_SCHEMA_PATH.read_bytes()
+    except FileNotFoundError:
+        return None
+    return {
+        "version": get_version(content),
+        "yaml": content,
+        "json": json.dumps(yaml.safe_load(content)).encode(),
+    }
+
+
+class SwaggerView(SpectacularSwaggerView):
+    """Swagger UI with bundled assets, loading the versioned schema"""
+
+    def _get_schema_url(self, request):
+        built = load_schema()
+        if built is None:
+            return super()._get_schema_url(request)
+        return reverse("schema-version", kwargs={"version": built["version"]})
+
+    @extend_schema(exclude=True)
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        patch_cache_control(response, public=True, max_age=300)
+        return response
@@ -0,0 +1,169 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+from .caching import CachedQuerySet
+from .metrics import timing
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """ListSerializer recording the time to build ``data``, see core.metrics"""
+
+    @property
+    def data(self):
+        with timing("serialize"):
+            return super().data
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer accepting ``fields`` and ``expand`` keyword arguments.
+
+    ``fields`` keeps only the listed top-level fields. Relations named in
+    ``Meta.expandable_fields`` are nested by default; once ``expand`` is given,
+    only the listed ones stay nested and the rest collapse to primary keys.
+
+    Fields whose source is not a model field (properties, methods) can declare
+    the model fields they read in ``Meta.source_fields`` so querysets can still
+    be trimmed with ``.only()``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        expand = kwargs.pop("expand", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if expand is not None:
+            model = self.Meta.model
+            for name in getattr(self.Meta, "expandable_fields", []):
+                if name in self.fields and name not in expand:
+                    model_field = model._meta.get_field(name)
+                    self.fields[name] = PrimaryKeyRelatedField(
+                        read_only=True, many=model_field.many_to_many
+                    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Lists are timed too, unless a serializer picks its own list class
+        meta = getattr(cls, "Meta", None)
+        if meta is not None and not hasattr(meta, "list_serializer_class"):
+            meta.list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with timing("serialize"):
+            return super().data
+
+
+def is_primary_key_field(field):
+    if isinstance(field, ManyRelatedField):
+        field = field.child_relation
+    return isinstance(field, PrimaryKeyRelatedField)
+
+
+def get_nested_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.ModelSerializer):
+        return field
+    return None
+
+
+def get_related_queryset(model):
+    queryset = model._default_manager.all()
+    # Reference tables opt in to result caching through their manager
+    if isinstance(queryset, CachedQuerySet):
+        queryset = queryset.cached()
+    return queryset
+
+
+def get_column_plan(serializer, model):
+    """
+    Return ``(columns, select_related, prefetch_related)`` needed to render
+    ``serializer`` for instances of ``model``. ``columns`` is None when some
+    field reads attributes we can't map to columns.
+    """
+    columns = {model._meta.pk.name}
+    select_related = []
+    prefetch_related = []
+    source_fields = getattr(getattr(serializer, "Meta", None), "source_fields", {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in source_fields:
+            if columns is not None:
+                columns.update(source_fields[name])
+            continue
+        if field.source == "*":
+            columns = None
+            continue
+
+        attribute = field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(attribute)
+        except FieldDoesNotExist:
+            columns = None
+            continue
+
+        if not model_field.is_relation:
+            if columns is not None:
+                columns.add(attribute)
+            continue
+
+        nested = get_nested_serializer(field)
+        related_model = model_field.related_model
+        if model_field.many_to_many or model_field.one_to_many:
+            if is_primary_key_field(field):
+                queryset = get_related_queryset(related_model).only("pk")
+            elif nested is not None and model_field.many_to_many:
+                nested_columns, _, _ = get_column_plan(nested, related_model)
+                queryset = get_related_queryset(related_model)
+                if nested_columns is not None:
+                    queryset = queryset.only(*nested_columns)
+            else:
+                queryset = get_related_queryset(related_model)
+            prefetch_related.append(Prefetch(attribute, queryset=queryset))
+            continue
+
+        # Forward foreign key or one-to-one
+        if columns is not None:
+            columns.add(attribute)
+        if is_primary_key_field(field):
+            continue
+        select_related.append(attribute)
+        if nested is not None and columns is not None:
+            nested_columns, _, _ = get_column_plan(nested, related_model)
+            if nested_columns is None:
+                columns.update(
+                    f"{attribute}__{related_field.name}"
+                    for related_field in related_model._meta.concrete_fields
+                )
+            else:
+                columns.update(f"{attribute}__{column}" for column in nested_columns)
+        elif columns is not None:
+            columns.update(
+                f"{attribute}__{related_field.name}"
+                for related_field in related_model._meta.concrete_fields
+            )
+
+    return columns, select_related, prefetch_related
+
+
+def optimize_queryset(queryset, serializer):
+    """Load only the columns and relations ``serializer`` renders"""
+    columns, select_related, prefetch_related = get_column_plan(
+        serializer, queryset.model
+    )
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if columns is not None:
+        queryset = queryset.only(*columns)
+    return queryset
@@ -1,7 +1,9 @@
+import copy
 import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
 from django.core.management.utils import get_random_secret_key
 from dotenv import load_dotenv
 
@@ -18,9 +20,14 @@ DEBUG = os.getenv("DEBUG", "False") == "True"
 
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "localhost").split(",")
 
+FRONTEND_URL = os.getenv("FRONTEND_URL", "https://gumisofts.com")
+
 CORS_ALLOWED_ORIGINS = os.getenv(
     "CORS_ALLOWED_ORIGINS", "http://localhost:4000,http://localhost:3000"
 ).split(",")
+# Clients without cookies echo the primary pin, see core.routers
+CORS_ALLOW_HEADERS = [*default_headers, "x-pin-primary"]
+CORS_EXPOSE_HEADERS = ["X-Pin-Primary"]
 
 
 INSTALLED_APPS = [
@@ -34,6 +41,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "drf_spectacular_sidecar",
     "drf_spectacular",
+    "core",
     "clients",
     "ckeditor",
     "accounts",
@@ -43,8 +51,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.metrics.RequestMetricsMiddleware",
+    "core.querylog.QueryLogMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
+    "core.middleware.CoalescingMiddleware",
+    "core.routers.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -75,13 +88,15 @@ WSGI_APPLICATION = "core.wsgi.application"
 
 STORAGES = {
     "default": {
-        "BACKEND": "storages.backends.s3.S3Storage",
+        "BACKEND": "core.storages.S3Storage",
         "OPTIONS": {
             # "querystring_auth": False,
+            # Sitemaps and the export manifest are replaced in place
+            "file_overwrite": True,
         },
     },
     "staticfiles": {
-        "BACKEND": "storages.backends.s3.S3Storage",
+        "BACKEND": "core.storages.S3Storage",
         "OPTIONS": {
             # "querystring_auth": False,
             "location": "static",
@@ -91,18 +106,158 @@ STORAGES = {
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "core.backends.postgresql",
         "NAME": os.getenv("PG_DB_NAME"),
         "USER": os.getenv("PG_USER"),
         "PASSWORD": os.getenv("PG_PASSWORD"),
         "HOST": os.getenv("PG_HOST"),
         "PORT": os.getenv("PG_PORT", "5432"),
-        "CONN_MAX_AGE": None,
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {"sslmode": os.getenv("PG_SSL_MODE")},
     }
 }
+
+# Connection handling, PG_POOL is one of
+# - "native": a psycopg pool per process, for threaded gunicorn workers
+# - "pgbouncer": a connection per request to a transaction pooler such as
+#   pgbouncer or RDS Proxy, for Lambda where idle containers would otherwise
+#   each hold a connection
+# - "off": one connection per process, reused for PG_CONN_MAX_AGE seconds
+PG_POOL = os.getenv("PG_POOL", "off")
+if PG_POOL == "native":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("PG_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("PG_POOL_MAX_SIZE", 10)),
+        "max_lifetime": int(os.getenv("PG_POOL_MAX_LIFETIME", 30 * 60)),
+        "max_idle": int(os.getenv("PG_POOL_MAX_IDLE", 5 * 60)),
+        "timeout": int(os.getenv("PG_POOL_TIMEOUT", 10)),
+    }
+elif PG_POOL == "pgbouncer":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    # Transaction pooling can't keep cursors open across transactions
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("PG_CONN_MAX_AGE", 10 * 60))
+
+# Read replicas, see core.routers. PG_REPLICA_HOSTS lists the hosts of
+# streaming replicas of the primary, tests read them through the primary.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.getenv("PG_REPLICA_HOSTS", "").split(","))
+):
+    alias = f"replica_{index + 1}"
+    DATABASES[alias] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_LAG_CHECK_INTERVAL = 10
+REPLICA_PIN_SECONDS = 15
+
 AUTH_USER_MODEL = "accounts.User"
 
+if os.getenv("REDIS_HOST"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{os.getenv('REDIS_HOST')}:{os.getenv('REDIS_PORT', '6379')}",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Content versions behind ETags, see core.versions. Without a shared cache each
+# worker keeps its own versions, so they expire to bound how stale a 304 can be.
+# Change CONTENT_VERSION_SALT when a release changes response formats.
+CONTENT_VERSION_TIMEOUT = None if os.getenv("REDIS_HOST") else 60
+CONTENT_VERSION_SALT = os.getenv("CONTENT_VERSION_SALT", "1")
+
+# Queryset result cache, see core.caching
+QUERYSET_CACHE_ENABLED = True
+QUERYSET_CACHE_TIMEOUT = 60 * 60
+SINGLE_FLIGHT_LOCK_TIMEOUT = 10
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Change feeds, see core.changes. Rows are listed once they are older than the
+# settle window, so transactions committing late aren't skipped.
+CHANGE_FEED_PAGE_SIZE = 100
+CHANGE_FEED_MAX_PAGE_SIZE = 1000
+CHANGE_FEED_SETTLE_SECONDS = 5
+CHANGE_FEED_TOMBSTONE_RETENTION = timedelta(days=90)
+
+# Static JSON export of the public API, see core.exports. Turn on
+# STATIC_EXPORT_ON_CHANGE to export after every committed content change.
+STATIC_EXPORT_DIRECTORY = "api"
+STATIC_EXPORT_PAGE_SIZE = 20
+STATIC_EXPORT_HOST = os.getenv("STATIC_EXPORT_HOST", "apis.gumisofts.com")
+STATIC_EXPORT_ON_CHANGE = os.getenv("STATIC_EXPORT_ON_CHANGE") == "True"
+STATIC_EXPORT_LOCK_TIMEOUT = 5 * 60
+
+# Revalidation webhooks to the frontend, see core.webhooks. Disabled without a
+# URL. Queued paths are delivered every minute by a scheduled task, and after
+# REVALIDATE_DEBOUNCE_SECONDS by a background thread. On Lambda the process is
+# frozen after each response, so the thread is off there.
+REVALIDATE_WEBHOOK_URL = os.getenv("REVALIDATE_WEBHOOK_URL", "")
+REVALIDATE_WEBHOOK_SECRET = os.getenv("REVALIDATE_WEBHOOK_SECRET", "")
+REVALIDATE_DEBOUNCE_SECONDS = float(
+    os.getenv(
+        "REVALIDATE_DEBOUNCE_SECONDS", 0 if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else 2
+    )
+)
+REVALIDATE_MAX_ATTEMPTS = 4
+REVALIDATE_RETRY_BACKOFF = 0.5
+REVALIDATE_TIMEOUT = 5
+# Seconds after which paths claimed by an unfinished delivery are sent again
+REVALIDATE_CLAIM_TIMEOUT = 5 * 60
+
+# Request metrics, see core.metrics. Prometheus scrapes /metrics with
+# "Authorization: Bearer <METRICS_TOKEN>", staff can read it when signed in.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Slow query log, see core.querylog. Statements slower than QUERY_LOG_SLOW_MS
+# and a QUERY_LOG_SAMPLE_RATE share of the rest are recorded, read them with
+# manage.py suggest_indexes.
+QUERY_LOG_ENABLED = os.getenv("QUERY_LOG_ENABLED") == "True"
+QUERY_LOG_SLOW_MS = float(os.getenv("QUERY_LOG_SLOW_MS", 100))
+QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", 0.01))
+QUERY_LOG_EXPLAIN = os.getenv("QUERY_LOG_EXPLAIN", "True") == "True"
+QUERY_LOG_EXPLAIN_INTERVAL = 60 * 60
+QUERY_LOG_FLUSH_SECONDS = 60
+QUERY_LOG_MAX_FINGERPRINTS = 1000
+
+# Endpoint budgets, see manage.py benchmark_endpoints. A run fails when an
+# endpoint makes more queries than its baseline, returns a larger response or
+# gets slower than the baseline by the ratio plus the slack.
+ENDPOINT_BASELINE_PATH = BASE_DIR / "core" / "endpoint_baseline.json"
+ENDPOINT_BUDGET_EXTRA_QUERIES = 0
+ENDPOINT_BUDGET_SIZE_RATIO = 1.25
+ENDPOINT_BUDGET_LATENCY_RATIO = 1.5
+ENDPOINT_BUDGET_LATENCY_SLACK_MS = 10
+
+# Batch endpoint, see core.views.batch
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Coalescing of identical anonymous GETs, see core.middleware
+COALESCE_REQUESTS = True
+COALESCE_ACROSS_WORKERS = bool(os.getenv("REDIS_HOST"))
+COALESCE_WAIT_TIMEOUT = 10
+COALESCE_RESULT_TIMEOUT = 5
+
+# Response compression, see core.middleware
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_TIMEOUT = 60 * 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -175,9 +330,28 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [],
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# OpenAPI schema, see core.schema. The Swagger UI assets are served from our
+# static files instead of a CDN.
+OPENAPI_SCHEMA_PATH = BASE_DIR / "core" / "openapi.yaml"
+SPECTACULAR_SETTINGS = {
+    "TITLE": "Gumisofts API",
+    "SWAGGER_UI_DIST": "SIDECAR",
+    "SWAGGER_UI_FAVICON_HREF": "SIDECAR",
+    "REDOC_DIST": "SIDECAR",
+}
+
 
 EMAIL_USE_TLS = os.getenv("EMAIL_PORT") == "587"
 EMAIL_USE_SSL = os.getenv("EMAIL_PORT") == "465"
@@ -216,3 +390,12 @@ CKEDITOR_CONFIGS = {
 }
 
 CKEDITOR_UPLOAD_PATH = "uploads/"
+
+# Blog content rendering
+BLOG_IMAGE_CDN_URL = os.getenv("BLOG_IMAGE_CDN_URL", "")
+BLOG_IMAGE_WIDTHS = [480, 960, 1440]
+BLOG_IMAGE_SOURCE_PREFIXES = [
+    MEDIA_URL,
+    f"https://{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/",
+    f"https://{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_CLOUD_S3_REGION_NAME}.amazonaws.com/",
+]
@@ -0,0 +1,85 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .changes import is_tracked, record_deletion, touch_rows
+from .exports import get_export_models, schedule_export
+from .sitemaps import get_sections, schedule_sync
+from .versions import IGNORED_UPDATE_FIELDS, schedule_version_bump
+from .webhooks import schedule_revalidation
+
+
+def connect_sitemap_signals():
+    for section in get_sections():
+
+        def on_change(sender, instance, update_fields=None, section=section, **kwargs):
+            if update_fields and set(update_fields) <= section.ignored_fields:
+                return
+            schedule_sync(section, [instance.pk])
+
+        post_save.connect(
+            on_change, sender=section.model, weak=False, dispatch_uid=section.name
+        )
+        post_delete.connect(
+            on_change, sender=section.model, weak=False, dispatch_uid=section.name
+        )
+
+
+connect_sitemap_signals()
+
+
+def connect_revalidation_signals():
+    for section in get_sections():
+
+        def on_change(sender, instance, update_fields=None, section=section, **kwargs):
+            if update_fields and set(update_fields) <= section.ignored_fields:
+                return
+            schedule_revalidation(section, [instance])
+
+        uid = f"revalidate-{section.name}"
+        post_save.connect(on_change, sender=section.model, weak=False, dispatch_uid=uid)
+        post_delete.connect(
+            on_change, sender=section.model, weak=False, dispatch_uid=uid
+        )
+
+
+connect_revalidation_signals()
+
+
+def on_content_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS:
+        return
+    schedule_version_bump(sender, [instance.pk])
+    schedule_export()
+
+
+def connect_content_signals():
+    # Only the public content is versioned, writes to sessions, logs and
+    # derived tables mustn't invalidate ETags or pin reads to the primary
+    for model in get_export_models():
+        uid = f"content-{model._meta.label_lower}"
+        post_save.connect(on_content_changed, sender=model, dispatch_uid=uid)
+        post_delete.connect(on_content_changed, sender=model, dispatch_uid=uid)
+
+
+connect_content_signals()
+
+
+@receiver(m2m_changed)
+def on_content_relations_changed(sender, instance, action, model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    touch_rows(instance._meta.model, [instance.pk])
+    touch_rows(model, pk_set)
+    content_models = get_export_models()
+    if instance._meta.model in content_models:
+        schedule_version_bump(instance._meta.model, [instance.pk])
+    if model in content_models:
+        schedule_version_bump(model, pk_set or ())
+    if {instance._meta.model, model} & content_models:
+        schedule_export()
+
+
+@receiver(post_delete)
+def on_content_deleted(sender, instance, **kwargs):
+    if is_tracked(sender):
+        record_deletion(sender, instance.pk)
@@ -0,0 +1,255 @@
+"""
+Incrementally maintained sitemaps stored as static files.
+
+Every public URL is mirrored in a ``SitemapEntry`` row assigned to a numbered
+chunk of its section. A change to one object rewrites only the chunk file it
+lives in plus the small sitemap index, instead of rebuilding every sitemap
+from a full table scan. Chunks never exceed the 50,000 URL protocol limit.
+
+Changed objects are queued in ``SitemapSync`` rows, written in the same
+transaction as the change, and the files are rewritten by
+``core.tasks.sync_sitemaps`` every minute rather than by the request.
+"""
+
+import logging
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import SitemapEntry, SitemapSync
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_URL_LIMIT = 50000
+SITEMAP_DIRECTORY = "sitemaps"
+SITEMAP_INDEX_PATH = f"{SITEMAP_DIRECTORY}/sitemap.xml"
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+class SitemapSection:
+    """Describes the public URLs of one model, subclassed in each app's sitemaps.py"""
+
+    name = None
+    model = None
+    # Saves limited to these fields never change the sitemap
+    ignored_fields = set()
+    # Frontend page listing the objects, revalidated with them
+    index_location = None
+
+    def items(self):
+        """Queryset of the publicly visible objects"""
+        return self.model.objects.all()
+
+    def location(self, obj):
+        raise NotImplementedError
+
+    def last_modified(self, obj):
+        return None
+
+    def get_url(self, obj):
+        return f"{settings.FRONTEND_URL}{self.location(obj)}"
+
+
+def get_sections():
+    from blog.sitemaps import CategorySitemap, PostSitemap, TagSitemap
+    from jobs.sitemaps import JobSitemap
+    from projects.sitemaps import ProjectSitemap
+
+    return [
+        PostSitemap(),
+        CategorySitemap(),
+        TagSitemap(),
+        JobSitemap(),
+        ProjectSitemap(),
+    ]
+
+
+def get_section(name):
+    return next(section for section in get_sections() if section.name == name)
+
+
+def chunk_path(section_name, chunk):
+    return f"{SITEMAP_DIRECTORY}/sitemap-{section_name}-{chunk}.xml"
+
+
+def write_file(path, content):
+    """Replace the file at ``path`` in place, so readers never find it missing"""
+    if default_storage.get_available_name(path) != path:
+        # The storage doesn't overwrite, as the local one in development
+        default_storage.delete(path)
+    default_storage.save(path, ContentFile(content.encode("utf-8")))
+
+
+def format_lastmod(value):
+    return f"<lastmod>{value.date().isoformat()}</lastmod>" if value else ""
+
+
+def write_chunk(section_name, chunk):
+    entries = SitemapEntry.objects.filter(section=section_name, chunk=chunk).order_by(
+        "id"
+    )
+    urls = [
+        f"<url><loc>{escape(entry.location)}</loc>"
+        f"{format_lastmod(entry.last_modified)}</url>"
+        for entry in entries.iterator()
+    ]
+    path = chunk_path(section_name, chunk)
+    if not urls:
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        return
+    write_file(
+        path,
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="{SITEMAP_NAMESPACE}">{"".join(urls)}</urlset>',
+    )
+
+
+def write_index():
+    chunks = (
+        SitemapEntry.objects.values("section", "chunk")
+        .annotate(last_modified=Max("last_modified"))
+        .order_by("section", "chunk")
+    )
+    sitemaps = [
+        f"<sitemap><loc>{escape(default_storage.url(chunk_path(row['section'], row['chunk'])))}</loc>"
+        f"{format_lastmod(row['last_modified'])}</sitemap>"
+        for row in chunks
+    ]
+    write_file(
+        SITEMAP_INDEX_PATH,
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">{"".join(sitemaps)}</sitemapindex>',
+    )
+
+
+def allocate_chunk(section_name):
+    """Return the last chunk of a section, or a new one once it is full"""
+    last = (
+        SitemapEntry.objects.filter(section=section_name)
+        .values("chunk")
+        .annotate(size=Count("id"))
+        .order_by("-chunk")
+        .first()
+    )
+    if last is None:
+        return 1
+    if last["size"] >= SITEMAP_URL_LIMIT:
+        return last["chunk"] + 1
+    return last["chunk"]
+
+
+def sync_objects(section, pks):
+    """Bring the entries of the given objects up to date and rewrite touched files"""
+    object_ids = [str(pk) for pk in pks]
+    visible = {str(obj.pk): obj for obj in section.items().filter(pk__in=pks)}
+    entries = {
+        entry.object_id: entry
+        for entry in SitemapEntry.objects.filter(
+            section=section.name, object_id__in=object_ids
+        )
+    }
+
+    touched = set()
+    for object_id in object_ids:
+        obj = visible.get(object_id)
+        entry = entries.get(object_id)
+        if obj is None:
+            if entry is not None:
+                entry.delete()
+                touched.add(entry.chunk)
+            continue
+
+        location = section.get_url(obj)
+        last_modified = section.last_modified(obj)
+        if entry is None:
+            entry = SitemapEntry.objects.create(
+                section=section.name,
+                object_id=object_id,
+                location=location,
+                last_modified=last_modified,
+                chunk=allocate_chunk(section.name),
+            )
+        elif (entry.location, entry.last_modified) != (location, last_modified):
+            entry.location = location
+            entry.last_modified = last_modified
+            entry.save(update_fields=["location", "last_modified"])
+        else:
+            continue
+        touched.add(entry.chunk)
+
+    for chunk in sorted(touched):
+        write_chunk(section.name, chunk)
+    if touched:
+        write_index()
+    return len(touched)
+
+
+def schedule_sync(section, pks):
+    """Queue the objects for core.tasks.sync_sitemaps with the transaction"""
+    SitemapSync.objects.bulk_create(
+        SitemapSync(section=section.name, object_id=str(pk)) for pk in pks
+    )
+
+
+def sync_pending_sitemaps():
+    """Apply the changes queued since the last run, return how many there were"""
+    with transaction.atomic():
+        pending = list(
+            SitemapSync.objects.select_for_update(skip_locked=True).values_list(
+                "id", "section", "object_id"
+            )
+        )
+        if not pending:
+            return 0
+        for section in get_sections():
+            object_ids = {
+                object_id for _, name, object_id in pending if name == section.name
+            }
+            if object_ids:
+                sync_objects(section, object_ids)
+        # Changes queued meanwhile stay for the next run
+        SitemapSync.objects.filter(id__in=[pk for pk, _, _ in pending]).delete()
+    return len(pending)
+
+
+def rebuild_sitemaps():
+    """Repack every section from scratch and rewrite all sitemap files"""
+    total = 0
+    for section in get_sections():
+        previous_chunks = set(
+            SitemapEntry.objects.filter(section=section.name)
+            .values_list("chunk", flat=True)
+            .distinct()
+        )
+        with transaction.atomic():
+            SitemapEntry.objects.filter(section=section.name).delete()
+            SitemapEntry.objects.bulk_create(
+                (
+                    SitemapEntry(
+                        section=section.name,
+                        object_id=str(obj.pk),
+                        location=section.get_url(obj),
+                        last_modified=section.last_modified(obj),
+                        chunk=index // SITEMAP_URL_LIMIT + 1,
+                    )
+                    for index, obj in enumerate(
+                        section.items().order_by("pk").iterator()
+                    )
+                ),
+                batch_size=1000,
+            )
+        chunks = set(
+            SitemapEntry.objects.filter(section=section.name)
+            .values_list("chunk", flat=True)
+            .distinct()
+        )
+        for chunk in sorted(chunks | previous_chunks):
+            write_chunk(section.name, chunk)
+        total += SitemapEntry.objects.filter(section=section.name).count()
+    write_index()
+    return total
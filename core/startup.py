@@ -0,0 +1,122 @@
+"""
+Cold start measurements.
+
+A cold start is timed in a fresh interpreter: ``django.setup()`` followed by
+the first request through the WSGI handler, middleware included, the way a
+new Lambda container serves its first event. ``python -X importtime`` in the
+same process reports what every imported module cost.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+COLD_START_SCRIPT = """
+import json, sys, time
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+start = time.perf_counter()
+import django
+
+django.setup(set_prefix=False)
+setup = time.perf_counter()
+
+from django.core.handlers.wsgi import WSGIHandler
+
+environ = {
+    "PATH_INFO": sys.argv[1],
+    "HTTP_HOST": sys.argv[2],
+    "wsgi.input": BytesIO(),
+}
+setup_testing_defaults(environ)
+statuses = []
+response = WSGIHandler()(environ, lambda status, headers, *args: statuses.append(status))
+b"".join(response)
+end = time.perf_counter()
+
+print(json.dumps({
+    "status": statuses[0],
+    "setup_ms": (setup - start) * 1000,
+    "request_ms": (end - setup) * 1000,
+}))
+"""
+
+
+def get_host():
+    host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "*"
+    return "localhost" if host.startswith("*") else host.lstrip(".")
+
+
+def cold_start(path, importtime=False):
+    """
+    Serve ``path`` from a new interpreter, return the timings and, with
+    ``importtime``, the import report
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", COLD_START_SCRIPT, path, get_host()]
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        command, capture_output=True, text=True, cwd=settings.BASE_DIR
+    )
+    total_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["total_ms"] = total_ms
+    # Interpreter startup and shutdown
+    timings["python_ms"] = total_ms - timings["setup_ms"] - timings["request_ms"]
+    return timings, parse_importtime(result.stderr) if importtime else None
+
+
+def parse_importtime(output):
+    """
+    Rows of ``-X importtime`` output as dicts of module, depth and the self and
+    cumulative times in milliseconds
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if not own.strip().isdigit():
+            # The header
+            continue
+        modules.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(own) / 1000,
+                "cumulative_ms": int(cumulative) / 1000,
+            }
+        )
+    return modules
+
+
+def group_by_package(modules):
+    """Self time of the modules summed per top level package, slowest first"""
+    totals = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        totals[package] = totals.get(package, 0) + module["self_ms"]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def get_importers(modules):
+    """Module to the module whose import first pulled it in"""
+    importers = {}
+    # Children are reported before the module importing them
+    stack = []
+    for module in reversed(modules):
+        del stack[module["depth"] :]
+        if stack:
+            importers[module["module"]] = stack[-1]
+        stack.append(module["module"])
+    return importers
@@ -0,0 +1,38 @@
+"""
+S3 storage adding the time of every call that reaches S3 to the request's
+``storage`` timing, see core.metrics.
+"""
+
+from storages.backends import s3
+
+from .metrics import timing
+
+
+class S3Storage(s3.S3Storage):
+    def _open(self, name, mode="rb"):
+        with timing("storage"):
+            return super()._open(name, mode)
+
+    def _save(self, name, content):
+        with timing("storage"):
+            return super()._save(name, content)
+
+    def delete(self, name):
+        with timing("storage"):
+            return super().delete(name)
+
+    def exists(self, name):
+        with timing("storage"):
+            return super().exists(name)
+
+    def listdir(self, name):
+        with timing("storage"):
+            return super().listdir(name)
+
+    def size(self, name):
+        with timing("storage"):
+            return super().size(name)
+
+    def get_modified_time(self, name):
+        with timing("storage"):
+            return super().get_modified_time(name)
@@ -0,0 +1,17 @@
+"""Entry points for Zappa scheduled events, see zappa_settings.json"""
+
+from .changes import purge_tombstones as purge
+from .sitemaps import sync_pending_sitemaps
+from .webhooks import deliver_queued
+
+
+def purge_tombstones(event, context):
+    return purge()
+
+
+def deliver_revalidations(event, context):
+    return deliver_queued()
+
+
+def sync_sitemaps(event, context):
+    return sync_pending_sitemaps()
@@ -0,0 +1,279 @@
+import gzip
+import tempfile
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.files.storage import default_storage
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from blog.models import Tag
+
+from .changes import decode_cursor, encode_cursor
+from .indexes import get_candidate, get_filtered_columns, is_covered
+from .middleware import CompressionMiddleware
+from .models import QueryFingerprint, RevalidationPath, SitemapEntry, SitemapSync
+from .sitemaps import chunk_path, sync_pending_sitemaps, write_file
+from .versions import LAST_BUMP_KEY, get_versions, model_key
+from .views import build_get_request
+from .webhooks import deliver_queued
+
+
+class WriteFileTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = directory.name
+
+    def storages(self, **options):
+        backend = "django.core.files.storage.FileSystemStorage"
+        options["location"] = self.location
+        return {"default": {"BACKEND": backend, "OPTIONS": options}}
+
+    def test_overwrites_in_place(self):
+        with override_settings(STORAGES=self.storages(allow_overwrite=True)):
+            write_file("sitemaps/sitemap.xml", "old")
+            with mock.patch.object(default_storage, "delete") as delete:
+                write_file("sitemaps/sitemap.xml", "new")
+            delete.assert_not_called()
+            with default_storage.open("sitemaps/sitemap.xml") as f:
+                self.assertEqual(f.read(), b"new")
+
+    def test_replaces_file_without_overwrite(self):
+        with override_settings(STORAGES=self.storages()):
+            write_file("sitemaps/sitemap.xml", "old")
+            write_file("sitemaps/sitemap.xml", "new")
+            self.assertEqual(default_storage.listdir("sitemaps")[1], ["sitemap.xml"])
+            with default_storage.open("sitemaps/sitemap.xml") as f:
+                self.assertEqual(f.read(), b"new")
+
+
+class SitemapSyncTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        backend = "django.core.files.storage.FileSystemStorage"
+        options = {"location": directory.name, "allow_overwrite": True}
+        storages = override_settings(
+            STORAGES={"default": {"BACKEND": backend, "OPTIONS": options}}
+        )
+        storages.enable()
+        self.addCleanup(storages.disable)
+
+    def test_changes_are_synced_by_the_task(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tag = Tag.objects.create(name="Django", slug="django")
+        self.assertFalse(default_storage.exists(chunk_path("tags", 1)))
+        self.assertTrue(SitemapSync.objects.filter(object_id=str(tag.pk)).exists())
+
+        self.assertEqual(sync_pending_sitemaps(), 1)
+        self.assertFalse(SitemapSync.objects.exists())
+        self.assertEqual(
+            SitemapEntry.objects.get(section="tags").object_id, str(tag.pk)
+        )
+        with default_storage.open(chunk_path("tags", 1)) as f:
+            self.assertIn(b"/blog/tag/django/", f.read())
+
+        tag.delete()
+        sync_pending_sitemaps()
+        self.assertFalse(SitemapEntry.objects.exists())
+        self.assertFalse(default_storage.exists(chunk_path("tags", 1)))
+
+
+class ContentVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_content_writes_bump_versions(self):
+        version = get_versions([model_key(Tag)])
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name="Django", slug="django")
+        self.assertNotEqual(get_versions([model_key(Tag)]), version)
+        self.assertIsNotNone(cache.get(LAST_BUMP_KEY))
+
+    def test_other_writes_keep_versions(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            QueryFingerprint.objects.create(fingerprint="a", sql="SELECT 1")
+        self.assertEqual(callbacks, [])
+        self.assertIsNone(cache.get(LAST_BUMP_KEY))
+
+
+@override_settings(
+    REVALIDATE_WEBHOOK_URL="http://frontend.test/revalidate",
+    REVALIDATE_DEBOUNCE_SECONDS=0,
+    REVALIDATE_RETRY_BACKOFF=0,
+)
+class RevalidationQueueTests(TestCase):
+    def test_content_changes_are_queued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name="Django", slug="django")
+        self.assertTrue(RevalidationPath.objects.exists())
+
+    @mock.patch("core.webhooks.requests.post")
+    def test_delivers_queued_paths_in_one_batch(self, post):
+        post.return_value.status_code = 200
+        for path in ["/blog/a", "/blog", "/blog/b", "/blog"]:
+            RevalidationPath.objects.create(path=path)
+
+        self.assertEqual(deliver_queued(), 3)
+        post.assert_called_once()
+        self.assertIn(
+            b'"paths": ["/blog", "/blog/a", "/blog/b"]', post.call_args.kwargs["data"]
+        )
+        self.assertFalse(RevalidationPath.objects.exists())
+
+    @mock.patch("core.webhooks.requests.post")
+    def test_failed_delivery_keeps_paths(self, post):
+        post.return_value.status_code = 503
+        RevalidationPath.objects.create(path="/blog/a")
+
+        self.assertEqual(deliver_queued(), 0)
+        self.assertTrue(RevalidationPath.objects.filter(claimed_at=None).exists())
+
+    @mock.patch("core.webhooks.requests.post")
+    def test_skips_paths_claimed_by_another_delivery(self, post):
+        post.return_value.status_code = 200
+        now = timezone.now()
+        RevalidationPath.objects.create(path="/blog/a", claimed_at=now)
+        RevalidationPath.objects.create(
+            path="/blog/b", claimed_at=now - timedelta(hours=1)
+        )
+
+        self.assertEqual(deliver_queued(), 1)
+        self.assertIn(b'"paths": ["/blog/b"]', post.call_args.kwargs["data"])
+        self.assertEqual(
+            list(RevalidationPath.objects.values_list("path", flat=True)), ["/blog/a"]
+        )
+
+
+class BuildGetRequestTests(SimpleTestCase):
+    @override_settings(ALLOWED_HOSTS=["api.test"])
+    def test_builds_wsgi_request(self):
+        request = build_get_request(
+            "/blog/posts/caf%C3%A9/?fields=id", secure=True, HTTP_HOST="api.test"
+        )
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(request.path, "/blog/posts/café/")
+        self.assertEqual(request.GET["fields"], "id")
+        self.assertEqual(
+            request.build_absolute_uri(),
+            "https://api.test/blog/posts/caf%C3%A9/?fields=id",
+        )
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post(self, paths):
+        return self.client.post(
+            "/batch",
+            {"requests": [{"path": path} for path in paths]},
+            content_type="application/json",
+        )
+
+    def test_failing_items_get_their_own_status(self):
+        with mock.patch("core.views.call_view", side_effect=PermissionDenied):
+            response = self.post(["/blog/posts/"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["responses"][0]["status"], 403)
+
+    def test_unknown_and_nested_paths_are_not_found(self):
+        response = self.post(["/missing/", "/batch", "/blog/posts/"])
+        statuses = [item["status"] for item in response.json()["responses"]]
+        self.assertEqual(statuses, [404, 404, 200])
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        changed = (timezone.now(), 12)
+        deleted = (timezone.now() - timedelta(days=1), 3)
+        cursor = encode_cursor(changed, deleted)
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), (changed, deleted))
+
+    def test_timestamp(self):
+        moment = datetime(2024, 5, 1, 12, tzinfo=dt_timezone.utc)
+        expected = ((moment, None), (moment, None))
+        self.assertEqual(decode_cursor("2024-05-01T12:00:00+00:00"), expected)
+        # The "+" of a query string decodes to a space
+        self.assertEqual(decode_cursor("2024-05-01T12:00:00 00:00"), expected)
+
+    def test_invalid_cursors(self):
+        for value in ["", "nonsense", "e30", "WzFd"]:
+            with self.subTest(value=value), self.assertRaises(ValidationError):
+                decode_cursor(value)
+
+
+class IndexAdvisorTests(SimpleTestCase):
+    def test_filtered_columns(self):
+        sql = (
+            'SELECT "blog_blogpost"."id" FROM "blog_blogpost" '
+            'WHERE ("blog_blogpost"."published_at" >= %s '
+            'AND "blog_blogpost"."status" = %s AND "blog_blogpost"."is_live") '
+            'ORDER BY "blog_blogpost"."published_at" DESC, "blog_blogpost"."id" ASC '
+            "LIMIT 10"
+        )
+        self.assertEqual(
+            get_filtered_columns(sql),
+            {
+                "blog_blogpost": (
+                    ["status", "is_live"],
+                    ["published_at"],
+                    ["-published_at", "id"],
+                )
+            },
+        )
+
+    def test_equality_columns_come_before_the_range(self):
+        self.assertEqual(
+            get_candidate(["status", "status"], ["published_at", "id"], ["-id"]),
+            ["status", "published_at"],
+        )
+
+    def test_first_sort_column_without_a_range(self):
+        self.assertEqual(
+            get_candidate(["status"], [], ["status", "-published_at", "id"]),
+            ["status", "-published_at"],
+        )
+        self.assertIsNone(get_candidate([], [], []))
+
+    def test_covered_by_leading_fields(self):
+        indexes = [["id"], ["status", "published_at", "id"]]
+        self.assertTrue(is_covered(["status", "-published_at"], indexes))
+        self.assertFalse(is_covered(["published_at"], indexes))
+
+
+class CompressionTests(SimpleTestCase):
+    body = b"<p>csrfmiddlewaretoken</p>" * 100
+
+    def setUp(self):
+        cache.clear()
+
+    def compress(self, accept_encoding, **headers):
+        def get_response(request):
+            return HttpResponse(self.body, content_type="text/html", headers=headers)
+
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(get_response)(request)
+
+    def test_private_html_is_padded(self):
+        first = self.compress("br, gzip", **{"Cache-Control": "private"})
+        second = self.compress("br, gzip", **{"Cache-Control": "private"})
+        self.assertEqual(first["Content-Encoding"], "gzip")
+        self.assertNotEqual(first.content, second.content)
+        self.assertEqual(gzip.decompress(first.content), self.body)
+
+    def test_private_html_needs_gzip(self):
+        response = self.compress("br", **{"Cache-Control": "no-store"})
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_shared_html_is_not_padded(self):
+        first = self.compress("gzip")
+        second = self.compress("gzip")
+        self.assertEqual(first.content, second.content)
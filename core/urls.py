@@ -2,7 +2,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+from .views import batch, metrics, schema, sitemap, swagger
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -11,8 +12,12 @@ urlpatterns = [
     path("clients/", include("clients.urls")),
     path("projects/", include("projects.urls")),
     path("blog/", include("blog.urls")),
-    path("", SpectacularSwaggerView.as_view(), name="swagger"),
-    path("schema", SpectacularAPIView.as_view(), name="schema"),
+    path("sitemap.xml", sitemap, name="sitemap"),
+    path("batch", batch, name="batch"),
+    path("metrics", metrics, name="metrics"),
+    path("", swagger, name="swagger"),
+    path("schema", schema, name="schema"),
+    path("schema/<str:version>", schema, name="schema-version"),
 ]
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,95 @@
+"""
+Content version registry.
+
+Every model has a version in the cache, and so does every row. Versions
+change after a save, delete or many-to-many change is committed. ETags
+derived from them let read endpoints answer ``If-None-Match`` without
+querying or serializing anything.
+
+Versions are ``time.time_ns()`` values, so a version that expired from the
+cache restarts at a value no client has seen.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# When versions last changed, see core.routers
+LAST_BUMP_KEY = "versions:last-bump"
+
+# Saves that only touch these counters keep the current versions, so cached
+# copies can show slightly older counts
+IGNORED_UPDATE_FIELDS = {"views", "likes"}
+
+
+def model_key(model):
+    return f"versions:{model._meta.concrete_model._meta.label_lower}"
+
+
+def row_key(model, pk):
+    return f"{model_key(model)}:{pk}"
+
+
+def get_versions(keys):
+    """Return the versions stored under ``keys``, starting missing ones"""
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, settings.CONTENT_VERSION_TIMEOUT)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(model, pks=()):
+    """Give ``model`` and its rows ``pks`` new versions"""
+    version = time.time_ns()
+    versions = {model_key(model): version, LAST_BUMP_KEY: time.time()}
+    versions.update((row_key(model, pk), version) for pk in pks)
+    cache.set_many(versions, settings.CONTENT_VERSION_TIMEOUT)
+
+
+def schedule_version_bump(model, pks=()):
+    # Bumping before commit would let a concurrent read tag old data with
+    # the new version
+    pks = list(pks)
+    key = model_key(model)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        get_pending_keys(connection).add(key)
+
+    def bump():
+        bump_versions(model, pks)
+        get_pending_keys(connection).discard(key)
+
+    transaction.on_commit(bump)
+
+
+def get_pending_keys(connection):
+    """Version keys of models with writes waiting for the commit"""
+    if not hasattr(connection, "pending_version_keys"):
+        connection.pending_version_keys = set()
+    return connection.pending_version_keys
+
+
+def has_pending_writes(models):
+    """Whether the current transaction wrote to any of ``models``"""
+    connection = transaction.get_connection()
+    pending = get_pending_keys(connection)
+    if not connection.in_atomic_block:
+        # Leftovers of rolled back transactions
+        pending.clear()
+        return False
+    return any(model_key(model) in pending for model in models)
+
+
+def get_dependent_models(model):
+    """``model`` and the models its forward relations point to"""
+    models = [model]
+    for field in model._meta.get_fields():
+        if field.auto_created or not field.is_relation or field.related_model is None:
+            continue
+        if field.related_model not in models:
+            models.append(field.related_model)
+    return models
@@ -0,0 +1,245 @@
+import functools
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import unquote_to_bytes
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.storage import default_storage
+from django.core.handlers.exception import response_for_exception
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.shortcuts import redirect
+from django.urls import Resolver404, resolve
+from django.utils.cache import (
+    add_never_cache_headers,
+    get_conditional_response,
+    patch_cache_control,
+)
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import render_prometheus
+from .sitemaps import SITEMAP_INDEX_PATH
+
+
+@require_safe
+def sitemap(request):
+    """Redirect crawlers to the sitemap index in storage"""
+    return redirect(default_storage.url(SITEMAP_INDEX_PATH))
+
+
+@require_safe
+def metrics(request):
+    """Histograms of this process in the Prometheus text format"""
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    if not (
+        (token and hmac.compare_digest(authorization, f"Bearer {token}"))
+        or request.user.is_staff
+    ):
+        return HttpResponseForbidden()
+    response = HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+    add_never_cache_headers(response)
+    return response
+
+
+SCHEMA_CONTENT_TYPES = {
+    "yaml": "application/vnd.oai.openapi",
+    "json": "application/vnd.oai.openapi+json",
+}
+
+
+@require_safe
+def schema(request, version=None):
+    """Serve the schema built by ``manage.py build_schema``"""
+    from .schema import load_schema
+
+    built = load_schema()
+    if built is None:
+        from drf_spectacular.views import SpectacularAPIView
+
+        return SpectacularAPIView.as_view()(request)
+    if version is not None and version != built["version"]:
+        # Left over from a previous deploy
+        return redirect("schema-version", version=built["version"])
+
+    fmt = "json" if request.GET.get("format") == "json" else "yaml"
+    etag = f'"{built["version"]}-{fmt}"'
+    response = HttpResponse(built[fmt], content_type=SCHEMA_CONTENT_TYPES[fmt])
+    response["ETag"] = etag
+    if version is None:
+        patch_cache_control(response, public=True, max_age=300)
+    else:
+        patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+@functools.cache
+def get_swagger_view():
+    from .schema import SwaggerView
+
+    return SwaggerView.as_view()
+
+
+def swagger(request, *args, **kwargs):
+    """Swagger UI, the view is only imported once it's requested"""
+    return get_swagger_view()(request, *args, **kwargs)
+
+
+def build_get_request(path, secure=False, **meta):
+    """A GET request for ``path`` with ``meta`` added to its WSGI environ"""
+    path, _, query = path.partition("?")
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        # WSGI servers pass the unquoted path as latin-1
+        "PATH_INFO": unquote_to_bytes(path).decode("iso-8859-1"),
+        "QUERY_STRING": query,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "443" if secure else "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.url_scheme": "https" if secure else "http",
+        "wsgi.input": BytesIO(),
+        **meta,
+    }
+    return WSGIRequest(environ)
+
+
+def call_view(request):
+    """
+    Run the view ``request`` resolves to without going through middleware,
+    as an anonymous user unless ``request.user`` is set
+    """
+    if not hasattr(request, "user"):
+        request.user = AnonymousUser()
+    match = resolve(request.path_info)
+    return match.func(request, *match.args, **match.kwargs)
+
+
+# Headers of sub-responses passed on to batch clients
+BATCH_RESPONSE_HEADERS = ["Cache-Control", "ETag", "Last-Modified", "Location"]
+
+# Request headers that only apply to the batch request itself
+BATCH_SKIPPED_HEADERS = {
+    "HTTP_ACCEPT",
+    "HTTP_ACCEPT_ENCODING",
+    "HTTP_CONTENT_LENGTH",
+    "HTTP_CONTENT_TYPE",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_NONE_MATCH",
+}
+
+
+def build_subrequest(request, path, headers=None):
+    """A GET of ``path`` made as the user of ``request``"""
+    meta = {
+        key: value
+        for key, value in request.META.items()
+        if key.startswith("HTTP_") and key not in BATCH_SKIPPED_HEADERS
+    }
+    for name, value in {"Accept": "application/json", **(headers or {})}.items():
+        meta[f"HTTP_{name.upper().replace('-', '_')}"] = value
+    subrequest = build_get_request(path, secure=request.is_secure(), **meta)
+    # Reuse the authentication of the batch instead of running it again
+    subrequest.user = request.user
+    subrequest._force_auth_user = request.user
+    subrequest._force_auth_token = request.auth
+    return subrequest
+
+
+def run_subrequest(request, item):
+    path = item["path"]
+    subrequest = build_subrequest(request, path, item.get("headers"))
+    try:
+        if resolve(subrequest.path_info).func is batch:
+            raise Resolver404()
+        response = call_view(subrequest)
+    except Exception as e:
+        # Only this item fails, with the status the handler would have sent
+        response = response_for_exception(subrequest, e)
+        body = None
+    else:
+        if hasattr(response, "data"):
+            body = response.data
+        elif response.streaming:
+            body = None
+        else:
+            body = response.content.decode(response.charset)
+    return {
+        "path": path,
+        "status": response.status_code,
+        "headers": {
+            header: response[header]
+            for header in BATCH_RESPONSE_HEADERS
+            if response.has_header(header)
+        },
+        "body": body,
+    }
+
+
+def run_subrequest_in_thread(request, item):
+    try:
+        return run_subrequest(request, item)
+    finally:
+        # Worker threads open their own connections
+        connections.close_all()
+
+
+class BatchView(APIView):
+    # api_view would import the schema class, drf_spectacular, along with this
+    # module, which every process loads through core.signals
+
+    def post(self, request):
+        """
+        Run several GET requests in one round trip. The body lists them as
+        ``{"requests": [{"path": "/blog/posts/?fields=id,title"}, ...]}``, each
+        with optional ``headers``. Responses come back in the same order with
+        their status. ``"parallel": true`` runs them on a thread pool, each
+        thread with its own database connection.
+        """
+        items = request.data.get("requests") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "A list of requests is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {
+                    "error": f"At most {settings.BATCH_MAX_REQUESTS} requests are allowed"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        for item in items:
+            if (
+                not isinstance(item, dict)
+                or not isinstance(item.get("path"), str)
+                or not item["path"].startswith("/")
+                or not isinstance(item.get("headers", {}), dict)
+            ):
+                return Response(
+                    {"error": "Every request needs an absolute path"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        workers = min(settings.BATCH_MAX_WORKERS, len(items))
+        if request.data.get("parallel") and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                responses = list(
+                    pool.map(
+                        lambda item: run_subrequest_in_thread(request, item), items
+                    )
+                )
+        else:
+            responses = [run_subrequest(request, item) for item in items]
+        return Response({"responses": responses})
+
+
+batch = BatchView.as_view()
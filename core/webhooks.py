@@ -0,0 +1,165 @@
+"""
+Revalidation webhooks to the frontend.
+
+Committed changes to objects with public pages queue the frontend paths they
+affect, the object's page and the index listing it. The paths are stored in
+``RevalidationPath`` rows written in the same transaction as the change, so
+they survive the process. Every queued path is sent together in one POST to
+``REVALIDATE_WEBHOOK_URL``, so a bulk admin action results in a single
+request. Failed deliveries are retried with exponential backoff, and the
+paths stay queued for the next run if they still fail.
+
+The queue is delivered by ``core.tasks.deliver_revalidations`` every minute.
+On Lambda the process is frozen after each response, so that's the only
+delivery there. Elsewhere a background thread also delivers the queue
+``REVALIDATE_DEBOUNCE_SECONDS`` after the first change.
+
+The body is ``{"paths": [...]}``, signed with an HMAC-SHA256 of the body in
+the ``X-Revalidate-Signature`` header. ``manage.py revalidation_server``
+runs a local stand-in that prints the batches it receives.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import RevalidationPath
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Revalidate-Signature"
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def sign(body, secret=None):
+    secret = settings.REVALIDATE_WEBHOOK_SECRET if secret is None else secret
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def deliver(paths):
+    """
+    POST ``paths`` to the webhook, retrying failures. Return whether delivery
+    is over, the paths were accepted or rejected for good.
+    """
+    body = json.dumps({"paths": sorted(paths)}).encode()
+    headers = {"Content-Type": "application/json", SIGNATURE_HEADER: sign(body)}
+    attempts = settings.REVALIDATE_MAX_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        try:
+            response = requests.post(
+                settings.REVALIDATE_WEBHOOK_URL,
+                data=body,
+                headers=headers,
+                timeout=settings.REVALIDATE_TIMEOUT,
+            )
+            if response.status_code < 300:
+                return True
+            if response.status_code not in RETRY_STATUSES:
+                logger.error(
+                    f"Revalidation webhook rejected {len(paths)} paths: "
+                    f"status {response.status_code}"
+                )
+                # Sending them again wouldn't help
+                return True
+            error = f"status {response.status_code}"
+        except requests.RequestException as e:
+            error = str(e)
+
+        if attempt < attempts:
+            time.sleep(settings.REVALIDATE_RETRY_BACKOFF * 2 ** (attempt - 1))
+    logger.error(
+        f"Revalidation webhook failed for {len(paths)} paths after "
+        f"{attempts} attempts: {error}"
+    )
+    return False
+
+
+def claim_queued():
+    """Claim the queued paths for one delivery, return their ids and paths"""
+    now = timezone.now()
+    # Claims older than this were left by a delivery that didn't finish
+    expired = now - timedelta(seconds=settings.REVALIDATE_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        rows = list(
+            RevalidationPath.objects.select_for_update(skip_locked=True)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=expired))
+            .values_list("id", "path")
+        )
+        ids = [pk for pk, _ in rows]
+        RevalidationPath.objects.filter(id__in=ids).update(claimed_at=now)
+    return ids, {path for _, path in rows}
+
+
+def deliver_queued():
+    """Deliver the queued paths in one batch, return how many were accepted"""
+    ids, paths = claim_queued()
+    if not paths:
+        return 0
+    # Sent outside a transaction, retries can take a while
+    queued = RevalidationPath.objects.filter(id__in=ids)
+    if not deliver(paths):
+        queued.update(claimed_at=None)
+        return 0
+    queued.delete()
+    return len(paths)
+
+
+class Dispatcher:
+    """Delivers the queue from a background thread once per debounce window"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timer = None
+
+    def schedule(self):
+        delay = settings.REVALIDATE_DEBOUNCE_SECONDS
+        if delay <= 0:
+            # Left to the scheduled task
+            return
+        with self.lock:
+            if self.timer is None:
+                self.timer = threading.Timer(delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            self.timer = None
+        try:
+            deliver_queued()
+        except Exception as e:
+            logger.error(f"Error delivering revalidation webhooks: {str(e)}")
+        finally:
+            connection.close()
+
+
+dispatcher = Dispatcher()
+
+
+def get_paths(section, obj):
+    paths = {section.location(obj)}
+    if section.index_location:
+        paths.add(section.index_location)
+    return paths
+
+
+def schedule_revalidation(section, objects):
+    """Queue the pages of ``objects`` for revalidation with the transaction"""
+    if not settings.REVALIDATE_WEBHOOK_URL:
+        return
+    paths = set()
+    for obj in objects:
+        paths |= get_paths(section, obj)
+    RevalidationPath.objects.bulk_create(RevalidationPath(path=path) for path in paths)
+    transaction.on_commit(dispatcher.schedule)
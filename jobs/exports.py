@@ -0,0 +1,13 @@
+from core.exports import ExportSection
+
+from .models import Job
+
+
+class JobExport(ExportSection):
+    name = "jobs"
+    model = Job
+    path = "/jobs/jobs/"
+    lookup_field = "pk"
+
+    def items(self):
+        return Job.objects.filter(is_active=True)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_alter_jobapplication_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["updated_at", "id"], name="jobs_job_updated_bd6fb0_idx"
+            ),
+        ),
+    ]
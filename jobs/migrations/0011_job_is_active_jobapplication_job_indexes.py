@@ -0,0 +1,25 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0010_job_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "-posted_at"], name="jobs_job_is_acti_e01e1d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobapplication",
+            index=models.Index(
+                fields=["job", "-applied_date"], name="jobs_jobapp_job_id_be884d_idx"
+            ),
+        ),
+    ]
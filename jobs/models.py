@@ -4,10 +4,14 @@ from django.db import models
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 
+from core.caching import CachedManager
+
 
 class JobRequirement(models.Model):
     requirement = models.CharField(max_length=255)
 
+    objects = CachedManager()
+
     def __str__(self):
         return self.requirement
 
@@ -15,6 +19,8 @@ class JobRequirement(models.Model):
 class JobBenefit(models.Model):
     benefit = models.CharField(max_length=255)
 
+    objects = CachedManager()
+
     def __str__(self):
         return self.benefit
 
@@ -22,6 +28,8 @@ class JobBenefit(models.Model):
 class JobResponsibility(models.Model):
     responsibility = models.CharField(max_length=255)
 
+    objects = CachedManager()
+
     def __str__(self):
         return self.responsibility
 
@@ -31,6 +39,8 @@ class Salary(models.Model):
     max = models.IntegerField()
     currency = models.CharField(max_length=255)
 
+    objects = CachedManager()
+
     def __str__(self):
         return f"{self.min} - {self.max} {self.currency}"
 
@@ -60,12 +70,17 @@ class Job(models.Model):
 
     deadline = models.DateTimeField(null=True, blank=True)
     posted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ["-posted_at"]
+        indexes = [
+            models.Index(fields=["updated_at", "id"]),
+            models.Index(fields=["is_active", "-posted_at"]),
+        ]
 
 
 class JobApplication(models.Model):
@@ -105,6 +120,7 @@ class JobApplication(models.Model):
 
     class Meta:
         ordering = ["-applied_date"]
+        indexes = [models.Index(fields=["job", "-applied_date"])]
 
 
 # {
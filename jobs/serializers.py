@@ -3,16 +3,18 @@ import os
 from django.core.validators import FileExtensionValidator
 from rest_framework import serializers
 
+from core.serializers import DynamicFieldsModelSerializer
+
 from .models import Job, JobApplication, Salary
 
 
-class SalarySerializer(serializers.ModelSerializer):
+class SalarySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Salary
         fields = ["min", "max", "currency"]
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(DynamicFieldsModelSerializer):
     benefits = serializers.StringRelatedField(many=True)
     requirements = serializers.StringRelatedField(many=True)
     responsibilities = serializers.StringRelatedField(many=True)
@@ -22,6 +24,7 @@ class JobSerializer(serializers.ModelSerializer):
         model = Job
         fields = "__all__"
         read_only_fields = ("posted_at",)
+        expandable_fields = ["salary"]
 
 
 class CurrentJobDefault:
@@ -34,7 +37,7 @@ class CurrentJobDefault:
         return "%s()" % self.__class__.__name__
 
 
-class JobApplicationSerializer(serializers.ModelSerializer):
+class JobApplicationSerializer(DynamicFieldsModelSerializer):
     job = serializers.HiddenField(default=CurrentJobDefault())
 
     class Meta:
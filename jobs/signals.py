@@ -4,12 +4,6 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from core.emails import (
-    send_admin_job_application_notification,
-    send_job_application_confirmation,
-    send_job_status_update_email,
-)
-
 from .models import JobApplication
 
 logger = logging.getLogger(__name__)
@@ -22,6 +16,12 @@ def on_job_application_created_or_updated(sender, instance, created, **kwargs):
     Sends confirmation email to applicant and notification to admins on creation.
     Sends status update email to applicant when status changes.
     """
+    from core.emails import (
+        send_admin_job_application_notification,
+        send_job_application_confirmation,
+        send_job_status_update_email,
+    )
+
     if created:
         try:
             # Send confirmation email to applicant
@@ -68,6 +68,8 @@ def send_interview_scheduled_email(application, interview_details):
     Send interview scheduled email with specific details.
     This is called manually when scheduling interviews with specific details.
     """
+    from core.emails import send_job_status_update_email
+
     try:
         send_job_status_update_email(
             application,
@@ -91,6 +93,8 @@ def send_offer_email(application, offer_details):
     Send job offer email with specific details.
     This is called manually when extending job offers.
     """
+    from core.emails import send_job_status_update_email
+
     try:
         send_job_status_update_email(
             application,
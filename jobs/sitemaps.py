@@ -0,0 +1,18 @@
+from core.sitemaps import SitemapSection
+
+from .models import Job
+
+
+class JobSitemap(SitemapSection):
+    name = "jobs"
+    model = Job
+    index_location = "/careers/"
+
+    def items(self):
+        return Job.objects.filter(is_active=True)
+
+    def location(self, obj):
+        return f"/careers/{obj.pk}/"
+
+    def last_modified(self, obj):
+        return obj.updated_at
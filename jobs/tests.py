@@ -1,3 +1,78 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+
+from .models import Job, JobBenefit, JobRequirement, JobResponsibility, Salary
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        salary = Salary.objects.create(min=1000, max=2000, currency="ETB")
+        requirement = JobRequirement.objects.create(requirement="Python")
+        responsibility = JobResponsibility.objects.create(responsibility="Reviews")
+        benefit = JobBenefit.objects.create(benefit="Remote")
+        for i in range(3):
+            job = Job.objects.create(
+                id=f"job-{i}",
+                title=f"Job {i}",
+                description="Description",
+                type="full-time",
+                salary=salary,
+            )
+            job.requirements.set([requirement])
+            job.responsibilities.set([responsibility])
+            job.benefits.set([benefit])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_narrow_fields_skip_relations(self):
+        with self.assertNumQueries(4):
+            response = self.client.get("/jobs/jobs/")
+        self.assertIn("requirements", response.json()[0])
+
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get("/jobs/jobs/?fields=id,title")
+        self.assertEqual(set(response.json()[0]), {"id", "title"})
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(
+            id="job", title="Job", description="Description", type="full-time"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_etag_and_cache_control(self):
+        response = self.client.get("/jobs/jobs/")
+        etag = response["ETag"]
+        self.assertEqual(
+            response["Cache-Control"],
+            "public, max-age=60, s-maxage=300, stale-while-revalidate=600",
+        )
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/jobs/jobs/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("public", response["Cache-Control"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = "Renamed"
+            self.job.save()
+        response = self.client.get("/jobs/jobs/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_authenticated_responses_are_private(self):
+        user = User.objects.create_user(username="staff", is_staff=True)
+        self.client.force_login(user)
+        response = self.client.get(f"/jobs/jobs/{self.job.pk}/")
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertIn("Authorization", response["Vary"])
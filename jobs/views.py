@@ -7,18 +7,36 @@ from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from core.mixins import (
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+)
+
 from .models import Job, JobApplication
 from .serializers import JobApplicationSerializer, JobSerializer
 
 
-class JobViewset(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class JobViewset(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ListModelMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
+):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = []
     parser_classes = [MultiPartParser, FormParser]
+    cache_policy = {
+        "*": {"max_age": 60, "s_maxage": 300, "stale_while_revalidate": 600}
+    }
 
     def get_queryset(self):
-        queryset = Job.objects.all()
+        queryset = super().get_queryset()
         if not self.request.user.is_staff:
             queryset = queryset.filter(is_active=True)
         return queryset
@@ -40,14 +58,14 @@ class JobViewset(ListModelMixin, RetrieveModelMixin, GenericViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = JobApplication.objects.all()
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAdminUser]
     parser_classes = [MultiPartParser, FormParser]
 
     def get_queryset(self):
-        queryset = JobApplication.objects.all()
+        queryset = super().get_queryset()
         job_id = self.request.query_params.get("job_id", None)
         if job_id:
             queryset = queryset.filter(job_id=job_id)
@@ -1,13 +1,20 @@
 from django.contrib import admin
+from django.utils import timezone
 
+from core.versions import schedule_version_bump
+from core.webhooks import schedule_revalidation
 from projects.models import Project, Technology
+from projects.sitemaps import ProjectSitemap
 
 # Register your models here.
 
 
 @admin.action(description="Mark as completed")
 def mark_as_completed(self, request, queryset):
-    queryset.update(is_completed=True)
+    pks = list(queryset.values_list("pk", flat=True))
+    queryset.update(is_completed=True, updated_at=timezone.now())
+    schedule_version_bump(Project, pks)
+    schedule_revalidation(ProjectSitemap(), Project.objects.filter(pk__in=pks))
 
     self.message_user("Updated successfully")
 
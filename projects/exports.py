@@ -0,0 +1,10 @@
+from core.exports import ExportSection
+
+from .models import Project
+
+
+class ProjectExport(ExportSection):
+    name = "projects"
+    model = Project
+    path = "/projects/projects/"
+    routes = ("", "count/")
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0008_rename_check_out_link_project_demo_url_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["updated_at", "id"], name="projects_pr_updated_8fb9d7_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0009_project_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["is_featured"], name="projects_pr_is_feat_bfabaf_idx"
+            ),
+        ),
+    ]
@@ -1,10 +1,14 @@
 from django.db import models
 from django.utils import timezone
 
+from core.caching import CachedManager
+
 
 class Technology(models.Model):
     name = models.CharField(max_length=255)
 
+    objects = CachedManager()
+
     def __str__(self):
         return self.name
 
@@ -24,3 +28,10 @@ class Project(models.Model):
     technologies = models.ManyToManyField(Technology, related_name="projects")
     demo_url = models.URLField(null=True, blank=True)
     github_url = models.URLField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"]),
+            models.Index(fields=["is_featured"]),
+        ]
@@ -1,14 +1,15 @@
 from rest_framework import serializers
-from rest_framework.serializers import ModelSerializer, Serializer
+from rest_framework.serializers import Serializer
 
-from .models import *
+from core.serializers import DynamicFieldsModelSerializer
 
+from .models import *
 
-class ProjectSerializer(ModelSerializer):
-    technologies = serializers.SerializerMethodField()
 
-    def get_technologies(self, obj):
-        return [tech["name"] for tech in obj.technologies.all().values("name")]
+class ProjectSerializer(DynamicFieldsModelSerializer):
+    technologies = serializers.SlugRelatedField(
+        many=True, read_only=True, slug_field="name"
+    )
 
     class Meta:
         exclude = []
@@ -0,0 +1,15 @@
+from core.sitemaps import SitemapSection
+
+from .models import Project
+
+
+class ProjectSitemap(SitemapSection):
+    name = "projects"
+    model = Project
+    index_location = "/projects/"
+
+    def location(self, obj):
+        return f"/projects/{obj.pk}/"
+
+    def last_modified(self, obj):
+        return obj.updated_at
@@ -4,13 +4,29 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from core.mixins import (
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+)
 from projects.models import *
 from projects.serializers import *
 
 
-class ProjectsViewset(ListModelMixin, GenericViewSet):
+class ProjectsViewset(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CacheControlMixin,
+    ChangeFeedMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
     serializer_class = ProjectSerializer
     queryset = Project.objects.all()
+    cache_policy = {
+        "*": {"max_age": 60, "s_maxage": 600, "stale_while_revalidate": 3600}
+    }
 
     @action(detail=False, methods=["get"])
     def count(self, request):